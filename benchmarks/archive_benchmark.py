@@ -0,0 +1,65 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from models.schedule import Schedule
+from services.archive_service import ArchiveService
+
+def main():
+    parser = argparse.ArgumentParser(description="지난 일정 압축 보관소: 기록 크기와 기간별 /history 조회 시간")
+    parser.add_argument('--schedules', type=int, default=200000, help="보관할 일정 수 (기본값: 200000)")
+    parser.add_argument('--months', type=int, default=36, help="일정이 퍼져 있는 개월 수 (기본값: 36)")
+    parser.add_argument('--batches', type=int, default=100, help="나눠서 정리하는 횟수 (기본값: 100)")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    base = Config.TIMEZONE.localize(datetime(2027, 1, 1))
+    span = int(args.months * 30.4 * 86400)
+    schedules = []
+    for i in range(args.schedules):
+        start_ts = int(base.timestamp()) + rng.randrange(span) // 300 * 300
+        schedules.append(Schedule.from_epoch(f"지난 일정 {i} 주간 회의", start_ts, start_ts + 3600, id=i + 1))
+    # 정리 작업은 시간 순으로 돌므로 시작 시각 순으로 나눠 보관
+    schedules.sort(key=lambda schedule: schedule.start_ts)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        archive = ArchiveService(os.path.join(tmp_dir, 'archive'))
+        batch_size = -(-len(schedules) // args.batches)
+        started = time.perf_counter()
+        for offset in range(0, len(schedules), batch_size):
+            archive.archive('chat', schedules[offset:offset + batch_size])
+        archive_seconds = time.perf_counter() - started
+
+        chat_dir = os.path.join(tmp_dir, 'archive', 'chat')
+        compressed = sum(os.path.getsize(os.path.join(chat_dir, name)) for name in os.listdir(chat_dir))
+        raw = sum(
+            len(json.dumps(ArchiveService._to_record(s), ensure_ascii=False, separators=(',', ':')).encode('utf-8')) + 1
+            for s in schedules
+        )
+
+        print(f"일정 {args.schedules:,}개, {args.months}개월, {args.batches}번에 나눠 보관")
+        print(f"보관: {archive_seconds:.2f}s ({args.schedules / archive_seconds:,.0f} schedules/s), "
+              f"세그먼트 {len(os.listdir(chat_dir))}개, {compressed / 1e6:.1f} MB (JSON {raw / 1e6:.1f} MB, "
+              f"{raw / compressed:.1f}배 압축)")
+
+        middle = base + timedelta(days=args.months * 15)
+        for label, start, end in [
+            ("1주", middle, middle + timedelta(days=7)),
+            ("1개월", middle, middle + timedelta(days=30)),
+            ("전체", base, base + timedelta(seconds=span)),
+        ]:
+            started = time.perf_counter()
+            found = sum(1 for _ in archive.iter_history('chat', start, end))
+            seconds = time.perf_counter() - started
+            print(f"  /history {label:>4}: {seconds * 1000:8,.1f} ms, {found:,}개")
+
+if __name__ == '__main__':
+    main()
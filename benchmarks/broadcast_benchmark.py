@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+class FakeBot:
+    """응답까지 latency초 걸리는 가짜 봇 (채팅방별 받은 메시지 수 기록, failing 채팅방은 첫 발송이 실패)"""
+
+    def __init__(self, latency: float, failing=()):
+        self.latency = latency
+        self.received = {}
+        self.failing = set(failing)
+
+    async def send_message(self, chat_id: str, text: str):
+        await asyncio.sleep(self.latency)
+        if chat_id in self.failing:
+            self.failing.discard(chat_id)
+            raise RuntimeError("가짜 발송 실패")
+        self.received[chat_id] = self.received.get(chat_id, 0) + 1
+
+async def run(args, data_dir: str):
+    Config.REMINDER_STATE_PATH = os.path.join(data_dir, 'reminders.json')
+    Config.ARCHIVE_DIR = os.path.join(data_dir, 'archive')
+
+    from handlers.command_handlers import CommandHandlers
+    from models.schedule import Schedule
+    from services.message_service import MessageService
+    from services.metrics_service import metrics
+    from services.outbound_dispatcher import OutboundDispatcher
+    from services.pinned_digest_service import PinnedDigestService
+    from services.schedule_service import ScheduleService
+    from services.storage_service import StorageService
+
+    rng = random.Random(1)
+    today = datetime.now(Config.TIMEZONE).date()
+    day_start = Config.TIMEZONE.localize(datetime.combine(today, datetime.min.time()))
+    # 오늘 일정이 있는 채팅방은 --active 비율, 나머지는 다른 날에만 일정이 있음
+    data = {}
+    for i in range(args.chats):
+        offset = 0 if rng.random() < args.active else rng.randrange(1, 30)
+        base = day_start + timedelta(days=offset)
+        data[str(-1001000000000 - i)] = [
+            Schedule(f"일정 {j}", base + timedelta(minutes=rng.randrange(8 * 60, 20 * 60) // 30 * 30))
+            for j in range(args.schedules)
+        ]
+    storage = StorageService(os.path.join(data_dir, 'schedules.json'))
+    storage.save_schedules(data)
+    schedule_service = ScheduleService(storage)
+    active = sum(1 for chat_schedules in data.values() if chat_schedules[0].datetime.date() == today)
+
+    # 대상 선정: 날짜별 색인과 전체 채팅방 훑기
+    started = time.perf_counter()
+    indexed = [
+        chat_id for chat_id in schedule_service.get_agenda_chats(today)
+        if schedule_service.get_day_schedules(chat_id, today)
+    ]
+    indexed_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    scanned = [chat_id for chat_id in data if schedule_service.get_day_schedules(chat_id, today)]
+    scan_seconds = time.perf_counter() - started
+    if sorted(indexed) != sorted(scanned):
+        print("대상 불일치")
+        sys.exit(1)
+    print(f"채팅방 {args.chats:,}개 중 오늘 일정 있는 채팅방 {active:,}개")
+    print(f"대상 선정: 날짜별 색인 {indexed_seconds * 1000:,.1f} ms, 전체 훑기 {scan_seconds * 1000:,.1f} ms")
+
+    # 첫 발송이 실패하는 채팅방 (끝을 기록하기 전에 다시 보내야 함)
+    failing = [chat_id for chat_id in indexed if rng.random() < args.fail_rate]
+    Config.BROADCAST_RETRY_DELAY = 0
+
+    def start_process(concurrency: int, state_path: str):
+        """봇 프로세스 하나 (가짜 봇, 발송 계층, 핸들러)"""
+        Config.BROADCAST_STATE_PATH = state_path
+        Config.BROADCAST_CONCURRENCY = concurrency
+        bot = FakeBot(args.latency / 1000, failing)
+        dispatcher = OutboundDispatcher(global_rate=args.rate, chat_rate=1e9, chat_burst=1e9)
+        handlers = CommandHandlers(schedule_service, MessageService(),
+                                   PinnedDigestService(os.path.join(data_dir, 'pinned.json')), dispatcher)
+        send = lambda chat_id, day, schedules: handlers.send_morning_digest(bot, chat_id, day, schedules)
+        return bot, dispatcher, handlers.broadcast_service, send
+
+    async def broadcast(concurrency: int, state_path: str) -> bool:
+        bot, _, broadcast_service, send = start_process(concurrency, state_path)
+        metrics.histograms('broadcast_send_duration_seconds').clear()
+        await broadcast_service.broadcast(today, send)
+        histogram = metrics.histograms('broadcast_send_duration_seconds')[()]
+        missing = active - len(bot.received)
+        print(f"  동시 {concurrency:>4}: {broadcast_service.last_duration:7.2f}s "
+              f"({len(bot.received) / broadcast_service.last_duration:,.0f} chats/s), "
+              f"채팅방별 발송 p50 {histogram.quantile(0.5) * 1000:g} ms, p99 {histogram.quantile(0.99) * 1000:g} ms, "
+              f"실패 후 다시 보냄 {len(failing)}개, 누락 {missing}개")
+        return missing == 0
+
+    async def restart(concurrency: int, state_path: str) -> bool:
+        """보내는 도중 프로세스를 멈추고 새 프로세스가 기록을 읽어 이어서 보냄"""
+        bot, dispatcher, broadcast_service, send = start_process(concurrency, state_path)
+        task = asyncio.create_task(broadcast_service.broadcast(today, send))
+        await asyncio.sleep(args.restart_after)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        await dispatcher.stop()  # 이미 API로 넘어간 발송은 도착한 것으로 봄
+
+        new_bot, _, new_broadcast_service, send = start_process(concurrency, state_path)
+        await new_broadcast_service.broadcast(today, send)
+        duplicates = len(bot.received.keys() & new_bot.received.keys())
+        missing = active - len(bot.received.keys() | new_bot.received.keys())
+        recorded = len(new_broadcast_service.sent) - new_broadcast_service.sent_count
+        print(f"  재시작: 중단 전 {len(bot.received):,}개 발송, 기록된 {recorded:,}개는 건너뛰고 "
+              f"{new_broadcast_service.sent_count:,}개 이어서 발송, "
+              f"중복 {duplicates}개 (중단 때 보내던 동시 {concurrency}개 이하), 누락 {missing}개")
+        return duplicates <= concurrency and missing == 0
+
+    print(f"발송 지연 {args.latency:g} ms, 전체 속도 제한 {args.rate:g}/s")
+    results = [await broadcast(concurrency, os.path.join(data_dir, f'broadcast-{index}.jsonl'))
+               for index, concurrency in enumerate(int(value) for value in args.concurrency.split(','))]
+    results.append(await restart(max(int(value) for value in args.concurrency.split(',')),
+                                 os.path.join(data_dir, 'broadcast-restart.jsonl')))
+    return all(results)
+
+def main():
+    parser = argparse.ArgumentParser(description="아침 브리핑 발송: 대상 선정, 동시 발송 수별 전체 시간, 재시작 후 이어 보내기")
+    parser.add_argument('--chats', type=int, default=5000, help="채팅방 수 (기본값: 5000)")
+    parser.add_argument('--active', type=float, default=0.3, help="오늘 일정이 있는 채팅방 비율 (기본값: 0.3)")
+    parser.add_argument('--schedules', type=int, default=3, help="채팅방별 일정 수 (기본값: 3)")
+    parser.add_argument('--latency', type=float, default=20, help="가짜 발송 지연 ms (기본값: 20)")
+    parser.add_argument('--rate', type=float, default=1000,
+                        help="발송 계층의 전체 초당 발송 수 (기본값: 1000, 실제 봇은 OUTBOUND_GLOBAL_RATE)")
+    parser.add_argument('--concurrency', default='1,10,50', help="비교할 동시 발송 수 (기본값: 1,10,50)")
+    parser.add_argument('--restart-after', type=float, default=0.3, help="재시작을 흉내 낼 시점 초 (기본값: 0.3)")
+    parser.add_argument('--fail-rate', type=float, default=0.01,
+                        help="첫 발송이 실패하는 채팅방 비율 (기본값: 0.01)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        ok = asyncio.run(run(args, data_dir))
+    if not ok:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from models.schedule import Schedule
+from services.storage_factory import create_storage_service
+
+BACKENDS = ('json', 'sqlite', 'sharded', 'snapshot')
+
+def build(chat_count: int, past: int, future: int, now: datetime, offset: int = 0):
+    """채팅방마다 지난 일정 past개 (어제 이전)와 앞으로의 일정 future개"""
+    schedules = {}
+    for chat in range(chat_count):
+        chat_schedules = [Schedule(f"지난 일정 {i}", now - timedelta(days=i + 1), id=i + 1) for i in range(past)]
+        chat_schedules += [Schedule(f"다음 일정 {i}", now + timedelta(days=i + 1), id=past + i + 1)
+                           for i in range(future)]
+        schedules[str(-1001000000000 - offset - chat)] = chat_schedules
+    return schedules
+
+def check(backend: str, write_behind: bool, args, data_dir: str) -> bool:
+    """메모리의 채팅방(이미 저장된 지난 일정)과 메모리 밖 채팅방을 섞어 정리 개수가 정확한지 확인"""
+    from services.archive_service import ArchiveService
+    from services.schedule_service import ScheduleService
+
+    path = os.path.join(data_dir, f"{backend}-{int(write_behind)}")
+    Config.REMINDER_STATE_PATH = os.path.join(path, 'reminders.json')
+    storage = create_storage_service(backend, os.path.join(path, 'schedules'), write_behind=write_behind)
+    archive_service = ArchiveService(os.path.join(path, 'archive'))
+    schedule_service = ScheduleService(storage, archive_service)
+    now = datetime.now(Config.TIMEZONE)
+
+    # 메모리 밖 채팅방: 저장소에만 있음 (지연 로딩 저장소만 해당)
+    unloaded = build(args.chats, args.past, args.future, now, offset=args.chats) if storage.lazy_load else {}
+    if unloaded:
+        storage.save_schedules(unloaded)
+    # 메모리의 채팅방: 지난 일정까지 저장소에 반영된 뒤 자정을 넘긴 상태
+    loaded = build(args.chats, args.past, args.future, now)
+    for chat_id in loaded:
+        schedule_service.get_schedules(chat_id)  # 먼저 모두 불러와 둠 (불러올 때마다 지난 일정을 만료하므로)
+    for chat_id, chat_schedules in loaded.items():
+        schedule_service.add_schedules(chat_id, chat_schedules)
+    if write_behind:
+        storage.flush_sync()
+
+    # 저장소가 직접 지우는 메모리 밖 채팅방만 정리 대상 (나머지는 처음 불러올 때 정리)
+    expected = args.chats * args.past
+    if storage.lazy_load and storage.query_before(now) is not None:
+        expected += args.chats * args.past
+    started = time.perf_counter()
+    cleaned = schedule_service.cleanup_old_schedules()
+    seconds = time.perf_counter() - started
+    storage.close()
+
+    remaining = sum(len(chat_schedules) for chat_schedules in
+                    create_storage_service(backend, os.path.join(path, 'schedules')).load_schedules().values())
+    expected_remaining = (len(loaded) + len(unloaded)) * (args.past + args.future) - expected
+    ok = cleaned == expected and remaining == expected_remaining and archive_service.archived_count == expected
+    label = f"{backend}{' + 백그라운드 저장' if write_behind else ''}"
+    print(f"  {label:<22} 정리 {cleaned:>7,}개 (예상 {expected:,}), 보관 {archive_service.archived_count:,}개, "
+          f"남은 일정 {remaining:,}개 (예상 {expected_remaining:,}), {seconds * 1000:,.1f} ms"
+          f"{'' if ok else '  ← 불일치'}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="지난 일정 정리: 저장소별 정리 시간과 정리·보관 개수 확인")
+    parser.add_argument('--chats', type=int, default=200, help="메모리 안/밖 채팅방 수 (각각, 기본값: 200)")
+    parser.add_argument('--past', type=int, default=3, help="채팅방별 지난 일정 수 (기본값: 3)")
+    parser.add_argument('--future', type=int, default=1, help="채팅방별 앞으로의 일정 수 (기본값: 1)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        print(f"채팅방 {args.chats}개씩 (메모리 안/밖), 채팅방별 지난 일정 {args.past}개, 앞으로 {args.future}개")
+        results = [check(backend, write_behind, args, data_dir)
+                   for backend in BACKENDS for write_behind in (False, True)]
+    if not all(results):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
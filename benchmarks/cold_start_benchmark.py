@@ -0,0 +1,91 @@
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from models.schedule import Schedule
+from services.storage_factory import create_storage_service
+
+BACKENDS = ('json', 'sqlite', 'sharded', 'snapshot')
+
+def storage_path(data_dir: str, backend: str) -> str:
+    return os.path.join(data_dir, {'json': 'schedules.json', 'sqlite': 'schedules.db', 'sharded': 'shards',
+                                   'snapshot': 'schedules.snap'}[backend])
+
+def storage_size(path: str) -> int:
+    """저장 파일 크기 (샤드 저장소는 디렉터리 안 파일 합계)"""
+    if os.path.isdir(path):
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+    return os.path.getsize(path)
+
+def generate(chats: int, per_chat: int):
+    """앞으로 60일 안에 흩어진 일정 (제목은 자주 쓰는 몇 가지를 반복)"""
+    random.seed(1)
+    now = datetime.now(Config.TIMEZONE).replace(second=0, microsecond=0)
+    titles = ['회의', '점심 약속', '운동', '스터디', '병원 예약', '프로젝트 마감']
+    schedules = {}
+    for chat in range(chats):
+        chat_schedules = []
+        for i in range(per_chat):
+            start = now + timedelta(minutes=10 * random.randrange(1, 6 * 24 * 60))
+            end = start + timedelta(minutes=30) if i % 2 else None
+            chat_schedules.append(Schedule(f"{random.choice(titles)} {i}", start, end, i + 1))
+        schedules[str(-1000000000 - chat)] = chat_schedules
+    return schedules
+
+def first_response(backend: str, data_dir: str, chat_id: str) -> None:
+    """새 프로세스에서 저장소를 열고 첫 명령(/week)에 응답할 때까지 걸린 시간 출력"""
+    Config.REMINDER_STATE_PATH = os.path.join(data_dir, f'reminders-{backend}.json')
+    from handlers.command_handlers import CommandHandlers
+    from services.message_service import MessageService
+    from services.outbound_dispatcher import OutboundDispatcher
+    from services.pinned_digest_service import PinnedDigestService
+    from services.schedule_service import ScheduleService
+    started = time.perf_counter()
+    schedule_service = ScheduleService(create_storage_service(backend, storage_path(data_dir, backend)))
+    ready = time.perf_counter()
+    handlers = CommandHandlers(schedule_service, MessageService(),
+                               PinnedDigestService(os.path.join(data_dir, 'pinned.json')), OutboundDispatcher())
+    handlers._weekly_digest(chat_id, datetime.now(Config.TIMEZONE))
+    answered = time.perf_counter()
+    print(f"{ready - started:.3f} {answered - started:.3f} {len(schedule_service.reminder_service)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="저장소별 재시작 후 첫 응답까지 걸리는 시간 측정")
+    parser.add_argument('--chats', type=int, default=10000, help="채팅방 수 (기본값: 10000)")
+    parser.add_argument('--per-chat', type=int, default=20, help="채팅방별 일정 수 (기본값: 20)")
+    parser.add_argument('--child', nargs=3, metavar=('BACKEND', 'DIR', 'CHAT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        first_response(*args.child)
+        return
+
+    schedules = generate(args.chats, args.per_chat)
+    chat_id = next(iter(schedules))
+    with tempfile.TemporaryDirectory() as data_dir:
+        for backend in BACKENDS:
+            storage = create_storage_service(backend, storage_path(data_dir, backend))
+            storage.save_schedules(schedules)
+            storage.close()
+
+        print(f"채팅방 {args.chats}개, 일정 {args.chats * args.per_chat}개")
+        for backend in BACKENDS:
+            size = storage_size(storage_path(data_dir, backend))
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', backend, data_dir, chat_id],
+                check=True, capture_output=True, text=True
+            ).stdout.split()
+            ready, answered, reminders = float(output[0]), float(output[1]), int(output[2])
+            print(f"{backend:>8}: 파일 {size / 1024 / 1024:.1f} MiB, 초기화 {ready * 1000:.0f} ms, "
+                  f"첫 응답 {answered * 1000:.0f} ms (알림 {reminders}개 등록)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from models.schedule import Schedule
+from services.schedule_index import ChatScheduleIndex
+
+def main():
+    parser = argparse.ArgumentParser(description="겹치는 일정 조회: 구간 트리와 전체 훑기 비교")
+    parser.add_argument('--schedules', type=int, default=100000, help="채팅방의 일정 수 (기본값: 100000)")
+    parser.add_argument('--days', type=int, default=365, help="일정이 퍼져 있는 날 수 (기본값: 365)")
+    parser.add_argument('--queries', type=int, default=2000, help="조회 수 (기본값: 2000)")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    base = int(Config.TIMEZONE.localize(datetime(2030, 1, 1)).timestamp())
+    span = args.days * 86400
+    schedules = []
+    for i in range(args.schedules):
+        start_ts = base + rng.randrange(span) // 300 * 300
+        # 대부분 30분~2시간, 일부는 종료 시간 없음, 드물게 며칠짜리
+        if rng.random() < 0.1:
+            end_ts = None
+        elif rng.random() < 0.01:
+            end_ts = start_ts + rng.randrange(1, 5) * 86400
+        else:
+            end_ts = start_ts + rng.randrange(1, 5) * 1800
+        schedules.append(Schedule.from_epoch(f"일정 {i}", start_ts, end_ts, id=i + 1))
+    index = ChatScheduleIndex(schedules)
+    queries = []
+    for _ in range(args.queries):
+        start_ts = base + rng.randrange(span)
+        queries.append((start_ts, start_ts + rng.randrange(1, 5) * 1800))
+
+    started = time.perf_counter()
+    index.overlapping(0, 0)  # 첫 조회 때 구간 트리 구성
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    indexed = [index.overlapping(start_ts, end_ts) for start_ts, end_ts in queries]
+    indexed_seconds = time.perf_counter() - started
+
+    busy_end = ChatScheduleIndex.busy_end
+    started = time.perf_counter()
+    scanned = [
+        [schedule for schedule in index if schedule.start_ts < end_ts and busy_end(schedule) > start_ts]
+        for start_ts, end_ts in queries
+    ]
+    scan_seconds = time.perf_counter() - started
+
+    found = sum(len(result) for result in indexed)
+    mismatches = sum(1 for a, b in zip(indexed, scanned) if a != b)
+    print(f"일정 {args.schedules}개 ({args.days}일), 조회 {args.queries}번, 찾은 겹침 {found}건")
+    print(f"구간 트리 구성: {build_seconds * 1000:.0f} ms")
+    print(f"구간 트리: {indexed_seconds / args.queries * 1e6:8,.1f} µs/조회")
+    print(f"전체 훑기: {scan_seconds / args.queries * 1e6:8,.1f} µs/조회 ({scan_seconds / indexed_seconds:,.0f}배)")
+    print(f"결과 불일치 {mismatches}건")
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from models.schedule import Schedule
+from services.date_service import DateService
+from services.storage_service import StorageService
+
+def legacy_parse_datetime(date_str: str, time_str: str) -> datetime:
+    """비교용: strptime + pytz localize"""
+    dt = datetime.strptime(f"{date_str} {time_str}", Config.DATETIME_FORMAT)
+    return Config.TIMEZONE.localize(dt)
+
+def legacy_deserialize(data: dict) -> Schedule:
+    """비교용: 값마다 fromisoformat으로 datetime 생성"""
+    return Schedule(
+        title=data['title'],
+        datetime=datetime.fromisoformat(data['datetime']),
+        end_time=datetime.fromisoformat(data['end_time']) if data['end_time'] else None,
+        id=data.get('id')
+    )
+
+def rate(func, count: int) -> float:
+    """초당 처리 건수 (만든 객체가 많아 GC는 끄고 측정)"""
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        func()
+        return count / (time.perf_counter() - started)
+    finally:
+        gc.enable()
+
+def main():
+    parser = argparse.ArgumentParser(description="날짜 파싱과 저장소 로딩의 시각 변환 성능 비교")
+    parser.add_argument('--inputs', type=int, default=200000, help="명령어 입력 수 (기본값: 200000)")
+    parser.add_argument('--records', type=int, default=500000, help="저장된 일정 수 (기본값: 500000)")
+    args = parser.parse_args()
+
+    random.seed(1)
+    base = Config.TIMEZONE.localize(datetime(2030, 1, 1))
+    inputs = []
+    for _ in range(args.inputs):
+        dt = base + timedelta(minutes=random.randrange(365 * 1440))
+        inputs.append((dt.strftime(Config.DATE_FORMAT), dt.strftime(Config.TIME_FORMAT)))
+
+    storage = StorageService.__new__(StorageService)  # 파일 없이 직렬화 함수만 사용
+    records = []
+    for i in range(args.records):
+        start = base + timedelta(minutes=10 * random.randrange(52560))
+        end = start + timedelta(minutes=30) if i % 2 else None
+        records.append(storage.serialize_schedule(Schedule(f"일정 {i}", start, end, i + 1)))
+
+    if [legacy_parse_datetime(*item) for item in inputs[:1000]] != \
+            [DateService.parse_datetime(*item) for item in inputs[:1000]]:
+        print("파싱 결과 불일치")
+        sys.exit(1)
+    if [legacy_deserialize(r) for r in records[:1000]] != storage.deserialize_schedules(records[:1000]):
+        print("로딩 결과 불일치")
+        sys.exit(1)
+
+    legacy_parse = rate(lambda: [legacy_parse_datetime(d, t) for d, t in inputs], args.inputs)
+    fast_parse = rate(lambda: [DateService.parse_datetime(d, t) for d, t in inputs], args.inputs)
+    legacy_load = rate(lambda: [legacy_deserialize(r) for r in records], args.records)
+    fast_load = rate(lambda: storage.deserialize_schedules(records), args.records)
+
+    print(f"입력 파싱 {args.inputs}건: strptime+localize {legacy_parse:,.0f}/s → "
+          f"고정 형식 {fast_parse:,.0f}/s ({fast_parse / legacy_parse:.1f}배)")
+    print(f"일정 로딩 {args.records}건: fromisoformat {legacy_load:,.0f}/s → "
+          f"일괄 변환 {fast_load:,.0f}/s ({fast_load / legacy_load:.1f}배)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from models.schedule import Schedule
+from services.schedule_index import ChatScheduleIndex
+from services.title_index import TitleIndex
+
+WORDS = ['팀', '미팅', '주간', '회의', '점심', '스탠드업', '코드', '리뷰', '배포', '고객', '상담', '면접',
+         '워크숍', '교육', '출장', '보고', '정산', '기획', '디자인', '데모', 'OKR', '1:1', '운영', '점검']
+# 채팅방 크기와 관계없이 --matches번씩만 넣어 두는 찾을 제목
+TARGETS = ['분기 실적 발표', '신규 입사자 환영회', '이사회 안건 검토', '연말 송년회', '서버 이전 작업',
+           '보안 감사 대응', '협력사 미팅', '사내 해커톤']
+
+def build_titles(count: int, rng: random.Random):
+    """2~4 단어 제목 (절반은 띄어쓰기 없이)"""
+    titles = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randrange(2, 5))]
+        titles.append(' '.join(words) if rng.random() < 0.5 else ''.join(words))
+    return titles
+
+def main():
+    parser = argparse.ArgumentParser(description="/find 제목 검색: n-gram 역색인과 부분 문자열 훑기 비교")
+    parser.add_argument('--sizes', default='1000,10000,100000', help="채팅방 일정 수 (기본값: 1000,10000,100000)")
+    parser.add_argument('--queries', type=int, default=500, help="크기별 조회 수 (기본값: 500)")
+    parser.add_argument('--matches', type=int, default=20, help="찾을 제목별 일정 수 (기본값: 20)")
+    args = parser.parse_args()
+
+    base = int(Config.TIMEZONE.localize(datetime(2030, 1, 1)).timestamp())
+    print("일정 수 | 색인 구성 ms | 색인 µs/조회 | 훑기 µs/조회 | 평균 결과 수")
+    for size in (int(value) for value in args.sizes.split(',')):
+        rng = random.Random(1)
+        titles = build_titles(size, rng)
+        for target in TARGETS:
+            for _ in range(args.matches):
+                titles[rng.randrange(size)] = target
+        index = ChatScheduleIndex(
+            Schedule.from_epoch(title, base + i * 600, id=i + 1) for i, title in enumerate(titles)
+        )
+        # 결과 수가 채팅방 크기와 관계없도록 찾을 제목의 일부(띄어쓰기 없이도)로 검색
+        queries = []
+        for _ in range(args.queries):
+            words = rng.choice(TARGETS).split()
+            query = ' '.join(words[:2])
+            queries.append(query if rng.random() < 0.5 else query.replace(' ', ''))
+
+        started = time.perf_counter()
+        index.search('')  # 첫 검색 때 역색인 구성
+        build_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        indexed = [index.search(query) for query in queries]
+        indexed_seconds = time.perf_counter() - started
+
+        normalize = TitleIndex.normalize
+        normalized = [(normalize(schedule.title), schedule) for schedule in index]
+        started = time.perf_counter()
+        scanned = []
+        for query in queries:
+            needle = normalize(query)
+            scanned.append([schedule for title, schedule in normalized if needle in title])
+        scan_seconds = time.perf_counter() - started
+
+        if any({s.id for s in a} != {s.id for s in b} for a, b in zip(indexed, scanned)):
+            print(f"{size}: 결과 불일치")
+            sys.exit(1)
+        average = sum(len(result) for result in indexed) / len(queries)
+        print(f"{size:>7,} | {build_seconds * 1000:11,.0f} | {indexed_seconds / len(queries) * 1e6:11,.1f} | "
+              f"{scan_seconds / len(queries) * 1e6:11,.1f} | {average:,.1f}")
+
+if __name__ == '__main__':
+    main()
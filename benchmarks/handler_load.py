@@ -0,0 +1,368 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from models.schedule import Schedule
+
+DEFAULT_MIX = 'add=30,week=25,list=20,edit=10,delete=10,cleanup=5'
+# 결과 JSON 기본 위치 (작업 디렉토리와 상관없이 benchmarks/results, .gitignore에 포함)
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'handler_load.json')
+TITLES = ['팀 미팅', '점심 약속', '운동', '스터디', '병원 예약', '프로젝트 마감', '1:1 면담']
+
+class CountingFile:
+    """닫을 때 늘어난 파일 크기만큼 기록량으로 더하는 파일 래퍼 (write() 호출마다 세면 측정 부담이 큼)"""
+
+    def __init__(self, file, counter: 'WriteCounter'):
+        self._file = file
+        self._counter = counter
+        self._start_size = os.fstat(file.fileno()).st_size
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.flush()
+            self._counter.bytes_written += os.fstat(self._file.fileno()).st_size - self._start_size
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+class WriteCounter:
+    """저장소 모듈의 open()을 바꿔서 기록한 바이트 수 집계 (SQLite는 /proc의 write 바이트로 대신 측정)"""
+
+    MODULES = ('services.base_storage_service', 'services.storage_service',
+               'services.sharded_storage_service', 'services.snapshot_storage_service')
+
+    def __init__(self):
+        self.bytes_written = 0
+
+    def open(self, path, mode='r', *args, **kwargs):
+        f = open(path, mode, *args, **kwargs)
+        if any(flag in mode for flag in 'wax'):
+            return CountingFile(f, self)
+        return f
+
+    def install(self) -> None:
+        for name in self.MODULES:
+            __import__(name)
+            sys.modules[name].open = self.open
+
+class StubBot:
+    """텔레그램 API 대신 호출 수와 보낸 글자 수만 기록하는 봇"""
+
+    def __init__(self):
+        self.calls: Dict[str, int] = {}
+        self.bytes_sent = 0
+        self.next_message_id = 1
+
+    def _record(self, method: str, text: Optional[str] = None) -> None:
+        self.calls[method] = self.calls.get(method, 0) + 1
+        if text:
+            self.bytes_sent += len(text.encode('utf-8'))
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self._record('send_message', text)
+        self.next_message_id += 1
+        return FakeMessage(FakeChat(chat_id), self, self.next_message_id)
+
+    async def edit_message_text(self, text, chat_id=None, message_id=None, **kwargs):
+        self._record('edit_message_text', text)
+        return True
+
+    async def pin_chat_message(self, chat_id, message_id, **kwargs):
+        self._record('pin_chat_message')
+        return True
+
+    async def unpin_chat_message(self, chat_id, message_id=None, **kwargs):
+        self._record('unpin_chat_message')
+        return True
+
+class FakeChat:
+    def __init__(self, chat_id):
+        self.id = chat_id
+
+class FakeMessage:
+    def __init__(self, chat: FakeChat, bot: StubBot, message_id: int = 0):
+        self.chat = chat
+        self.message_id = message_id
+        self._bot = bot
+
+    async def reply_text(self, text, **kwargs):
+        return await self._bot.send_message(self.chat.id, text)
+
+class FakeUpdate:
+    def __init__(self, chat_id: int, bot: StubBot):
+        self.effective_chat = FakeChat(chat_id)
+        self.message = FakeMessage(self.effective_chat, bot)
+
+class FakeContext:
+    def __init__(self, args: List[str], bot: StubBot):
+        self.args = args
+        self.bot = bot
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """'add=30,week=25' 형식의 명령어 비율"""
+    weights = {}
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        weights[name.strip()] = float(weight)
+    unknown = set(weights) - set(COMMANDS)
+    if unknown:
+        raise ValueError(f"알 수 없는 명령어입니다: {', '.join(sorted(unknown))}")
+    return weights
+
+def random_when(rng: random.Random, now: datetime, past_ratio: float = 0.1):
+    """(날짜, 시간 또는 시간 범위) 인자 (일부는 /cleanup 대상이 되도록 지난 날짜)"""
+    days = -rng.randint(1, 7) if rng.random() < past_ratio else rng.randint(0, 27)
+    start = (now + timedelta(days=days)).replace(hour=rng.randint(7, 21), minute=rng.choice((0, 15, 30, 45)))
+    time_str = start.strftime(Config.TIME_FORMAT)
+    if rng.random() < 0.5:
+        time_str += '~' + (start + timedelta(minutes=30)).strftime(Config.TIME_FORMAT)
+    return start.strftime(Config.DATE_FORMAT), time_str
+
+def add_args(rng, now, max_id):
+    return [*random_when(rng, now), *rng.choice(TITLES).split()]
+
+def edit_args(rng, now, max_id):
+    return [str(rng.randint(1, max_id)), *random_when(rng, now), *rng.choice(TITLES).split()]
+
+def delete_args(rng, now, max_id):
+    return [str(rng.randint(1, max_id))]
+
+def no_args(rng, now, max_id):
+    return []
+
+# 명령어 -> (CommandHandlers 메서드 이름, 인자 생성기)
+COMMANDS = {
+    'add': ('add_schedule', add_args),
+    'week': ('show_weekly_schedule', no_args),
+    'next': ('show_next_week_schedule', no_args),
+    'list': ('list_schedules', no_args),
+    'edit': ('edit_schedule', edit_args),
+    'delete': ('delete_schedule', delete_args),
+    'cleanup': ('cleanup_schedules', no_args),
+}
+
+def percentile(sorted_values: List[float], ratio: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(ratio * len(sorted_values)))]
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    values = sorted(latencies)
+    return {
+        'count': len(values),
+        'p50_ms': percentile(values, 0.50) * 1000,
+        'p99_ms': percentile(values, 0.99) * 1000,
+        'max_ms': (values[-1] if values else 0.0) * 1000,
+        'mean_ms': (sum(values) / len(values) if values else 0.0) * 1000,
+    }
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def process_write_bytes() -> Optional[int]:
+    """프로세스가 write 시스템 호출로 쓴 바이트 수 (리눅스 /proc 기준, SQLite 기록량 측정용)"""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            for line in f:
+                if line.startswith('wchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+async def run(args, data_dir: str) -> Dict:
+    Config.REMINDER_STATE_PATH = os.path.join(data_dir, 'reminders.json')
+    Config.ARCHIVE_DIR = os.path.join(data_dir, 'archive')
+    counter = WriteCounter()
+    counter.install()
+
+    from handlers.command_handlers import CommandHandlers
+    from services.message_service import MessageService
+    from services.outbound_dispatcher import OutboundDispatcher
+    from services.pinned_digest_service import PinnedDigestService
+    from services.schedule_service import ScheduleService
+    from services.storage_factory import create_storage_service
+    from services.storage_service import StorageService
+
+    path = os.path.join(data_dir, {'json': 'schedules.json', 'sqlite': 'schedules.db', 'sharded': 'shards',
+                                   'snapshot': 'schedules.snap'}[args.backend])
+    if args.backend == 'json':
+        storage = StorageService(path, journal=args.journal)
+    else:
+        storage = create_storage_service(args.backend, path)
+    if args.write_behind:
+        from services.write_behind_storage_service import WriteBehindStorageService
+        storage = WriteBehindStorageService(storage)
+
+    schedule_service = ScheduleService(storage)
+    # 텔레그램 속도 제한 대신 핸들러 자체의 비용을 재도록 발송 계층 제한은 사실상 없앰
+    dispatcher = OutboundDispatcher(global_rate=1e9, chat_rate=1e9, chat_burst=1e9,
+                                    coalesce_window=args.coalesce_window)
+    handlers = CommandHandlers(schedule_service, MessageService(),
+                               PinnedDigestService(os.path.join(data_dir, 'pinned.json')), dispatcher)
+    bot = StubBot()
+    rng = random.Random(args.seed)
+    now = datetime.now(Config.TIMEZONE)
+    chat_ids = [-1001000000000 - i for i in range(args.chats)]
+
+    # 초기 데이터 (채팅방마다 M개)
+    started = time.perf_counter()
+    for chat_id in chat_ids:
+        schedules = []
+        for _ in range(args.schedules):
+            date_str, time_str = random_when(rng, now, past_ratio=0.0)
+            start = Config.TIMEZONE.localize(datetime.strptime(f"{date_str} {time_str[:5]}", Config.DATETIME_FORMAT))
+            schedules.append(Schedule(rng.choice(TITLES), start))
+        schedule_service.add_schedules(str(chat_id), schedules)
+    if args.write_behind:
+        storage.flush_sync()
+    setup_seconds = time.perf_counter() - started
+
+    await storage.start()
+    weights = parse_mix(args.mix)
+    names = list(weights)
+    plan = [
+        (rng.choice(chat_ids), name)
+        for name in rng.choices(names, weights=[weights[n] for n in names], k=args.commands)
+    ]
+    max_id = args.schedules + args.commands // max(args.chats, 1) + 1
+
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    bytes_before = counter.bytes_written
+    syscall_bytes_before = process_write_bytes()
+    errors = 0
+
+    async def worker(items):
+        nonlocal errors
+        for chat_id, name in items:
+            method, make_args = COMMANDS[name]
+            update = FakeUpdate(chat_id, bot)
+            context = FakeContext(make_args(rng, now, max_id), bot)
+            command_started = time.perf_counter()
+            try:
+                await getattr(handlers, method)(update, context)
+            except Exception:
+                errors += 1
+            latencies[name].append(time.perf_counter() - command_started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(plan[i::args.concurrency]) for i in range(args.concurrency)))
+    await dispatcher.stop()
+    await storage.stop()
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    storage_bytes = counter.bytes_written - bytes_before
+    if args.backend == 'sqlite':
+        # C 라이브러리가 직접 쓰므로 open()으로 셀 수 없음 (고정 메시지 기록 등이 약간 섞임)
+        syscall_bytes = process_write_bytes()
+        storage_bytes = syscall_bytes - syscall_bytes_before if syscall_bytes is not None else None
+    return {
+        'revision': git_revision(),
+        'created_at': datetime.now(Config.TIMEZONE).isoformat(),
+        'config': vars(args),
+        'setup_seconds': setup_seconds,
+        'elapsed_seconds': elapsed,
+        'throughput_per_second': len(all_latencies) / elapsed,
+        'errors': errors,
+        'latency': summarize(all_latencies),
+        'commands': {name: summarize(values) for name, values in latencies.items()},
+        'storage_bytes_written': storage_bytes,
+        'storage_bytes_per_command': storage_bytes / len(all_latencies) if storage_bytes is not None else None,
+        'peak_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'bot_calls': bot.calls,
+        'bot_bytes_sent': bot.bytes_sent,
+        'dispatcher': dispatcher.stats(),
+        'storage': storage.stats() if hasattr(storage, 'stats') else None,
+    }
+
+def print_report(result: Dict, baseline: Optional[Dict]) -> None:
+    def delta(value: float, old: Optional[float]) -> str:
+        if not old:
+            return ''
+        return f" ({(value - old) / old * 100:+.1f}%)"
+
+    config = result['config']
+    print(f"채팅방 {config['chats']}개 × 일정 {config['schedules']}개, 명령 {config['commands']}개 "
+          f"({config['backend']}, 동시 {config['concurrency']})")
+    old = baseline or {}
+    latency, old_latency = result['latency'], old.get('latency', {})
+    print(f"처리량: {result['throughput_per_second']:,.0f} commands/s"
+          f"{delta(result['throughput_per_second'], old.get('throughput_per_second'))}")
+    print(f"지연 p50 {latency['p50_ms']:.2f} ms{delta(latency['p50_ms'], old_latency.get('p50_ms'))}, "
+          f"p99 {latency['p99_ms']:.2f} ms{delta(latency['p99_ms'], old_latency.get('p99_ms'))}")
+    for name, stats in result['commands'].items():
+        old_stats = old.get('commands', {}).get(name, {})
+        print(f"  /{name:<8} {stats['count']:>6}건  p50 {stats['p50_ms']:7.2f} ms  "
+              f"p99 {stats['p99_ms']:7.2f} ms{delta(stats['p99_ms'], old_stats.get('p99_ms'))}")
+    if result['storage_bytes_written'] is not None:
+        print(f"저장소 기록: {result['storage_bytes_written'] / 1024 / 1024:.1f} MiB "
+              f"({result['storage_bytes_per_command']:,.0f} B/command)"
+              f"{delta(result['storage_bytes_written'], old.get('storage_bytes_written'))}")
+    print(f"최대 메모리(RSS): {result['peak_rss_kib'] / 1024:.1f} MiB"
+          f"{delta(result['peak_rss_kib'], old.get('peak_rss_kib'))}")
+    if result['errors']:
+        print(f"핸들러 예외: {result['errors']}건")
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 Update/봇으로 CommandHandlers에 부하를 주고 지연 시간 측정")
+    parser.add_argument('--chats', type=int, default=200, help="채팅방 수 (기본값: 200)")
+    parser.add_argument('--schedules', type=int, default=50, help="채팅방별 초기 일정 수 (기본값: 50)")
+    parser.add_argument('--commands', type=int, default=20000, help="보낼 명령 수 (기본값: 20000)")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"명령어 비율 (기본값: {DEFAULT_MIX})")
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help="동시에 처리할 명령 수 (기본값: 1, python-telegram-bot 기본 동작)")
+    # 저장소 구성 기본값은 봇과 같은 설정값을 따름
+    parser.add_argument('--backend', default=Config.STORAGE_BACKEND, choices=('json', 'sqlite', 'sharded', 'snapshot'),
+                        help=f"저장소 종류 (기본값: {Config.STORAGE_BACKEND})")
+    parser.add_argument('--journal', action=argparse.BooleanOptionalAction, default=Config.STORAGE_JOURNAL,
+                        help="json 저장소의 저널 모드 사용")
+    parser.add_argument('--write-behind', action=argparse.BooleanOptionalAction, default=Config.WRITE_BEHIND,
+                        help="백그라운드 저장 래퍼 사용")
+    parser.add_argument('--coalesce-window', type=float, default=Config.OUTBOUND_COALESCE_WINDOW,
+                        help="주간 일정 고정 메시지 갱신 병합 시간(초)")
+    parser.add_argument('--seed', type=int, default=1, help="난수 시드 (기본값: 1)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help="결과 JSON 경로 (기본값: benchmarks/results/handler_load.json, git에서 제외)")
+    parser.add_argument('--compare', help="이전 결과 JSON (변화율 함께 출력)")
+    args = parser.parse_args()
+    parse_mix(args.mix)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        result = asyncio.run(run(args, data_dir))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from models.schedule import Schedule
+from services.ical_service import ICalService
+
+def generate_schedules(count: int):
+    """30분 간격의 일정 count개 생성 (절반은 종료 시간 포함)"""
+    base = Config.TIMEZONE.localize(datetime(2030, 1, 1, 9, 0))
+    for i in range(count):
+        start = base + timedelta(minutes=30 * i)
+        end = start + timedelta(minutes=20) if i % 2 else None
+        yield Schedule(title=f"회의 {i}, 안건; 검토", datetime=start, end_time=end, id=i + 1)
+
+def export_file(path: str, count: int) -> None:
+    with open(path, 'wb') as f:
+        for chunk in ICalService().iter_export('bench', generate_schedules(count)):
+            f.write(chunk.encode('utf-8'))
+
+def import_file(path: str) -> int:
+    """파싱만 수행 (일정을 쌓아 두지 않음)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(1 for _ in ICalService().iter_events(f))
+
+def measure(func, *args):
+    """(결과, 소요 시간) 반환 후 tracemalloc으로 한 번 더 실행해 최대 메모리 측정"""
+    started = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - started
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=".ics 내보내기/가져오기 성능 측정")
+    parser.add_argument('--events', type=int, default=50000, help="일정 수 (기본값: 50000)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bench.ics')
+        _, export_seconds, export_peak = measure(export_file, path, args.events)
+        size = os.path.getsize(path)
+        parsed, import_seconds, import_peak = measure(import_file, path)
+
+    print(f"일정 {args.events}개, 파일 {size / 1024 / 1024:.1f} MiB")
+    print(f"내보내기: {export_seconds:.2f}s ({args.events / export_seconds:,.0f} events/s), "
+          f"최대 메모리 {export_peak / 1024:.0f} KiB")
+    print(f"가져오기: {import_seconds:.2f}s ({parsed / import_seconds:,.0f} events/s), "
+          f"최대 메모리 {import_peak / 1024:.0f} KiB")
+
+if __name__ == '__main__':
+    main()
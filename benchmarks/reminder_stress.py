@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from models.schedule import Schedule
+from services.reminder_service import ReminderService
+
+class FakeClock:
+    """직접 시간을 옮기는 가짜 시계"""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+def main():
+    parser = argparse.ArgumentParser(description="알림 발송기 부하 테스트 (가짜 시계 사용)")
+    parser.add_argument('--reminders', type=int, default=100000, help="알림 수 (기본값: 100000)")
+    parser.add_argument('--chats', type=int, default=5000, help="채팅방 수 (기본값: 5000)")
+    parser.add_argument('--hours', type=int, default=24, help="일정이 퍼져 있는 시간 (기본값: 24)")
+    parser.add_argument('--step', type=int, default=60, help="시계를 한 번에 옮기는 초 (기본값: 60)")
+    args = parser.parse_args()
+
+    random.seed(1)
+    base = Config.TIMEZONE.localize(datetime(2030, 1, 1)).timestamp()
+    clock = FakeClock(base)
+
+    # 채팅방별 일정 (일부는 나중에 삭제·수정)
+    schedules = {}
+    for i in range(args.reminders):
+        chat_id = str(i % args.chats)
+        start_ts = int(base) + 3600 + random.randrange(args.hours * 3600)
+        schedule = Schedule.from_epoch(f"일정 {i}", start_ts, id=i // args.chats + 1)
+        schedules.setdefault(chat_id, {})[schedule.id] = schedule
+
+    def lookup(chat_id: str, schedule_id: int):
+        return schedules.get(chat_id, {}).get(schedule_id)
+
+    delivered = {}
+
+    async def send(chat_id: str, schedule: Schedule) -> None:
+        key = (chat_id, schedule.id, schedule.start_ts)
+        delivered[key] = delivered.get(key, 0) + 1
+        await asyncio.sleep(0)
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_path = os.path.join(tmp_dir, 'reminders.json')
+            reminders = ReminderService(state_path=state_path, clock=clock)
+
+            started = time.perf_counter()
+            reminders.rebuild((chat_id, s) for chat_id, by_id in schedules.items() for s in by_id.values())
+            rebuild_seconds = time.perf_counter() - started
+
+            # 1%는 삭제, 1%는 시작 시각 변경
+            chat_ids = list(schedules)
+            for _ in range(args.reminders // 100):
+                by_id = schedules[random.choice(chat_ids)]
+                if by_id:
+                    by_id.pop(random.choice(list(by_id)))
+            edited = 0
+            for _ in range(args.reminders // 100):
+                chat_id = random.choice(chat_ids)
+                if schedules[chat_id]:
+                    schedule = random.choice(list(schedules[chat_id].values()))
+                    schedule.start_ts += 1800
+                    reminders.push(chat_id, schedule)
+                    edited += 1
+
+            # 절반쯤 진행한 뒤 재시작 (보낸 기록 파일로 복원)
+            end = base + 3600 * (args.hours + 2)
+            restart_at = base + 3600 * (args.hours // 2 + 1)
+            restarted = False
+            batches = 0
+            started = time.perf_counter()
+            while clock.now <= end:
+                await reminders.dispatch_due(send, lookup, clock.now)
+                batches += 1
+                clock.now += args.step
+                if not restarted and clock.now >= restart_at:
+                    reminders = ReminderService(state_path=state_path, clock=clock)
+                    reminders.rebuild((chat_id, s) for chat_id, by_id in schedules.items() for s in by_id.values())
+                    restarted = True
+            dispatch_seconds = time.perf_counter() - started
+
+        expected = {
+            (chat_id, s.id, s.start_ts)
+            for chat_id, by_id in schedules.items() for s in by_id.values()
+        }
+        duplicates = sum(1 for count in delivered.values() if count > 1)
+        missing = len(expected - delivered.keys())
+        unexpected = len(delivered.keys() - expected)
+
+        print(f"알림 {args.reminders}개, 채팅방 {args.chats}개, 수정 {edited}개")
+        print(f"힙 구성: {rebuild_seconds * 1000:.0f} ms")
+        print(f"발송: {dispatch_seconds:.2f}s ({batches}번 깨어남, {len(delivered) / dispatch_seconds:,.0f} reminders/s)")
+        print(f"발송 {len(delivered)}개, 누락 {missing}개, 중복 {duplicates}개, 무효 발송 {unexpected}개")
+        if missing or duplicates or unexpected:
+            sys.exit(1)
+
+    asyncio.run(run())
+
+if __name__ == '__main__':
+    main()
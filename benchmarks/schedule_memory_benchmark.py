@@ -0,0 +1,92 @@
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from models.recurrence import Recurrence
+from models.schedule import Schedule
+
+@dataclass
+class LegacySchedule:
+    """비교용: 이전 dataclass 표현 (시간대가 붙은 datetime 보관)"""
+    title: str
+    datetime: 'datetime'
+    end_time: Optional['datetime'] = None
+    id: Optional[int] = None
+    recurrence: Optional[Recurrence] = None
+
+def build_legacy(count: int, base: datetime):
+    schedules = []
+    for i in range(count):
+        start = base + timedelta(minutes=7 * i)
+        end = start + timedelta(minutes=30) if i % 2 else None
+        schedules.append(LegacySchedule(f"일정 {i}", start, end, i + 1))
+    return schedules
+
+def build_compact(count: int, base: datetime):
+    base_ts = int(base.timestamp())
+    schedules = []
+    for i in range(count):
+        start_ts = base_ts + 420 * i
+        end_ts = start_ts + 1800 if i % 2 else None
+        schedules.append(Schedule.from_epoch(f"일정 {i}", start_ts, end_ts, i + 1))
+    return schedules
+
+def measure_memory(build, count: int, base: datetime) -> float:
+    """일정 1건당 바이트 (제목 문자열 포함)"""
+    gc.collect()
+    tracemalloc.start()
+    schedules = build(count, base)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del schedules
+    return size / count
+
+def measure_filter(schedules, predicate, repeat: int):
+    """(일치 개수, 초당 검사한 일정 수)"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        matched = sum(1 for s in schedules if predicate(s))
+    seconds = time.perf_counter() - started
+    return matched, len(schedules) * repeat / seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="일정 표현 방식별 메모리와 기간 필터 처리량 비교")
+    parser.add_argument('--schedules', type=int, default=1000000, help="일정 수 (기본값: 1000000)")
+    parser.add_argument('--repeat', type=int, default=3, help="필터 반복 횟수 (기본값: 3)")
+    args = parser.parse_args()
+
+    base = Config.TIMEZONE.localize(datetime(2030, 1, 1, 9, 0))
+    week_start = base + timedelta(days=30)
+    week_end = week_start + timedelta(days=7)
+    start_ts, end_ts = week_start.timestamp(), week_end.timestamp()
+
+    legacy_bytes = measure_memory(build_legacy, args.schedules, base)
+    compact_bytes = measure_memory(build_compact, args.schedules, base)
+
+    legacy = build_legacy(args.schedules, base)
+    legacy_matched, legacy_rate = measure_filter(
+        legacy, lambda s: week_start <= s.datetime.astimezone(Config.TIMEZONE) <= week_end, args.repeat)
+    del legacy
+    compact = build_compact(args.schedules, base)
+    compact_matched, compact_rate = measure_filter(
+        compact, lambda s: start_ts <= s.start_ts <= end_ts, args.repeat)
+
+    print(f"일정 {args.schedules}개, 1주일 범위 일치 {compact_matched}개")
+    print(f"dataclass + datetime: {legacy_bytes:.0f} B/일정, 필터 {legacy_rate:,.0f} schedules/s")
+    print(f"__slots__ + epoch:    {compact_bytes:.0f} B/일정, 필터 {compact_rate:,.0f} schedules/s")
+    print(f"메모리 {legacy_bytes / compact_bytes:.1f}배 절약, 필터 {compact_rate / legacy_rate:.1f}배 빠름")
+    if legacy_matched != compact_matched:
+        print(f"결과 불일치: {legacy_matched} != {compact_matched}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram.ext import Application
+from config import Config
+from handlers.command_handlers import CommandHandlers, register_handlers
+from models.schedule import Schedule
+from services.message_service import MessageService
+from services.outbound_dispatcher import OutboundDispatcher
+from services.pinned_digest_service import PinnedDigestService
+from services.schedule_service import ScheduleService
+from services.storage_factory import create_storage_service
+from services.update_processor import ChatOrderedUpdateProcessor
+
+TOKEN = '123456:benchmark'
+REPLY_ID = re.compile(r'\(번호: (\d+)\)')
+
+class FakeTelegramServer:
+    """getUpdates로 준비한 업데이트를 내주고 발송 API에는 지정한 지연 후 응답하는 로컬 Bot API 대역"""
+
+    def __init__(self, updates: List[Dict], latency: float):
+        self.updates = updates
+        self.latency = latency
+        self.sent: Dict[int, List[str]] = defaultdict(list)  # 채팅방별 받은 메시지 (도착 순)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.message_id = 0
+        self.reply_count = 0  # 일정 번호가 담긴 /add 답장 수
+        self.port = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._replies_wanted = 0
+        self._replies_reached: Optional[asyncio.Event] = None
+
+    @classmethod
+    def serve(cls, updates: List[Dict], latency: float, conn) -> None:
+        """별도 프로세스에서 실행 (봇과 CPU를 나눠 쓰지 않도록)
+
+        ('wait', n)을 받으면 /add 답장이 n개 도착했을 때 응답하고, ('stop',)을 받으면 기록을 돌려주고 끝냄
+        """
+        async def main():
+            server = cls(updates, latency)
+            await server.start()
+            conn.send(server.port)
+            loop = asyncio.get_running_loop()
+            while (command := await loop.run_in_executor(None, conn.recv))[0] == 'wait':
+                await server.wait_replies(command[1])
+                conn.send(time.time())
+            await server.stop()
+            conn.send((dict(server.sent), dict(server.calls)))
+        asyncio.run(main())
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def wait_replies(self, count: int) -> None:
+        self._replies_wanted = count
+        self._replies_reached = asyncio.Event()
+        if self.reply_count >= count:
+            return
+        await self._replies_reached.wait()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # keep-alive 연결에서 요청을 차례로 처리
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                headers = {}
+                while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                method = request_line.decode('latin-1').split()[1].rsplit('/', 1)[-1]
+                if headers.get('content-type', '').startswith('application/json'):
+                    params = json.loads(body or b'{}')
+                else:
+                    params = dict(parse_qsl(body.decode('utf-8')))
+                payload = json.dumps({'ok': True, 'result': await self._call(method, params)}).encode('utf-8')
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode('latin-1') + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _call(self, method: str, params: Dict):
+        self.calls[method] += 1
+        if method == 'getMe':
+            return {'id': 123456, 'is_bot': True, 'first_name': 'benchmark', 'username': 'benchmark_bot'}
+        if method == 'getUpdates':
+            offset = int(params.get('offset') or 0)
+            limit = int(params.get('limit') or 100)
+            batch = [update for update in self.updates if update['update_id'] >= offset][:limit]
+            if not batch:
+                await asyncio.sleep(0.05)
+            return batch
+        if method.startswith(('send', 'edit')):
+            # 실제 API 왕복 시간 흉내
+            await asyncio.sleep(self.latency)
+            chat_id = int(params['chat_id'])
+            self.sent[chat_id].append(params.get('text', ''))
+            if REPLY_ID.search(params.get('text', '')):
+                self.reply_count += 1
+                if self._replies_reached and self.reply_count >= self._replies_wanted:
+                    self._replies_reached.set()
+            self.message_id += 1
+            return {'message_id': self.message_id, 'date': int(time.time()), 'text': params.get('text', ''),
+                    'chat': {'id': chat_id, 'type': 'group', 'title': 'benchmark'}}
+        return True
+
+def build_updates(chats: int, per_chat: int, seed: int) -> Tuple[List[Dict], List[int]]:
+    """채팅방마다 /add per_chat개 (제목에 순번), 채팅방 순서는 섞어서 도착"""
+    rng = random.Random(seed)
+    chat_ids = [-1001000000000 - i for i in range(chats)]
+    order = [chat_id for chat_id in chat_ids for _ in range(per_chat)]
+    rng.shuffle(order)
+    when = (datetime.now(Config.TIMEZONE) + timedelta(days=30)).strftime(Config.DATE_FORMAT)
+
+    counts: Dict[int, int] = defaultdict(int)
+    updates = []
+    for update_id, chat_id in enumerate(order, start=1):
+        counts[chat_id] += 1
+        text = f"/add {when} {9 + counts[chat_id] % 10:02d}:00 부하 {counts[chat_id]}"
+        updates.append({
+            'update_id': update_id,
+            'message': {
+                'message_id': update_id, 'date': int(time.time()), 'text': text,
+                'chat': {'id': chat_id, 'type': 'group', 'title': 'benchmark'},
+                'from': {'id': -chat_id, 'is_bot': False, 'first_name': 'user'},
+                'entities': [{'type': 'bot_command', 'offset': 0, 'length': 4}],
+            },
+        })
+    return updates, chat_ids
+
+def check_order(sent: Dict[int, List[str]], schedules: Dict[str, List[Schedule]], chat_ids: List[int],
+                per_chat: int) -> int:
+    """채팅방마다 답장 속 일정 번호와 저장된 일정 제목이 받은 순서와 같은지 확인 (어긋난 채팅방 수)"""
+    broken = 0
+    for chat_id in chat_ids:
+        replied = [int(match.group(1)) for text in sent.get(chat_id, []) if (match := REPLY_ID.search(text))]
+        titles = [schedule.title for schedule in sorted(schedules.get(str(chat_id), []),
+                                                        key=lambda schedule: schedule.id)]
+        if replied != list(range(1, per_chat + 1)) or titles != [f"부하 {i}" for i in range(1, per_chat + 1)]:
+            broken += 1
+    return broken
+
+async def run(concurrency: int, port: int, update_count: int, args, data_dir: str) -> Tuple[Dict, ScheduleService]:
+    Config.REMINDER_STATE_PATH = os.path.join(data_dir, 'reminders.json')
+    storage = create_storage_service('json', os.path.join(data_dir, 'schedules.json'), write_behind=True)
+    schedule_service = ScheduleService(storage)
+    # 텔레그램 속도 제한 대신 업데이트 처리 방식의 차이를 재도록 발송 계층 제한은 사실상 없앰
+    dispatcher = OutboundDispatcher(global_rate=1e9, chat_rate=1e9, chat_burst=1e9,
+                                    coalesce_window=args.coalesce_window)
+    command_handlers = CommandHandlers(schedule_service, MessageService(),
+                                       PinnedDigestService(os.path.join(data_dir, 'pinned.json')), dispatcher)
+    processor = ChatOrderedUpdateProcessor(concurrency)
+    application = (
+        Application.builder()
+        .token(TOKEN)
+        .base_url(f"http://127.0.0.1:{port}/bot")
+        .concurrent_updates(processor)
+        .build()
+    )
+    register_handlers(application, command_handlers)
+
+    async with application:
+        await storage.start()
+        await application.start()
+        started, cpu_started = time.perf_counter(), time.process_time()
+        await application.updater.start_polling(poll_interval=0, timeout=0)
+        while processor.processed_count < update_count:
+            await asyncio.sleep(0.005)
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+        await application.updater.stop()
+        await application.stop()
+        await dispatcher.stop()
+        await storage.stop()
+
+    return {
+        'concurrency': concurrency,
+        'updates': update_count,
+        'seconds': elapsed,
+        'updates_per_second': update_count / elapsed,
+        'cpu_ms_per_update': cpu / update_count * 1000,
+        'max_chat_backlog': processor.max_chat_backlog,
+        'queued_behind_same_chat': processor.queued_count,
+    }, schedule_service
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="로컬 Bot API 대역을 상대로 동시 업데이트 처리의 처리량과 채팅방별 순서 보장 확인")
+    parser.add_argument('--chats', type=int, default=100, help="채팅방 수 (기본값: 100)")
+    parser.add_argument('--per-chat', type=int, default=5, help="채팅방별 /add 수 (기본값: 5)")
+    parser.add_argument('--latency', type=float, default=50.0, help="발송 API 응답 지연 ms (기본값: 50)")
+    parser.add_argument('--concurrency', default='1,4,16,64', help="비교할 동시 처리 수 (기본값: 1,4,16,64)")
+    parser.add_argument('--coalesce-window', type=float, default=0.05,
+                        help="주간 일정 갱신 병합 시간 초 (기본값: 0.05)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+
+    updates, chat_ids = build_updates(args.chats, args.per_chat, args.seed)
+    results = []
+    print(f"채팅방 {args.chats}개 × /add {args.per_chat}개, 발송 지연 {args.latency:g} ms")
+    for concurrency in (int(value) for value in args.concurrency.split(',')):
+        conn, server_conn = multiprocessing.Pipe()
+        server = multiprocessing.Process(target=FakeTelegramServer.serve,
+                                         args=(updates, args.latency / 1000, server_conn))
+        server.start()
+        try:
+            with tempfile.TemporaryDirectory() as data_dir:
+                result, schedule_service = asyncio.run(run(concurrency, conn.recv(), len(updates), args, data_dir))
+            conn.send(('stop',))
+            sent, calls = conn.recv()
+        finally:
+            server.join(timeout=10)
+            if server.is_alive():
+                server.terminate()
+        schedules = {str(chat_id): schedule_service.get_schedules(str(chat_id)) for chat_id in chat_ids}
+        result['broken_chats'] = check_order(sent, schedules, chat_ids, args.per_chat)
+        result['api_calls'] = calls
+        results.append(result)
+        base = results[0]['updates_per_second']
+        print(f"  동시 {concurrency:>3}: {result['updates_per_second']:8,.0f} updates/s "
+              f"({result['updates_per_second'] / base:4.1f}배), {result['seconds']:.2f}s, "
+              f"CPU {result['cpu_ms_per_update']:.1f} ms/update, "
+              f"같은 채팅방 대기 {result['queued_behind_same_chat']}건 (최대 {result['max_chat_backlog']}), "
+              f"순서 어긋난 채팅방 {result['broken_chats']}개")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+    if any(result['broken_chats'] for result in results):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
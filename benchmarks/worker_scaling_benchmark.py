@@ -0,0 +1,122 @@
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from benchmarks.update_concurrency_benchmark import TOKEN, FakeTelegramServer, build_updates, check_order
+from main import build_application, build_front_application
+from models.schedule import Schedule
+from services.partition_service import PartitionService
+from services.storage_factory import create_storage_service
+
+def configure(**values) -> None:
+    """앞단(Config 속성)과 spawn으로 뜨는 작업 프로세스(환경 변수)에 같은 설정 적용"""
+    for name, value in values.items():
+        setattr(Config, name, value)
+        os.environ[name] = str(value).lower() if isinstance(value, bool) else str(value)
+
+async def run(application, conn, update_count: int) -> float:
+    """run_polling과 같은 순서로 시작/종료하고, 마지막 /add 답장까지 걸린 시간 반환"""
+    loop = asyncio.get_running_loop()
+    await application.initialize()
+    await application.post_init(application)
+    await application.start()
+    started = time.time()
+    await application.updater.start_polling(poll_interval=0, timeout=0)
+    conn.send(('wait', update_count))
+    finished = await loop.run_in_executor(None, conn.recv)
+    await application.updater.stop()
+    await application.stop()
+    await application.shutdown()
+    await application.post_shutdown(application)
+    return finished - started
+
+def load_partitions(workers: int) -> Dict[str, List[Schedule]]:
+    partitions = PartitionService(workers or 1)
+    schedules: Dict[str, List[Schedule]] = {}
+    for index in range(partitions.count):
+        storage = create_storage_service('json', partitions.paths(index)[0])
+        schedules.update(storage.load_schedules())
+        storage.close()
+    return schedules
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="작업 프로세스 수별 처리량 비교 (로컬 Bot API 대역 상대, main.py의 구성을 그대로 사용)")
+    parser.add_argument('--chats', type=int, default=100, help="채팅방 수 (기본값: 100)")
+    parser.add_argument('--per-chat', type=int, default=5, help="채팅방별 /add 수 (기본값: 5)")
+    parser.add_argument('--latency', type=float, default=50.0, help="발송 API 응답 지연 ms (기본값: 50)")
+    parser.add_argument('--workers', default='0,1,2,4', help="비교할 작업 프로세스 수, 0은 한 프로세스 (기본값: 0,1,2,4)")
+    parser.add_argument('--concurrency', type=int, default=16, help="프로세스별 동시 처리 수 (기본값: 16)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+
+    updates, chat_ids = build_updates(args.chats, args.per_chat, args.seed)
+    print(f"채팅방 {args.chats}개 × /add {args.per_chat}개, 발송 지연 {args.latency:g} ms, "
+          f"프로세스별 동시 처리 {args.concurrency}, CPU {os.cpu_count()}개")
+    results = []
+    for workers in (int(value) for value in args.workers.split(',')):
+        conn, server_conn = multiprocessing.Pipe()
+        server = multiprocessing.Process(target=FakeTelegramServer.serve,
+                                         args=(updates, args.latency / 1000, server_conn))
+        server.start()
+        with tempfile.TemporaryDirectory() as data_dir:
+            configure(
+                TELEGRAM_BOT_TOKEN=TOKEN, TELEGRAM_BASE_URL=f"http://127.0.0.1:{conn.recv()}/bot",
+                STORAGE_BACKEND='json', JSON_STORAGE_PATH=os.path.join(data_dir, 'schedules.json'),
+                REMINDER_STATE_PATH=os.path.join(data_dir, 'reminders.json'),
+                PINNED_DIGEST_PATH=os.path.join(data_dir, 'pinned.json'),
+                PARTITION_STATE_PATH=os.path.join(data_dir, 'partitions.json'),
+                WORKER_PROCESSES=workers, CONCURRENT_UPDATES=args.concurrency, WRITE_BEHIND=True,
+                # 텔레그램 속도 제한 대신 처리 구조의 차이를 재도록 발송 계층 제한은 사실상 없앰
+                OUTBOUND_GLOBAL_RATE=1e9, OUTBOUND_CHAT_RATE=1e9, OUTBOUND_CHAT_BURST=10 ** 9,
+                OUTBOUND_COALESCE_WINDOW=0.05, METRICS_PORT=0,
+            )
+            try:
+                PartitionService(workers or 1).rebalance()
+                application = build_front_application() if workers else build_application()
+                seconds = asyncio.run(run(application, conn, len(updates)))
+                conn.send(('stop',))
+                sent, calls = conn.recv()
+            finally:
+                server.join(timeout=10)
+                if server.is_alive():
+                    server.terminate()
+            broken = check_order(sent, load_partitions(workers), chat_ids, args.per_chat)
+
+        result = {
+            'workers': workers,
+            'updates': len(updates),
+            'seconds': seconds,
+            'updates_per_second': len(updates) / seconds,
+            'broken_chats': broken,
+            'api_calls': calls,
+        }
+        results.append(result)
+        label = f"작업 {workers}개" if workers else "한 프로세스"
+        print(f"  {label:>7}: {result['updates_per_second']:8,.0f} updates/s "
+              f"({result['updates_per_second'] / results[0]['updates_per_second']:4.1f}배), "
+              f"{seconds:.2f}s, 순서 어긋난 채팅방 {broken}개")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+    if any(result['broken_chats'] for result in results):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,103 @@ class Config:
     TIME_FORMAT = "%H:%M"
     DATETIME_FORMAT = f"{DATE_FORMAT} {TIME_FORMAT}"
 
+    # 저장소 설정 (json | sqlite | sharded | snapshot)
+    STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'json')
+    JSON_STORAGE_PATH = os.getenv('JSON_STORAGE_PATH', 'data/schedules.json')
+    SQLITE_STORAGE_PATH = os.getenv('SQLITE_STORAGE_PATH', 'data/schedules.db')
+    SHARD_STORAGE_DIR = os.getenv('SHARD_STORAGE_DIR', 'data/shards')
+    SNAPSHOT_STORAGE_PATH = os.getenv('SNAPSHOT_STORAGE_PATH', 'data/schedules.snap')
+    SHARD_BUCKETS = int(os.getenv('SHARD_BUCKETS', '0'))  # 0이면 채팅방마다 샤드 1개
+    STORAGE_JOURNAL = os.getenv('STORAGE_JOURNAL', 'false').lower() == 'true'
+    JOURNAL_COMPACT_THRESHOLD = int(os.getenv('JOURNAL_COMPACT_THRESHOLD', '1000'))
+    JOURNAL_FSYNC = os.getenv('JOURNAL_FSYNC', 'true').lower() == 'true'
+    # 지연 로딩 저장소(sqlite, sharded, snapshot)에서 메모리에 올려 둘 최대 채팅방 수 (넘으면 가장 오래 쓰지 않은
+    # 채팅방부터 내림, 0이면 제한 없음). 알림·아침 브리핑 색인은 모든 채팅방의 다가오는 일정을 계속 메모리에 둠
+    LOADED_CHATS_MAX = int(os.getenv('LOADED_CHATS_MAX', '10000'))
+
+    # 백그라운드 저장 (변경을 모아 디바운스 간격마다 또는 대기열이 차면 저장)
+    WRITE_BEHIND = os.getenv('WRITE_BEHIND', 'true').lower() == 'true'
+    WRITE_BEHIND_INTERVAL = float(os.getenv('WRITE_BEHIND_INTERVAL', '1.0'))
+    WRITE_BEHIND_MAX_PENDING = int(os.getenv('WRITE_BEHIND_MAX_PENDING', '500'))
+
+    # 채팅방별 고정 주간 일정 메시지 번호 저장 위치
+    PINNED_DIGEST_PATH = os.getenv('PINNED_DIGEST_PATH', 'data/pinned_digests.json')
+
+    # 렌더링된 주간 일정 캐시 크기 (주간 전체 + 날짜별 구간 항목 수)
+    DIGEST_CACHE_SIZE = int(os.getenv('DIGEST_CACHE_SIZE', '20000'))
+
+    # 발송 속도 제한 (전체 초당 메시지 수, 채팅방별 초당 메시지 수와 순간 허용량)
+    OUTBOUND_GLOBAL_RATE = float(os.getenv('OUTBOUND_GLOBAL_RATE', '25'))
+    OUTBOUND_CHAT_RATE = float(os.getenv('OUTBOUND_CHAT_RATE', '1.0'))
+    OUTBOUND_CHAT_BURST = int(os.getenv('OUTBOUND_CHAT_BURST', '3'))
+    # 이 시간(초) 안에 들어온 같은 채팅방의 주간 일정 갱신은 한 번으로 병합
+    OUTBOUND_COALESCE_WINDOW = float(os.getenv('OUTBOUND_COALESCE_WINDOW', '1.0'))
+    OUTBOUND_MAX_RETRIES = int(os.getenv('OUTBOUND_MAX_RETRIES', '3'))
+
+    # 일정 시작 전 알림 (몇 분 전, 동시 발송 수, 보낸 알림 기록 위치)
+    REMINDER_LEAD_MINUTES = int(os.getenv('REMINDER_LEAD_MINUTES', '10'))
+    REMINDER_CONCURRENCY = int(os.getenv('REMINDER_CONCURRENCY', '20'))
+    REMINDER_STATE_PATH = os.getenv('REMINDER_STATE_PATH', 'data/reminders.json')
+
+    # 아침 브리핑: 매일 이 시각(현지 HH:MM)에 그날 일정이 있는 채팅방마다 하루 일정 발송
+    # 기본은 꺼져 있으며 켜려면 MORNING_DIGEST_TIME=08:00처럼 설정 (값이 있을 때만 morning_digest 작업 등록)
+    MORNING_DIGEST_TIME = os.getenv('MORNING_DIGEST_TIME', '')
+    # 브리핑 동시 발송 수, 보낸 채팅방 기록 위치와 디스크 동기화 간격(기록 줄 수, 프로세스 재시작에는 영향 없음)
+    BROADCAST_CONCURRENCY = int(os.getenv('BROADCAST_CONCURRENCY', '50'))
+    BROADCAST_STATE_PATH = os.getenv('BROADCAST_STATE_PATH', 'data/broadcast.jsonl')
+    BROADCAST_FSYNC_EVERY = int(os.getenv('BROADCAST_FSYNC_EVERY', '50'))
+    # 발송에 실패한 채팅방을 끝을 기록하기 전에 다시 보낼 횟수와 다시 보내기 전 대기 시간(초)
+    BROADCAST_RETRY_ROUNDS = int(os.getenv('BROADCAST_RETRY_ROUNDS', '2'))
+    BROADCAST_RETRY_DELAY = float(os.getenv('BROADCAST_RETRY_DELAY', '30'))
+
+    # /list에서 반복 일정 회차를 펼쳐 보여줄 기간 (일)
+    RECURRENCE_LIST_DAYS = int(os.getenv('RECURRENCE_LIST_DAYS', '28'))
+    # 반복 규칙에 지정할 수 있는 최대 횟수(count=)와 종료일(until=)이 오늘부터 몇 년 뒤까지인지
+    RECURRENCE_MAX_COUNT = int(os.getenv('RECURRENCE_MAX_COUNT', '1000'))
+    RECURRENCE_MAX_YEARS = int(os.getenv('RECURRENCE_MAX_YEARS', '10'))
+    # /list 한 페이지의 최대 일정 수와 글자 수 (텔레그램 메시지 한도 4096자), 페이지 나눔을 캐시할 채팅방 수
+    LIST_PAGE_SIZE = int(os.getenv('LIST_PAGE_SIZE', '20'))
+    LIST_PAGE_MAX_CHARS = int(os.getenv('LIST_PAGE_MAX_CHARS', '3500'))
+    LIST_CACHE_SIZE = int(os.getenv('LIST_CACHE_SIZE', '1000'))
+
+    # 겹치는 일정·빈 시간 찾기 (종료 시간이 없는 일정의 길이(분), /free의 근무 시간과 기본 길이(분))
+    DEFAULT_EVENT_MINUTES = int(os.getenv('DEFAULT_EVENT_MINUTES', '60'))
+    WORK_DAY_START = os.getenv('WORK_DAY_START', '09:00')
+    WORK_DAY_END = os.getenv('WORK_DAY_END', '18:00')
+    FREE_SLOT_MINUTES = int(os.getenv('FREE_SLOT_MINUTES', '30'))
+
+    # /find 결과로 보여줄 최대 일정 수
+    FIND_RESULT_LIMIT = int(os.getenv('FIND_RESULT_LIMIT', '30'))
+
+    # 정리한 지난 일정의 압축 보관 위치 (빈 값이면 보관하지 않고 삭제)
+    ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', 'data/archive')
+    # /history 기본 조회 기간(일)과 보여줄 최대 일정 수
+    HISTORY_DEFAULT_DAYS = int(os.getenv('HISTORY_DEFAULT_DAYS', '30'))
+    HISTORY_RESULT_LIMIT = int(os.getenv('HISTORY_RESULT_LIMIT', '50'))
+
+    # 업데이트 수신 방식 ('polling' 또는 'webhook')
+    BOT_MODE = os.getenv('BOT_MODE', 'polling')
+    # 웹훅: 텔레그램이 호출할 공개 주소(https://example.com)와 봇이 받을 주소, 경로, 비밀 토큰
+    WEBHOOK_URL = os.getenv('WEBHOOK_URL')
+    WEBHOOK_LISTEN = os.getenv('WEBHOOK_LISTEN', '0.0.0.0')
+    WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8443'))
+    WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', 'telegram')
+    WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET')
+    # 텔레그램 Bot API 주소 (직접 운영하는 Bot API 서버를 쓸 때 변경)
+    TELEGRAM_BASE_URL = os.getenv('TELEGRAM_BASE_URL', 'https://api.telegram.org/bot')
+    # 작업 프로세스 수 (0이면 한 프로세스에서 모두 처리, N이면 채팅방을 chat_id 해시로 N개 프로세스에 나눔)
+    WORKER_PROCESSES = int(os.getenv('WORKER_PROCESSES', '0'))
+    # 마지막으로 데이터를 나눠 둔 파티션 수 기록 (프로세스 수가 바뀌면 시작할 때 다시 나눔)
+    PARTITION_STATE_PATH = os.getenv('PARTITION_STATE_PATH', 'data/partitions.json')
+    # 동시에 처리할 업데이트 수 (1이면 하나씩 차례로, 같은 채팅방의 업데이트는 항상 받은 순서대로)
+    CONCURRENT_UPDATES = int(os.getenv('CONCURRENT_UPDATES', '1'))
+
+    # 지표 HTTP 엔드포인트 (/metrics, 포트 0이면 끔)
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+    # /stats를 쓸 수 있는 관리자 사용자 ID (쉼표로 구분)
+    ADMIN_USER_IDS = {int(user_id) for user_id in os.getenv('ADMIN_USER_IDS', '').split(',') if user_id.strip()}
+
     WEEKDAY_MAP = {
         'Mon': '월',
         'Tue': '화',
@@ -19,4 +116,7 @@ class Config:
         'Fri': '금',
         'Sat': '토',
         'Sun': '일'
-    }
\ No newline at end of file
+    }
+
+    # datetime.weekday() 순서의 한글 요일
+    WEEKDAY_NAMES = list(WEEKDAY_MAP.values())
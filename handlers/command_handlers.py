@@ -1,17 +1,105 @@
+import asyncio
+import itertools
 import logging
-from telegram import Update
-from telegram.ext import ContextTypes
-from datetime import datetime, timedelta
+import os
+import tempfile
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.error import BadRequest, Forbidden
+from telegram.ext import Application, CallbackQueryHandler, CommandHandler, ContextTypes, MessageHandler, filters
+from datetime import date, datetime, time, timedelta
+from functools import partial
+from typing import List, Optional, Tuple
 from config import Config
 from services.schedule_service import ScheduleService
 from services.message_service import MessageService
+from services.pinned_digest_service import PinnedDigestService
+from services.outbound_dispatcher import OutboundDispatcher
+from services.broadcast_service import BroadcastService
 from services.date_service import DateService
+from services.digest_cache import DigestCache
+from services.ical_service import ICalService
+from services.metrics_service import metrics
 from models.schedule import Schedule
 
 class CommandHandlers:
-    def __init__(self, schedule_service: ScheduleService, message_service: MessageService):
+    def __init__(self, schedule_service: ScheduleService, message_service: MessageService,
+                 pinned_digest_service: PinnedDigestService, outbound_dispatcher: OutboundDispatcher):
         self.schedule_service = schedule_service
         self.message_service = message_service
+        self.pinned_digest_service = pinned_digest_service
+        self.outbound_dispatcher = outbound_dispatcher
+        self.broadcast_service = BroadcastService(schedule_service)
+        # /list의 (일정 목록, 페이지 시작 위치)를 (채팅방, 오늘, 변경 번호) 단위로 재사용
+        self.list_cache = DigestCache(Config.LIST_CACHE_SIZE)
+
+    async def _reply(self, update: Update, text: str, **kwargs) -> None:
+        """발송 계층을 거쳐 답장 (채팅방별 순서 유지)"""
+        chat_id = str(update.effective_chat.id)
+        self._send(chat_id, lambda: update.message.reply_text(text, **kwargs), name='reply_text')
+
+    def _send(self, chat_id: str, call, name: Optional[str] = None, coalesce_key: Optional[str] = None,
+              metered: bool = False) -> None:
+        """발송 계층에 넘기고 기다리지 않음 (한 채팅방의 속도 제한에 걸려도 다른 채팅방의 업데이트 처리는 계속됨)"""
+        future = self.outbound_dispatcher.submit(chat_id, call, coalesce_key=coalesce_key, name=name, metered=metered)
+        future.add_done_callback(self._log_send_failure)
+
+    @staticmethod
+    def _log_send_failure(future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logging.warning(f"메시지 발송 실패: {future.exception()}")
+
+    def _refresh_pinned_digest(self, context: ContextTypes.DEFAULT_TYPE, chat_id: str):
+        """이번 주 일정을 고정 메시지에 반영 (짧은 시간 안의 갱신 요청은 마지막 상태 한 번으로 병합)"""
+        # 갱신 한 번에 수정·발송·고정 해제·고정까지 API를 여러 번 부르므로 호출마다 토큰 사용
+        bot = self.outbound_dispatcher.metered_bot(chat_id, context.bot)
+
+        async def refresh():
+            # 실제 발송 시점의 최신 일정으로 렌더링
+            now = datetime.now(Config.TIMEZONE)
+            message = self._weekly_digest(chat_id, now)
+            try:
+                await self.pinned_digest_service.refresh(bot, chat_id, message)
+            except (BadRequest, Forbidden) as e:
+                # RetryAfter·NetworkError는 발송 계층이 멈춤 시각을 기록하고 다시 시도하도록 그대로 전달
+                logging.warning(f"주간 일정 고정 갱신 실패: {e}")
+
+        self._send(chat_id, refresh, coalesce_key='weekly_digest', metered=True)
+
+    def _weekly_digest(self, chat_id: str, base_date: datetime) -> str:
+        """base_date가 속한 주의 주간 일정 (바뀐 날짜가 없으면 일정을 다시 읽지 않고 이전 렌더링 재사용)"""
+        week_start = DateService.get_week_range(base_date)[0]
+        days = [week_start.date() + timedelta(days=i) for i in range(7)]
+        versions = self.schedule_service.get_versions(chat_id, days)
+        message = self.message_service.get_cached_weekly_digest(chat_id, week_start, versions)
+        if message is None:
+            week = {day: self.schedule_service.get_day_schedules(chat_id, day) for day in days}
+            message = self.message_service.format_weekly_digest(chat_id, week_start, versions, week)
+        return message
+
+    @staticmethod
+    def _split_schedule_args(args) -> Tuple[str, str, str]:
+        """'/add' 인자를 (날짜, 시간 또는 시간 범위, 제목)으로 분리"""
+        date_str = args[0]
+        time_str = args[1]
+
+        # 시간 범위에 '~'가 포함된 경우 처리
+        if '~' in ' '.join(args[1:4]):  # 시간 부분을 더 넓게 검사
+            # "12:00~14:30 제목", "12:00 ~ 14:30 제목" 형식 모두 종료 시간까지 모아서 처리
+            time_parts = []
+            for arg in args[1:]:
+                time_parts.append(arg)
+                joined = ''.join(time_parts)
+                if '~' in joined and not joined.endswith('~'):
+                    break
+
+            time_str = ' '.join(time_parts)
+            title = ' '.join(args[1+len(time_parts):])
+        else:
+            # 기존 단일 시간 형식 처리
+            time_str = args[1]
+            title = ' '.join(args[2:])
+
+        return date_str, time_str, title
 
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         welcome_message = (
@@ -21,16 +109,28 @@ class CommandHandlers:
             "예시 1: /add 2024-02-14 15:00 팀 미팅\n"
             "예시 2: /add 2024-02-14 15:00~15:30 팀 미팅\n"
             "예시 3: /add 2024-02-14 15:00 ~ 15:30 팀 미팅\n\n"
+            "/addmany - 여러 일정 한 번에 추가 (한 줄에 일정 하나)\n"
+            "/repeat [주기] [날짜] [시간] [일정] - 반복 일정 추가\n"
+            "예시: /repeat 매주:월,수 until=2025-06-30 2025-03-03 10:00 스탠드업\n"
+            "/skip [번호] [날짜] - 반복 일정의 하루만 건너뛰기\n"
+            "/export - 일정을 .ics 파일로 내보내기\n"
+            "📎 .ics 파일을 보내면 일정을 가져옵니다\n"
             "/list - 전체 일정 목록 보기\n"
+            "/find [검색어] [from=날짜] [to=날짜] - 일정 제목 검색\n"
             "/delete [번호] - 일정 삭제\n"
             "/edit [번호] [날짜] [시간] [일정] - 일정 수정\n"
             "/week - 이번 주 일정 보기\n"
             "/next - 다음 주 일정 보기\n"
-            "/cleanup - 지난 일정 정리\n"
+            "/conflicts [날짜] - 그 주의 겹치는 일정 보기\n"
+            "/free [날짜] [길이] - 빈 시간 찾기 (예시: /free 2025-02-14 1h)\n"
+            "/cleanup - 지난 일정 정리 (지난 일정은 보관소로 옮김)\n"
+            "/history [시작일] [종료일] - 보관된 지난 일정 보기\n"
             "/clear - 모든 일정 초기화\n\n"
-            "💡 일정을 추가하면 자동으로 주간 일정이 업데이트되고 고정됩니다!"
+            "💡 일정을 추가하면 고정된 주간 일정 메시지가 자동으로 업데이트됩니다!"
         )
-        await update.message.reply_text(welcome_message)
+        if Config.MORNING_DIGEST_TIME:
+            welcome_message += f"\n☀️ 일정이 있는 날에는 매일 {Config.MORNING_DIGEST_TIME}에 그날 일정을 보내드립니다."
+        await self._reply(update, welcome_message)
 
     async def add_schedule(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         chat_id = str(update.effective_chat.id)
@@ -38,7 +138,7 @@ class CommandHandlers:
         try:
             args = context.args
             if len(args) < 3:
-                await update.message.reply_text(
+                await self._reply(update,
                     "올바른 형식으로 입력해주세요.\n"
                     "예시 1: /add 2025-02-14 15:00 팀 미팅\n"
                     "예시 2: /add 2025-02-14 15:00~15:30 팀 미팅\n"
@@ -46,32 +146,7 @@ class CommandHandlers:
                 )
                 return
 
-            date_str = args[0]
-            time_str = args[1]
-            
-            # 시간 범위에 '~'가 포함된 경우 처리
-            if '~' in ' '.join(args[1:4]):  # 시간 부분을 더 넓게 검사
-                # "12:00 ~ 14:30 제목" 형식 처리
-                time_parts = []
-                title_parts = []
-                found_tilde = False
-                
-                for arg in args[1:]:
-                    if '~' in arg or found_tilde:
-                        time_parts.append(arg)
-                        found_tilde = True
-                        if len(time_parts) == 3:  # "시작시간 ~ 종료시간" 완성
-                            title_parts = args[1+len(time_parts):]
-                            break
-                    else:
-                        time_parts.append(arg)
-                
-                time_str = ' '.join(time_parts)
-                title = ' '.join(title_parts)
-            else:
-                # 기존 단일 시간 형식 처리
-                time_str = args[1]
-                title = ' '.join(args[2:])
+            date_str, time_str, title = self._split_schedule_args(args)
 
             # 시간 범위 파싱
             start_dt, end_dt = DateService.parse_datetime_range(date_str, time_str)
@@ -83,66 +158,285 @@ class CommandHandlers:
                 end_time=end_dt
             )
             
-            self.schedule_service.add_schedule(chat_id, schedule)
+            schedule = self.schedule_service.add_schedule(chat_id, schedule)
             
-            now = datetime.now(Config.TIMEZONE)
-            start_date = DateService.get_week_range(now)[0]
-            current_week_schedules = self.schedule_service.get_week_schedules(chat_id, now)
-            message = "✅ 일정이 추가되었습니다!\n\n"
-            message += self.message_service.format_weekly_schedule(current_week_schedules, start_date)
+            message = f"✅ 일정이 추가되었습니다! (번호: {schedule.id})"
+            conflicts = self.schedule_service.find_conflicts(chat_id, schedule)
+            if conflicts:
+                message += "\n\n" + self.message_service.format_conflict_warning(conflicts)
+            await self._reply(update, message)
             
-            sent_message = await update.message.reply_text(message)
-            
-            try:
-                await context.bot.pin_chat_message(
-                    chat_id=update.effective_chat.id,
-                    message_id=sent_message.message_id,
-                    disable_notification=True
-                )
-            except Exception as pin_error:
-                logging.warning(f"메시지 고정 실패: {pin_error}")
+            # 고정된 주간 일정 갱신
+            self._refresh_pinned_digest(context, chat_id)
 
         except ValueError as e:
-            await update.message.reply_text(
+            await self._reply(update,
                 f"에러: {str(e)}\n"
                 "날짜: YYYY-MM-DD\n"
                 "시간: HH:MM 또는 HH:MM ~ HH:MM"
             )
         except Exception as e:
             logging.error(f"일정 추가 중 오류 발생: {e}")
+            metrics.inc('bot_command_errors_total', command='add')
             print(f"상세 에러: {str(e)}")  # 디버깅용
-            await update.message.reply_text("일정 추가 중 오류가 발생했습니다.")
+            await self._reply(update, "일정 추가 중 오류가 발생했습니다.")
+
+    async def add_many_schedules(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """여러 줄의 일정을 한 번에 추가 (한 번 저장, 고정 메시지 한 번 갱신)"""
+        chat_id = str(update.effective_chat.id)
+
+        # 첫 줄의 명령어 뒤에도 일정이 올 수 있음
+        lines = update.message.text.split('\n')
+        lines[0] = lines[0].partition(' ')[2]
+
+        schedules = []
+        errors = []
+        for line_no, line in enumerate(lines, start=1):
+            args = line.split()
+            if not args:
+                continue
+            if len(args) < 3:
+                errors.append(f"{line_no}번째 줄: 날짜, 시간, 일정을 모두 입력해주세요.")
+                continue
+            try:
+                date_str, time_str, title = self._split_schedule_args(args)
+                start_dt, end_dt = DateService.parse_datetime_range(date_str, time_str)
+            except ValueError as e:
+                errors.append(f"{line_no}번째 줄: {e}")
+                continue
+            schedules.append(Schedule(title=title, datetime=start_dt, end_time=end_dt))
+
+        if not schedules and not errors:
+            await self._reply(update,
+                "한 줄에 일정 하나씩 입력해주세요.\n"
+                "예시:\n"
+                "/addmany\n"
+                "2025-02-14 15:00 팀 미팅\n"
+                "2025-02-15 10:00~11:00 주간 회의"
+            )
+            return
+
+        message = ""
+        if schedules:
+            schedules = self.schedule_service.add_schedules(chat_id, schedules)
+            numbers = ', '.join(str(schedule.id) for schedule in schedules)
+            message = f"✅ {len(schedules)}개의 일정이 추가되었습니다! (번호: {numbers})"
+        if errors:
+            if message:
+                message += "\n\n"
+            message += f"❌ {len(errors)}개 줄을 추가하지 못했습니다:\n" + '\n'.join(errors)
+        await self._reply(update, message)
+
+        if schedules:
+            self._refresh_pinned_digest(context, chat_id)
+
+    async def export_schedules(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """일정을 .ics 파일로 내보내기 (문서 전체를 문자열로 만들지 않고 임시 파일에 차례로 기록)"""
+        chat_id = str(update.effective_chat.id)
+        schedules = self.schedule_service.get_schedules(chat_id)
+        if not schedules:
+            await self._reply(update, "내보낼 일정이 없습니다.")
+            return
+
+        with tempfile.TemporaryFile() as f:
+            for chunk in ICalService().iter_export(chat_id, schedules):
+                f.write(chunk.encode('utf-8'))
+
+            async def send_document():
+                f.seek(0)  # 재시도할 때도 처음부터 전송
+                return await update.message.reply_document(document=f, filename=f"schedules-{chat_id}.ics")
+
+            await self.outbound_dispatcher.submit(chat_id, send_document)
+
+    # .ics 가져오기에서 스레드 풀로 한 번에 읽어 올 일정 수
+    IMPORT_BATCH_SIZE = 1000
+
+    async def import_schedules(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """업로드된 .ics 파일의 일정을 가져오기 (디스크에서 줄 단위로 읽어 한 번에 저장)"""
+        chat_id = str(update.effective_chat.id)
+        try:
+            telegram_file = await update.message.document.get_file()
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                path = await telegram_file.download_to_drive(os.path.join(tmp_dir, 'import.ics'))
+                parser = ICalService()
+                added = []
+                loop = asyncio.get_running_loop()
+                with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+                    events = parser.iter_events(f)
+                    # 파일 읽기와 해석은 스레드 풀에서 묶음 단위로, 일정 추가는 이벤트 루프에서
+                    while True:
+                        batch = await loop.run_in_executor(
+                            None, list, itertools.islice(events, self.IMPORT_BATCH_SIZE)
+                        )
+                        if not batch:
+                            break
+                        added += self.schedule_service.add_schedules(chat_id, batch)
+        except Exception as e:
+            logging.error(f"일정 가져오기 중 오류 발생: {e}")
+            metrics.inc('bot_command_errors_total', command='import')
+            await self._reply(update, "일정 가져오기 중 오류가 발생했습니다.")
+            return
+
+        message = f"✅ {len(added)}개의 일정을 가져왔습니다."
+        if parser.skipped_count:
+            message += f"\n❌ 읽을 수 없는 일정 {parser.skipped_count}개는 건너뛰었습니다."
+        await self._reply(update, message)
+
+        if added:
+            self._refresh_pinned_digest(context, chat_id)
 
     async def show_weekly_schedule(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         chat_id = str(update.effective_chat.id)
         now = datetime.now(Config.TIMEZONE)
-        schedules = self.schedule_service.get_week_schedules(chat_id, now)
-        message = self.message_service.format_weekly_schedule(
-            schedules,
-            DateService.get_week_range(now)[0]
-        )
-        await update.message.reply_text(message)
+        message = self._weekly_digest(chat_id, now)
+        await self._reply(update, message)
 
     async def show_next_week_schedule(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         chat_id = str(update.effective_chat.id)
         next_week = datetime.now(Config.TIMEZONE) + timedelta(days=7)
-        schedules = self.schedule_service.get_week_schedules(chat_id, next_week)
-        message = self.message_service.format_weekly_schedule(
-            schedules,
-            DateService.get_week_range(next_week)[0]
-        )
-        await update.message.reply_text(message)
+        message = self._weekly_digest(chat_id, next_week)
+        await self._reply(update, message)
 
     async def clear_schedules(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         chat_id = str(update.effective_chat.id)
         self.schedule_service.clear_schedules(chat_id)
-        await update.message.reply_text("모든 일정이 초기화되었습니다.")
+        await self._reply(update, "모든 일정이 초기화되었습니다.")
+        self._refresh_pinned_digest(context, chat_id)
+
+    @staticmethod
+    def _list_keyboard(page: int, page_count: int) -> Optional[InlineKeyboardMarkup]:
+        """목록 페이지 이동 버튼 (한 페이지면 없음)"""
+        if page_count <= 1:
+            return None
+        buttons = []
+        if page > 0:
+            buttons.append(InlineKeyboardButton("◀️ 이전", callback_data=f"list:{page - 1}"))
+        buttons.append(InlineKeyboardButton(f"{page + 1}/{page_count}", callback_data=f"list:{page}"))
+        if page + 1 < page_count:
+            buttons.append(InlineKeyboardButton("다음 ▶️", callback_data=f"list:{page + 1}"))
+        return InlineKeyboardMarkup([buttons])
+
+    def _list_page(self, chat_id: str, page: int) -> Tuple[str, int, int]:
+        """/list의 page번째 페이지 (일정 목록과 페이지 나눔은 채팅방이 바뀔 때까지 재사용)"""
+        key = (chat_id, datetime.now(Config.TIMEZONE).date(), self.schedule_service.get_revision(chat_id))
+        cached = self.list_cache.get(key)
+        if cached is None:
+            schedules = self.schedule_service.get_list_schedules(chat_id)
+            cached = (schedules, self.message_service.paginate(schedules))
+            self.list_cache.put(key, cached)
+        return self.message_service.format_list_page(*cached, page)
 
     async def list_schedules(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """전체 일정 목록 보기"""
+        """전체 일정 목록 보기 (첫 페이지만 렌더링하고 버튼으로 넘김)"""
+        chat_id = str(update.effective_chat.id)
+        message, page, page_count = self._list_page(chat_id, 0)
+        await self._reply(update, message, reply_markup=self._list_keyboard(page, page_count))
+
+    async def list_page_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """목록의 이전/다음 버튼: 새 메시지를 보내지 않고 기존 목록 메시지를 해당 페이지로 수정"""
+        query = update.callback_query
+        chat_id = str(update.effective_chat.id)
+        try:
+            page = int(query.data.partition(':')[2])
+        except ValueError:
+            page = 0
+        message, page, page_count = self._list_page(chat_id, page)
+        await query.answer()
+
+        async def edit():
+            try:
+                return await query.edit_message_text(message, reply_markup=self._list_keyboard(page, page_count))
+            except BadRequest as e:
+                # 같은 페이지 버튼을 다시 누르면 내용이 같아 수정이 거부됨
+                if 'not modified' not in str(e).lower():
+                    raise
+
+        self._send(chat_id, edit, name='edit_message_text')
+
+    async def find_schedules(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """제목으로 일정 검색 (from=/to= 로 기간 제한)"""
+        chat_id = str(update.effective_chat.id)
+        words = []
+        start = end = None
+        try:
+            for arg in context.args:
+                key, _, value = arg.partition('=')
+                if key == 'from' and value:
+                    start = DateService.parse_datetime(value, '00:00')
+                elif key == 'to' and value:
+                    end = DateService.parse_datetime(value, '00:00') + timedelta(days=1, seconds=-1)
+                else:
+                    words.append(arg)
+        except ValueError:
+            await self._reply(update, "올바른 날짜(YYYY-MM-DD)를 입력해주세요.\n예시: /find 회의 from=2025-02-01 to=2025-02-28")
+            return
+
+        query = ' '.join(words)
+        if not query:
+            await self._reply(update,
+                "검색어를 입력해주세요.\n"
+                "예시 1: /find 팀 미팅\n"
+                "예시 2: /find 회의 from=2025-02-01 to=2025-02-28"
+            )
+            return
+
+        schedules = self.schedule_service.search_schedules(chat_id, query, start, end)
+        await self._reply(update, self.message_service.format_search_results(query, schedules, Config.FIND_RESULT_LIMIT))
+
+    async def add_recurring_schedule(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """반복 일정 추가 (회차는 조회할 때만 펼침)"""
         chat_id = str(update.effective_chat.id)
-        message = self.schedule_service.list_schedules(chat_id)
-        await update.message.reply_text(message)
+
+        try:
+            recurrence, args = DateService.parse_recurrence(context.args)
+            if len(args) < 3:
+                await self._reply(update,
+                    "올바른 형식으로 입력해주세요.\n"
+                    "주기: 매일, 매주, 매주:월,수, 매월 (옵션: every=N, until=YYYY-MM-DD, count=N)\n"
+                    "예시 1: /repeat 매일 2025-02-14 09:00 출근\n"
+                    "예시 2: /repeat 매주:월,수 until=2025-06-30 2025-03-03 10:00~10:15 스탠드업\n"
+                    "예시 3: /repeat 매월 count=6 2025-02-25 14:00 정산"
+                )
+                return
+
+            date_str, time_str, title = self._split_schedule_args(args)
+            start_dt, end_dt = DateService.parse_datetime_range(date_str, time_str)
+            schedule = Schedule(title=title, datetime=start_dt, end_time=end_dt, recurrence=recurrence)
+            schedule = self.schedule_service.add_schedule(chat_id, schedule)
+
+            await self._reply(update, f"✅ 반복 일정이 추가되었습니다! (번호: {schedule.id})")
+            self._refresh_pinned_digest(context, chat_id)
+
+        except ValueError as e:
+            await self._reply(update, f"에러: {str(e)}")
+        except Exception as e:
+            logging.error(f"반복 일정 추가 중 오류 발생: {e}")
+            metrics.inc('bot_command_errors_total', command='repeat')
+            await self._reply(update, "반복 일정 추가 중 오류가 발생했습니다.")
+
+    async def skip_occurrence(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """반복 일정의 특정 날짜 회차 건너뛰기"""
+        chat_id = str(update.effective_chat.id)
+
+        try:
+            if len(context.args) < 2:
+                await self._reply(update,
+                    "건너뛸 반복 일정 번호와 날짜를 입력해주세요.\n"
+                    "예시: /skip 3 2025-03-05"
+                )
+                return
+
+            schedule_id = int(context.args[0])
+            day = date.fromisoformat(context.args[1])
+        except ValueError:
+            await self._reply(update, "올바른 번호와 날짜(YYYY-MM-DD)를 입력해주세요.")
+            return
+
+        if self.schedule_service.skip_occurrence(chat_id, schedule_id, day):
+            await self._reply(update, f"✅ {day.isoformat()} 회차를 건너뜁니다.")
+            self._refresh_pinned_digest(context, chat_id)
+        else:
+            await self._reply(update, "❌ 해당 번호의 반복 일정을 찾을 수 없습니다.")
 
     async def delete_schedule(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """일정 삭제"""
@@ -150,52 +444,39 @@ class CommandHandlers:
         
         try:
             if not context.args:
-                await update.message.reply_text(
+                await self._reply(update,
                     "삭제할 일정 번호를 입력해주세요.\n"
                     "예시: /delete 1\n"
                     "일정 목록 보기: /list"
                 )
                 return
 
-            display_index = int(context.args[0])
-            schedule = self.schedule_service.get_schedule_by_index(chat_id, display_index)
+            schedule_id = int(context.args[0])
+            schedule = self.schedule_service.delete_schedule(chat_id, schedule_id)
             
-            if schedule and self.schedule_service.delete_schedule(chat_id, display_index):
-                dt = schedule.datetime.astimezone(Config.TIMEZONE)
+            if schedule:
+                dt = schedule.datetime
                 time_str = dt.strftime('%Y-%m-%d %H:%M')
                 if schedule.end_time:
-                    end_time = schedule.end_time.astimezone(Config.TIMEZONE)
+                    end_time = schedule.end_time
                     time_str += f" ~ {end_time.strftime('%H:%M')}"
                 
-                await update.message.reply_text(
+                await self._reply(update,
                     f"✅ 다음 일정이 삭제되었습니다:\n"
                     f"{time_str} {schedule.title}"
                 )
                 
-                # 주간 일정 업데이트 및 고정
-                now = datetime.now(Config.TIMEZONE)
-                start_date = DateService.get_week_range(now)[0]
-                current_week_schedules = self.schedule_service.get_week_schedules(chat_id, now)
-                
-                message = self.message_service.format_weekly_schedule(current_week_schedules, start_date)
-                sent_message = await update.message.reply_text(message)
-                
-                try:
-                    await context.bot.pin_chat_message(
-                        chat_id=update.effective_chat.id,
-                        message_id=sent_message.message_id,
-                        disable_notification=True
-                    )
-                except Exception as pin_error:
-                    logging.warning(f"메시지 고정 실패: {pin_error}")
+                # 고정된 주간 일정 갱신
+                self._refresh_pinned_digest(context, chat_id)
             else:
-                await update.message.reply_text("❌ 해당 번호의 일정을 찾을 수 없습니다.")
+                await self._reply(update, "❌ 해당 번호의 일정을 찾을 수 없습니다.")
 
         except ValueError:
-            await update.message.reply_text("올바른 숫자를 입력해주세요.")
+            await self._reply(update, "올바른 숫자를 입력해주세요.")
         except Exception as e:
             logging.error(f"일정 삭제 중 오류 발생: {e}")
-            await update.message.reply_text("일정 삭제 중 오류가 발생했습니다.")
+            metrics.inc('bot_command_errors_total', command='delete')
+            await self._reply(update, "일정 삭제 중 오류가 발생했습니다.")
 
     async def edit_schedule(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """일정 수정"""
@@ -203,7 +484,7 @@ class CommandHandlers:
         
         try:
             if len(context.args) < 4:
-                await update.message.reply_text(
+                await self._reply(update,
                     "올바른 형식으로 입력해주세요.\n"
                     "예시 1: /edit 1 2025-02-14 15:00 팀 미팅\n"
                     "예시 2: /edit 1 2025-02-14 15:00~15:30 팀 미팅\n"
@@ -211,7 +492,7 @@ class CommandHandlers:
                 )
                 return
 
-            display_index = int(context.args[0])
+            schedule_id = int(context.args[0])
             date_str = context.args[1]
             time_str = context.args[2]
             title = ' '.join(context.args[3:])
@@ -219,37 +500,29 @@ class CommandHandlers:
             # 시간 범위 파싱
             start_dt, end_dt = DateService.parse_datetime_range(date_str, time_str)
             
-            # 새 일정 생성
-            new_schedule = Schedule(
-                title=title,
-                datetime=start_dt,
-                end_time=end_dt
-            )
-            
-            if self.schedule_service.edit_schedule(chat_id, display_index, new_schedule):
-                await update.message.reply_text("✅ 일정이 수정되었습니다!")
-                
-                # 주간 일정 업데이트 및 고정
-                now = datetime.now(Config.TIMEZONE)
-                start_date = DateService.get_week_range(now)[0]
-                current_week_schedules = self.schedule_service.get_week_schedules(chat_id, now)
-                
-                message = self.message_service.format_weekly_schedule(current_week_schedules, start_date)
-                sent_message = await update.message.reply_text(message)
+            # 기존 일정의 제목과 시간만 바꿈 (반복 일정은 반복 규칙과 건너뛴 날짜를 그대로 유지)
+            schedule = self.schedule_service.get_schedule(chat_id, schedule_id)
+            if schedule is None:
+                await self._reply(update, "❌ 해당 번호의 일정을 찾을 수 없습니다.")
+                return
+            new_schedule = schedule.copy(title=title, datetime=start_dt, end_time=end_dt)
+
+            if self.schedule_service.edit_schedule(chat_id, schedule_id, new_schedule):
+                message = "✅ 일정이 수정되었습니다!"
+                if new_schedule.recurrence is not None:
+                    message += "\n🔁 반복 규칙은 그대로 두고 첫 회차의 날짜와 시간을 바꿨습니다."
+                conflicts = self.schedule_service.find_conflicts(chat_id, new_schedule)
+                if conflicts:
+                    message += "\n\n" + self.message_service.format_conflict_warning(conflicts)
+                await self._reply(update, message)
                 
-                try:
-                    await context.bot.pin_chat_message(
-                        chat_id=update.effective_chat.id,
-                        message_id=sent_message.message_id,
-                        disable_notification=True
-                    )
-                except Exception as pin_error:
-                    logging.warning(f"메시지 고정 실패: {pin_error}")
+                # 고정된 주간 일정 갱신
+                self._refresh_pinned_digest(context, chat_id)
             else:
-                await update.message.reply_text("❌ 해당 번호의 일정을 찾을 수 없습니다.")
+                await self._reply(update, "❌ 해당 번호의 일정을 찾을 수 없습니다.")
 
         except ValueError as e:
-            await update.message.reply_text(
+            await self._reply(update,
                 f"에러: {str(e)}\n"
                 "올바른 형식으로 입력해주세요.\n"
                 "날짜: YYYY-MM-DD\n"
@@ -257,25 +530,158 @@ class CommandHandlers:
             )
         except Exception as e:
             logging.error(f"일정 수정 중 오류 발생: {e}")
-            await update.message.reply_text("일정 수정 중 오류가 발생했습니다.")
+            metrics.inc('bot_command_errors_total', command='edit')
+            await self._reply(update, "일정 수정 중 오류가 발생했습니다.")
+
+    async def show_conflicts(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """주간 겹치는 일정 보기 (날짜를 주면 그 날짜가 속한 주)"""
+        chat_id = str(update.effective_chat.id)
+        try:
+            base_date = datetime.now(Config.TIMEZONE)
+            if context.args:
+                base_date = DateService.parse_datetime(context.args[0], '00:00')
+        except ValueError:
+            await self._reply(update, "올바른 날짜(YYYY-MM-DD)를 입력해주세요.\n예시: /conflicts 2025-02-14")
+            return
+
+        week_start = DateService.get_week_range(base_date)[0]
+        conflicts = self.schedule_service.get_conflicts(chat_id, week_start, week_start + timedelta(days=7))
+        await self._reply(update, self.message_service.format_conflicts(conflicts, week_start))
+
+    async def find_free_slots(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """근무 시간 중 빈 시간 찾기 (/free [날짜] [길이], 기본은 오늘과 FREE_SLOT_MINUTES분)"""
+        chat_id = str(update.effective_chat.id)
+        args = list(context.args)
+        try:
+            day = datetime.now(Config.TIMEZONE).date()
+            if args and '-' in args[0]:
+                day = DateService.parse_datetime(args.pop(0), '00:00').date()
+            duration = timedelta(minutes=Config.FREE_SLOT_MINUTES)
+            if args:
+                duration = DateService.parse_duration(' '.join(args))
+        except ValueError as e:
+            await self._reply(update,
+                f"에러: {str(e)}\n"
+                "예시 1: /free\n"
+                "예시 2: /free 2025-02-14 1h\n"
+                "예시 3: /free 2025-02-14 90"
+            )
+            return
+
+        slots = self.schedule_service.find_free_slots(chat_id, day, duration)
+        await self._reply(update, self.message_service.format_free_slots(day, slots, duration))
+
+    async def show_history(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """보관된 지난 일정 보기 (기본은 최근 HISTORY_DEFAULT_DAYS일)"""
+        chat_id = str(update.effective_chat.id)
+        now = datetime.now(Config.TIMEZONE)
+        try:
+            if context.args:
+                start = DateService.parse_datetime(context.args[0], '00:00')
+            else:
+                start = DateService.localize(datetime.combine(
+                    (now - timedelta(days=Config.HISTORY_DEFAULT_DAYS)).date(), time.min))
+            if len(context.args) > 1:
+                end = DateService.parse_datetime(context.args[1], '00:00') + timedelta(days=1, seconds=-1)
+            else:
+                end = now
+        except ValueError:
+            await self._reply(update,
+                "올바른 날짜(YYYY-MM-DD)를 입력해주세요.\n"
+                "예시 1: /history\n"
+                "예시 2: /history 2025-01-01 2025-03-31"
+            )
+            return
+
+        schedules = self.schedule_service.get_history(chat_id, start, end)
+        await self._reply(update, self.message_service.format_history(schedules, start, end,
+                                                                       Config.HISTORY_RESULT_LIMIT))
 
     async def cleanup_schedules(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """수동으로 지난 일정 정리"""
-        chat_id = str(update.effective_chat.id)
-        
-        # 정리 전 일정 수 확인
-        total_before = sum(len(schedules) for schedules in self.schedule_service.schedules.values())
-        
-        # 지난 일정 정리
-        self.schedule_service.cleanup_old_schedules()
-        
-        # 정리 후 일정 수 확인
-        total_after = sum(len(schedules) for schedules in self.schedule_service.schedules.values())
-        
-        # 정리된 일정 수 계산
-        cleaned_count = total_before - total_after
+        # 지난 일정 정리 (자정 정리 작업과 같은 만료 처리 사용)
+        cleaned_count = self.schedule_service.cleanup_old_schedules()
         
         if cleaned_count > 0:
-            await update.message.reply_text(f"✨ {cleaned_count}개의 지난 일정이 정리되었습니다.")
+            message = f"✨ {cleaned_count}개의 지난 일정이 정리되었습니다."
+            if self.schedule_service.archive_service.enabled:
+                message += "\n🗄 정리한 일정은 /history 로 볼 수 있습니다."
+            await self._reply(update, message)
         else:
-            await update.message.reply_text("정리할 지난 일정이 없습니다.")
\ No newline at end of file
+            await self._reply(update, "정리할 지난 일정이 없습니다.")
+
+    async def show_stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """봇 상태 요약 (관리자 전용)"""
+        if update.effective_user is None or update.effective_user.id not in Config.ADMIN_USER_IDS:
+            await self._reply(update, "❌ 관리자만 사용할 수 있는 명령어입니다.")
+            return
+        await self._reply(update, metrics.format_stats())
+
+    async def send_reminder(self, bot, chat_id: str, schedule: Schedule):
+        """알림 발송 (ReminderService가 호출, 발송 계층의 속도 제한을 따름)"""
+        message = self.message_service.format_reminder(schedule)
+        await self.outbound_dispatcher.call(chat_id, bot.send_message, chat_id=chat_id, text=message)
+
+    async def send_morning_digest(self, bot, chat_id: str, day: date, schedules: List[Schedule]):
+        """아침 브리핑 발송 (BroadcastService가 호출, 발송 계층의 속도 제한과 재시도를 따름)"""
+        message = self.message_service.format_morning_digest(day, schedules)
+        await self.outbound_dispatcher.call(chat_id, bot.send_message, chat_id=chat_id, text=message)
+
+    async def morning_digest_job(self, context: ContextTypes.DEFAULT_TYPE):
+        """매일 MORNING_DIGEST_TIME(현지 시간)에 오늘 일정 브리핑 (보내다 멈춘 날은 재시작 후 이어서)"""
+        today = datetime.now(Config.TIMEZONE).date()
+        await self.broadcast_service.broadcast(today, partial(self.send_morning_digest, context.bot))
+
+    async def cleanup_job(self, context: ContextTypes.DEFAULT_TYPE):
+        """매일 자정(현지 시간)에 지난 일정 정리"""
+        cleaned_count = self.schedule_service.cleanup_old_schedules()
+        logging.info(f"자정 정리 작업 완료: {cleaned_count}개 일정 정리")
+
+def register_handlers(application: Application, command_handlers: CommandHandlers) -> None:
+    """명령어 핸들러와 정기 작업 등록 (명령어별 처리 시간을 지표로 기록)"""
+    commands = {
+        'start': command_handlers.start,
+        'add': command_handlers.add_schedule,
+        'addmany': command_handlers.add_many_schedules,
+        'repeat': command_handlers.add_recurring_schedule,
+        'skip': command_handlers.skip_occurrence,
+        'week': command_handlers.show_weekly_schedule,
+        'next': command_handlers.show_next_week_schedule,
+        'conflicts': command_handlers.show_conflicts,
+        'free': command_handlers.find_free_slots,
+        'clear': command_handlers.clear_schedules,
+        'list': command_handlers.list_schedules,
+        'find': command_handlers.find_schedules,
+        'delete': command_handlers.delete_schedule,
+        'edit': command_handlers.edit_schedule,
+        'cleanup': command_handlers.cleanup_schedules,
+        'history': command_handlers.show_history,
+        'export': command_handlers.export_schedules,
+        'stats': command_handlers.show_stats,
+    }
+    for command, handler in commands.items():
+        application.add_handler(CommandHandler(command, metrics.track_command(command, handler)))
+    application.add_handler(MessageHandler(
+        filters.Document.FileExtension('ics'), metrics.track_command('import', command_handlers.import_schedules)
+    ))
+    application.add_handler(CallbackQueryHandler(
+        metrics.track_command('list_page', command_handlers.list_page_callback), pattern=r'^list:'
+    ))
+
+    # 매일 자정에 지난 일정 정리 (요청 처리 경로에서는 정리하지 않음)
+    application.job_queue.run_daily(
+        command_handlers.cleanup_job,
+        time=time(hour=0, minute=0, tzinfo=Config.TIMEZONE),
+        name='daily_cleanup'
+    )
+
+    if Config.MORNING_DIGEST_TIME:
+        digest_time = datetime.strptime(Config.MORNING_DIGEST_TIME, Config.TIME_FORMAT)
+        application.job_queue.run_daily(
+            command_handlers.morning_digest_job,
+            time=time(hour=digest_time.hour, minute=digest_time.minute, tzinfo=Config.TIMEZONE),
+            name='morning_digest'
+        )
+        # 오늘 브리핑을 보내던 도중 재시작했으면 시작하자마자 남은 채팅방부터 이어서 보냄
+        if command_handlers.broadcast_service.has_unfinished(datetime.now(Config.TIMEZONE).date()):
+            application.job_queue.run_once(command_handlers.morning_digest_job, when=0, name='morning_digest_resume')
@@ -1,39 +1,117 @@
 import logging
-from telegram.ext import Application, CommandHandler
+from functools import partial
+from telegram import Update
+from telegram.ext import Application, TypeHandler
 from config import Config
-from services.storage_service import StorageService
+from services.storage_factory import create_storage_service
 from services.schedule_service import ScheduleService
 from services.message_service import MessageService
-from handlers.command_handlers import CommandHandlers
+from services.pinned_digest_service import PinnedDigestService
+from services.outbound_dispatcher import OutboundDispatcher
+from services.update_processor import ChatOrderedUpdateProcessor
+from services.partition_service import PartitionService
+from services.worker_pool import WorkerPool
+from services.metrics_service import MetricsServer, metrics
+from handlers.command_handlers import CommandHandlers, register_handlers
 
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     level=logging.INFO
 )
 
-def main():
+def build_application() -> Application:
+    """한 프로세스에서 명령어 처리까지 모두 하는 봇"""
     # 서비스 초기화
-    storage_service = StorageService()
+    storage_service = create_storage_service(write_behind=Config.WRITE_BEHIND)
     schedule_service = ScheduleService(storage_service)
     message_service = MessageService()
-    command_handlers = CommandHandlers(schedule_service, message_service)
+    pinned_digest_service = PinnedDigestService()
+    outbound_dispatcher = OutboundDispatcher()
+    command_handlers = CommandHandlers(
+        schedule_service, message_service, pinned_digest_service, outbound_dispatcher
+    )
+    metrics_server = MetricsServer(metrics, Config.METRICS_HOST, Config.METRICS_PORT) if Config.METRICS_PORT else None
+
+    async def post_init(application: Application) -> None:
+        await storage_service.start()
+        if metrics_server:
+            await metrics_server.start()
+        # 다가오는 일정 알림 발송 시작
+        await schedule_service.reminder_service.start(
+            partial(command_handlers.send_reminder, application.bot),
+            schedule_service.get_schedule
+        )
+
+    async def post_shutdown(application: Application) -> None:
+        # 대기 중인 발송을 마치고 남은 변경을 마지막으로 저장
+        await schedule_service.reminder_service.stop()
+        await outbound_dispatcher.stop()
+        await storage_service.stop()
+        if metrics_server:
+            await metrics_server.stop()
 
     # 봇 애플리케이션 생성
-    application = Application.builder().token(Config.TELEGRAM_BOT_TOKEN).build()
-
-    # 핸들러 등록
-    application.add_handler(CommandHandler('start', command_handlers.start))
-    application.add_handler(CommandHandler('add', command_handlers.add_schedule))
-    application.add_handler(CommandHandler('week', command_handlers.show_weekly_schedule))
-    application.add_handler(CommandHandler('next', command_handlers.show_next_week_schedule))
-    application.add_handler(CommandHandler('clear', command_handlers.clear_schedules))
-    application.add_handler(CommandHandler('list', command_handlers.list_schedules))
-    application.add_handler(CommandHandler('delete', command_handlers.delete_schedule))
-    application.add_handler(CommandHandler('edit', command_handlers.edit_schedule))
-    application.add_handler(CommandHandler('cleanup', command_handlers.cleanup_schedules))
+    builder = (
+        Application.builder()
+        .token(Config.TELEGRAM_BOT_TOKEN)
+        .base_url(Config.TELEGRAM_BASE_URL)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+    )
+    if Config.CONCURRENT_UPDATES > 1:
+        # 채팅방이 다른 업데이트는 동시에 처리하되 같은 채팅방은 받은 순서대로
+        builder.concurrent_updates(ChatOrderedUpdateProcessor(Config.CONCURRENT_UPDATES))
+    application = builder.build()
+    register_handlers(application, command_handlers)
+    return application
+
+def build_front_application() -> Application:
+    """업데이트를 받아 작업 프로세스로 나눠 보내고, 작업 프로세스의 발송을 한곳에서 대신 보내는 앞단 봇"""
+    outbound_dispatcher = OutboundDispatcher()
+    worker_pool = WorkerPool(Config.WORKER_PROCESSES, outbound_dispatcher)
+    metrics_server = MetricsServer(metrics, Config.METRICS_HOST, Config.METRICS_PORT) if Config.METRICS_PORT else None
+
+    async def post_init(application: Application) -> None:
+        await worker_pool.start(application.bot)
+        if metrics_server:
+            await metrics_server.start()
+
+    async def post_shutdown(application: Application) -> None:
+        # 작업 프로세스가 남은 발송과 저장을 마칠 때까지 발송 계층을 유지
+        await worker_pool.stop()
+        await outbound_dispatcher.stop()
+        if metrics_server:
+            await metrics_server.stop()
+
+    application = (
+        Application.builder()
+        .token(Config.TELEGRAM_BOT_TOKEN)
+        .base_url(Config.TELEGRAM_BASE_URL)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
+    application.add_handler(TypeHandler(Update, worker_pool.route))
+    return application
+
+def main():
+    # 작업 프로세스 수가 바뀌었으면 저장된 데이터부터 새 파티션으로 나눔
+    PartitionService(Config.WORKER_PROCESSES or 1).rebalance()
+    application = build_front_application() if Config.WORKER_PROCESSES else build_application()
 
     # 봇 실행
-    application.run_polling()
+    if Config.BOT_MODE == 'webhook':
+        if not Config.WEBHOOK_URL:
+            raise ValueError("웹훅 모드에는 WEBHOOK_URL이 필요합니다.")
+        application.run_webhook(
+            listen=Config.WEBHOOK_LISTEN,
+            port=Config.WEBHOOK_PORT,
+            url_path=Config.WEBHOOK_PATH,
+            webhook_url=f"{Config.WEBHOOK_URL.rstrip('/')}/{Config.WEBHOOK_PATH}",
+            secret_token=Config.WEBHOOK_SECRET
+        )
+    else:
+        application.run_polling()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
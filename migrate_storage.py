@@ -0,0 +1,31 @@
+import argparse
+import logging
+from services.storage_factory import create_storage_service
+
+logging.basicConfig(
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    level=logging.INFO
+)
+
+def main():
+    parser = argparse.ArgumentParser(description="저장소 간 일정 데이터 이전")
+    parser.add_argument('--source', default='json', help="원본 저장소 종류 (기본값: json)")
+    parser.add_argument('--source-path', help="원본 경로 (기본값: 설정값)")
+    parser.add_argument('--target', default='sqlite', help="대상 저장소 종류 (기본값: sqlite)")
+    parser.add_argument('--target-path', help="대상 경로 (기본값: 설정값)")
+    args = parser.parse_args()
+
+    source = create_storage_service(args.source, args.source_path)
+    target = create_storage_service(args.target, args.target_path)
+
+    schedules = source.load_schedules()
+    target.save_schedules(schedules)
+
+    total = sum(len(chat_schedules) for chat_schedules in schedules.values())
+    logging.info(f"{len(schedules)}개 채팅방, {total}개 일정을 이전했습니다.")
+
+    source.close()
+    target.close()
+
+if __name__ == '__main__':
+    main()
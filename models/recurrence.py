@@ -0,0 +1,233 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import MAXYEAR, date, datetime, timedelta
+from functools import lru_cache
+from math import gcd
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from config import Config
+
+# 달마다 날짜 유무(29~31일)는 400년(4800개월)마다 되풀이됨
+MONTH_CYCLE = 4800
+# 반복은 이 날짜까지만 계산 (pytz는 date.max를 현지 시각으로 바꾸지 못함)
+LAST_DATE = date(MAXYEAR, 12, 30)
+
+def _days_in_month(month: int) -> int:
+    """0년 1월부터 센 month번째 달의 날짜 수"""
+    year, month = divmod(month, 12)
+    if month == 1:
+        return 29 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 28
+    return 30 if month in (3, 5, 8, 10) else 31
+
+@lru_cache(maxsize=256)
+def _monthly_pattern(first_month: int, day: int, interval: int) -> Tuple[int, Tuple[int, ...]]:
+    """월 반복이 몇 주기마다 되풀이되는지와 그 안에서 해당 날짜가 있는 주기 번호들"""
+    if day <= 28:
+        return 1, (0,)
+    cycle = MONTH_CYCLE // gcd(MONTH_CYCLE, interval)
+    return cycle, tuple(period for period in range(cycle)
+                        if day <= _days_in_month(first_month + interval * period))
+
+@dataclass
+class Recurrence:
+    freq: str  # 'daily' | 'weekly' | 'monthly'
+    interval: int = 1  # 몇 일/주/월마다 반복
+    weekdays: List[int] = field(default_factory=list)  # 매주 반복할 요일 (0=월요일, 비어 있으면 시작 요일)
+    until: Optional[date] = None  # 이 날짜까지 반복 (포함)
+    count: Optional[int] = None  # 총 반복 횟수 (제외한 날짜도 횟수에 포함)
+    exceptions: List[date] = field(default_factory=list)  # 건너뛸 날짜
+
+    FREQUENCIES = ('daily', 'weekly', 'monthly')
+
+    def __post_init__(self):
+        # 간격이 0 이하이면 회차 계산이 끝나지 않거나 0으로 나누게 되므로 만들 때 거름
+        if self.freq not in self.FREQUENCIES:
+            raise ValueError(f"알 수 없는 반복 주기입니다: {self.freq}")
+        if isinstance(self.interval, bool) or not isinstance(self.interval, int) or self.interval < 1:
+            raise ValueError(f"반복 간격은 1 이상이어야 합니다: {self.interval}")
+        if self.count is not None and (isinstance(self.count, bool) or not isinstance(self.count, int)
+                                       or self.count < 1):
+            raise ValueError(f"반복 횟수는 1 이상이어야 합니다: {self.count}")
+        if any(not 0 <= weekday <= 6 for weekday in self.weekdays):
+            raise ValueError(f"요일은 0(월)~6(일)이어야 합니다: {self.weekdays}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'freq': self.freq,
+            'interval': self.interval,
+            'weekdays': self.weekdays,
+            'until': self.until.isoformat() if self.until else None,
+            'count': self.count,
+            'exceptions': [day.isoformat() for day in self.exceptions]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Recurrence':
+        return cls(
+            freq=data['freq'],
+            interval=data.get('interval', 1),
+            weekdays=list(data.get('weekdays') or []),
+            until=date.fromisoformat(data['until']) if data.get('until') else None,
+            count=data.get('count'),
+            exceptions=[date.fromisoformat(day) for day in data.get('exceptions') or []]
+        )
+
+    @property
+    def is_finite(self) -> bool:
+        return self.until is not None or self.count is not None
+
+    def _iter_dates(self, first: date, skip: int) -> Iterator[date]:
+        """skip 주기만큼 건너뛴 뒤부터 반복 후보 날짜를 순서대로 생성 (횟수·종료일 미적용, 9999년에서 끝남)"""
+        interval = self.interval
+        period = skip
+        try:
+            if self.freq == 'daily':
+                day = first + timedelta(days=interval * period)
+                while True:
+                    yield day
+                    day += timedelta(days=interval)
+            elif self.freq == 'weekly':
+                weekdays = sorted(self.weekdays) or [first.weekday()]
+                first_monday = first - timedelta(days=first.weekday())
+                while True:
+                    week_start = first_monday + timedelta(weeks=interval * period)
+                    for weekday in weekdays:
+                        day = week_start + timedelta(days=weekday)
+                        if day >= first:
+                            yield day
+                    period += 1
+            else:
+                first_month = first.year * 12 + first.month - 1
+                while True:
+                    month = first_month + interval * period
+                    if month // 12 > MAXYEAR:
+                        return
+                    if first.day <= _days_in_month(month):  # 해당 날짜가 없는 달(예: 31일)은 건너뜀
+                        yield date(month // 12, month % 12 + 1, first.day)
+                    period += 1
+        except OverflowError:
+            return
+
+    def _weekly_days(self, first: date) -> Tuple[List[int], List[int]]:
+        """매주 반복할 요일과 그중 첫 주에 시작일 이후인 요일"""
+        weekdays = sorted(self.weekdays) or [first.weekday()]
+        return weekdays, [weekday for weekday in weekdays if weekday >= first.weekday()]
+
+    def _candidate(self, first: date, index: int) -> date:
+        """index번째(0부터) 반복 후보 날짜"""
+        interval = self.interval
+        if self.freq == 'daily':
+            return first + timedelta(days=interval * index)
+        if self.freq == 'weekly':
+            weekdays, first_week = self._weekly_days(first)
+            first_monday = first - timedelta(days=first.weekday())
+            if index < len(first_week):
+                return first_monday + timedelta(days=first_week[index])
+            period, position = divmod(index - len(first_week), len(weekdays))
+            return first_monday + timedelta(weeks=interval * (period + 1), days=weekdays[position])
+        first_month = first.year * 12 + first.month - 1
+        cycle, valid = _monthly_pattern(first_month % MONTH_CYCLE, first.day, interval)
+        cycles, position = divmod(index, len(valid))
+        month = first_month + interval * (cycles * cycle + valid[position])
+        return date(month // 12, month % 12 + 1, first.day)
+
+    def _count_through(self, first: date, last_day: date) -> int:
+        """last_day까지(포함) 반복 후보 날짜 수"""
+        if last_day < first:
+            return 0
+        interval = self.interval
+        if self.freq == 'daily':
+            return (last_day - first).days // interval + 1
+        if self.freq == 'weekly':
+            weekdays, first_week = self._weekly_days(first)
+            weeks = ((last_day - timedelta(days=last_day.weekday()))
+                     - (first - timedelta(days=first.weekday()))).days // 7
+            period, offset = divmod(weeks, interval)
+            limit = last_day.weekday() if offset == 0 else 6  # 마지막 주기가 last_day가 있는 주면 그 요일까지만
+            if period == 0:
+                return sum(1 for weekday in first_week if weekday <= limit)
+            return len(first_week) + (period - 1) * len(weekdays) + sum(1 for weekday in weekdays if weekday <= limit)
+        first_month = first.year * 12 + first.month - 1
+        period, offset = divmod(last_day.year * 12 + last_day.month - 1 - first_month, interval)
+        if offset == 0 and first.day > last_day.day:
+            period -= 1  # last_day가 있는 달의 후보는 last_day보다 늦음
+        if period < 0:
+            return 0
+        cycle, valid = _monthly_pattern(first_month % MONTH_CYCLE, first.day, interval)
+        cycles, position = divmod(period, cycle)
+        return cycles * len(valid) + bisect_right(valid, position)
+
+    def _count_before_period(self, first: date, period: int) -> int:
+        """period번째 주기 이전의 반복 후보 날짜 수"""
+        if period <= 0:
+            return 0
+        if self.freq == 'daily':
+            return period
+        if self.freq == 'weekly':
+            weekdays, first_week = self._weekly_days(first)
+            return len(first_week) + (period - 1) * len(weekdays)
+        first_month = first.year * 12 + first.month - 1
+        cycle, valid = _monthly_pattern(first_month % MONTH_CYCLE, first.day, self.interval)
+        cycles, position = divmod(period, cycle)
+        return cycles * len(valid) + bisect_left(valid, position)
+
+    def _skip_periods(self, first: date, window_start: date) -> int:
+        """window_start 이전의 주기를 몇 개 건너뛸 수 있는지"""
+        if window_start <= first:
+            return 0
+        if self.freq == 'daily':
+            return (window_start - first).days // self.interval
+        if self.freq == 'weekly':
+            weeks = ((window_start - timedelta(days=window_start.weekday()))
+                     - (first - timedelta(days=first.weekday()))).days // 7
+            return weeks // self.interval
+        months = (window_start.year * 12 + window_start.month) - (first.year * 12 + first.month)
+        return months // self.interval
+
+    def iter_starts(self, first: datetime, window_start: Optional[datetime] = None) -> Iterator[datetime]:
+        """반복 회차의 시작 시각을 순서대로 생성 (window_start가 있으면 그 이전 주기는 계산하지 않음)"""
+        local_first = first.astimezone(Config.TIMEZONE)
+        first_date = local_first.date()
+        clock_time = local_first.time().replace(tzinfo=None)
+        skip = 0
+        if window_start is not None:
+            skip = self._skip_periods(first_date, window_start.astimezone(Config.TIMEZONE).date())
+        exceptions = set(self.exceptions)
+
+        until = min(self.until, LAST_DATE) if self.until is not None else LAST_DATE
+
+        emitted = self._count_before_period(first_date, skip)  # 건너뛴 주기의 회차도 횟수에 포함
+        for day in self._iter_dates(first_date, skip):
+            if day > until:
+                return
+            if self.count is not None and emitted >= self.count:
+                return
+            emitted += 1
+            if day in exceptions:
+                continue
+            yield Config.TIMEZONE.localize(datetime.combine(day, clock_time))
+
+    def iter_between(self, first: datetime, start: datetime, end: datetime) -> Iterator[datetime]:
+        """시작 시각이 [start, end] 안에 있는 회차만 생성"""
+        for occurrence in self.iter_starts(first, start):
+            if occurrence > end:
+                return
+            if occurrence >= start:
+                yield occurrence
+
+    def last_start(self, first: datetime) -> Optional[datetime]:
+        """마지막 회차의 시작 시각 (끝없이 반복하면 None, 모든 회차가 제외됐으면 None)"""
+        if not self.is_finite:
+            return None
+        local_first = first.astimezone(Config.TIMEZONE)
+        first_date = local_first.date()
+        until = min(self.until, LAST_DATE) if self.until is not None else LAST_DATE
+        # 회차를 하나씩 세지 않고 종료일·횟수에서 마지막 후보 번호를 바로 구함
+        total = self._count_through(first_date, until)
+        if self.count is not None:
+            total = min(total, self.count)
+        exceptions = set(self.exceptions)
+        for index in range(total - 1, -1, -1):
+            day = self._candidate(first_date, index)
+            if day not in exceptions:
+                return Config.TIMEZONE.localize(datetime.combine(day, local_first.time().replace(tzinfo=None)))
+        return None
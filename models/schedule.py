@@ -1,24 +1,128 @@
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Dict, Optional, Any
+import datetime as dt
+from typing import Dict, Iterator, Optional, Any, Union
+from config import Config
+from models.recurrence import Recurrence
 
-@dataclass
 class Schedule:
-    title: str
-    datetime: 'datetime'  # 문자열로 타입 힌팅
-    end_time: Optional['datetime'] = None  # 문자열로 타입 힌팅
+    """일정 1건 (시작/종료 시각은 epoch 초 정수로 보관하고 datetime은 필요할 때만 만듦)"""
+
+    __slots__ = ('title', 'start_ts', 'end_ts', 'id', 'recurrence')
+
+    def __init__(self, title: str, datetime: 'dt.datetime', end_time: Optional['dt.datetime'] = None,
+                 id: Optional[int] = None, recurrence: Optional[Recurrence] = None):
+        self.title = title
+        self.start_ts = int(datetime.timestamp())
+        self.end_ts = int(end_time.timestamp()) if end_time else None
+        self.id = id  # 채팅방 안에서 고유한 일정 번호
+        self.recurrence = recurrence  # 반복 규칙 (datetime은 첫 회차)
+
+    @classmethod
+    def from_epoch(cls, title: str, start_ts: int, end_ts: Optional[int] = None, id: Optional[int] = None,
+                   recurrence: Optional[Recurrence] = None) -> 'Schedule':
+        """datetime을 만들지 않고 epoch 초로 바로 생성 (저장소 로딩용)"""
+        schedule = cls.__new__(cls)
+        schedule.title = title
+        schedule.start_ts = start_ts
+        schedule.end_ts = end_ts
+        schedule.id = id
+        schedule.recurrence = recurrence
+        return schedule
+
+    @property
+    def datetime(self) -> 'dt.datetime':
+        """시작 시각 (현지 시간대)"""
+        return dt.datetime.fromtimestamp(self.start_ts, Config.TIMEZONE)
+
+    @datetime.setter
+    def datetime(self, value: 'dt.datetime') -> None:
+        self.start_ts = int(value.timestamp())
+
+    @property
+    def end_time(self) -> Optional['dt.datetime']:
+        """종료 시각 (현지 시간대, 없으면 None)"""
+        return dt.datetime.fromtimestamp(self.end_ts, Config.TIMEZONE) if self.end_ts is not None else None
+
+    @end_time.setter
+    def end_time(self, value: Optional['dt.datetime']) -> None:
+        self.end_ts = int(value.timestamp()) if value else None
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Schedule):
+            return NotImplemented
+        return (self.title, self.start_ts, self.end_ts, self.id, self.recurrence) == \
+            (other.title, other.start_ts, other.end_ts, other.id, other.recurrence)
+
+    def __repr__(self) -> str:
+        return (f"Schedule(title={self.title!r}, datetime={self.datetime!r}, end_time={self.end_time!r}, "
+                f"id={self.id!r}, recurrence={self.recurrence!r})")
+
+    def copy(self, **changes: Any) -> 'Schedule':
+        """일부 필드만 바꾼 사본 (datetime/end_time은 datetime으로, start_ts/end_ts는 epoch 초로 지정)"""
+        schedule = Schedule.from_epoch(self.title, self.start_ts, self.end_ts, self.id, self.recurrence)
+        for name, value in changes.items():
+            setattr(schedule, name, value)
+        return schedule
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             'title': self.title,
             'datetime': self.datetime,
-            'end_time': self.end_time
+            'end_time': self.end_time,
+            'id': self.id,
+            'recurrence': self.recurrence.to_dict() if self.recurrence else None
         }
 
+    @staticmethod
+    def _to_epoch(value: Union['dt.datetime', str, int, float, None]) -> Optional[int]:
+        """datetime / ISO 문자열 / epoch 초를 epoch 초로 변환"""
+        if value is None or value == '':
+            return None
+        if isinstance(value, (int, float)):
+            return int(value)
+        if isinstance(value, str):
+            value = dt.datetime.fromisoformat(value)
+        return int(value.timestamp())
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Schedule':
-        return cls(
+        return cls.from_epoch(
             title=data['title'],
-            datetime=data['datetime'],
-            end_time=data.get('end_time')
-        )
\ No newline at end of file
+            start_ts=cls._to_epoch(data['datetime']),
+            end_ts=cls._to_epoch(data.get('end_time')),
+            id=data.get('id'),
+            recurrence=Recurrence.from_dict(data['recurrence']) if data.get('recurrence') else None
+        )
+
+    def occurrence_at(self, start: 'dt.datetime') -> 'Schedule':
+        """start에 시작하는 회차 (길이와 번호는 원래 일정과 같음)"""
+        start_ts = int(start.timestamp())
+        end_ts = start_ts + (self.end_ts - self.start_ts) if self.end_ts is not None else None
+        return self.copy(start_ts=start_ts, end_ts=end_ts)
+
+    def occurrences(self, start: 'dt.datetime', end: 'dt.datetime') -> Iterator['Schedule']:
+        """시작 시각이 [start, end] 안에 있는 회차를 필요한 만큼만 생성"""
+        if self.recurrence is None:
+            if start.timestamp() <= self.start_ts <= end.timestamp():
+                yield self
+            return
+        for occurrence_start in self.recurrence.iter_between(self.datetime, start, end):
+            yield self.occurrence_at(occurrence_start)
+
+    def next_occurrence(self, after: 'dt.datetime') -> Optional['Schedule']:
+        """after 이후(포함) 처음 시작하는 회차"""
+        if self.recurrence is None:
+            return self if self.start_ts >= after.timestamp() else None
+        for occurrence_start in self.recurrence.iter_starts(self.datetime, after):
+            if occurrence_start >= after:
+                return self.occurrence_at(occurrence_start)
+        return None
+
+    def expire_ts(self) -> Optional[int]:
+        """마지막 회차가 끝나는 epoch 초 (끝없이 반복하면 None)"""
+        if self.recurrence is None:
+            return self.end_ts if self.end_ts is not None else self.start_ts
+        if not self.recurrence.is_finite:
+            return None
+        last_start = self.recurrence.last_start(self.datetime) or self.datetime
+        occurrence = self.occurrence_at(last_start)
+        return occurrence.end_ts if occurrence.end_ts is not None else occurrence.start_ts
@@ -0,0 +1,56 @@
+# services/agenda_index.py
+from datetime import date
+from typing import Dict, List
+from models.schedule import Schedule
+
+class AgendaIndex:
+    """날짜(현지)별로 그날 시작하는 일정이 있는 채팅방을 세어 두는 색인 (아침 브리핑 대상 선정)
+
+    반복 일정은 날짜별로 펼치지 않고 채팅방 단위로만 세므로, 반복 일정이 있는 채팅방은 항상 후보가 된다.
+    후보는 실제 일정의 상위 집합이며, 보내는 쪽에서 그날 일정을 다시 조회해 빈 채팅방을 거른다.
+    """
+
+    def __init__(self):
+        self._days: Dict[date, Dict[str, int]] = {}  # 날짜 -> 채팅방별 단일 일정 수
+        self._series: Dict[str, int] = {}  # 채팅방별 반복 일정 수
+
+    def add(self, chat_id: str, schedule: Schedule) -> None:
+        if schedule.recurrence is not None:
+            self._series[chat_id] = self._series.get(chat_id, 0) + 1
+            return
+        chats = self._days.setdefault(schedule.datetime.date(), {})
+        chats[chat_id] = chats.get(chat_id, 0) + 1
+
+    def remove(self, chat_id: str, schedule: Schedule) -> None:
+        """일정 제외 (색인을 만들기 전의 지난 일정처럼 세지 않은 일정이면 무시)"""
+        if schedule.recurrence is not None:
+            counts = self._series
+        else:
+            day = schedule.datetime.date()
+            counts = self._days.get(day)
+            if counts is None:
+                return
+        count = counts.get(chat_id, 0) - 1
+        if count > 0:
+            counts[chat_id] = count
+        else:
+            counts.pop(chat_id, None)
+            if schedule.recurrence is None and not counts:
+                del self._days[day]
+
+    def discard_chat(self, chat_id: str) -> None:
+        """채팅방의 모든 일정 제외 (/clear)"""
+        self._series.pop(chat_id, None)
+        for day in list(self._days):
+            chats = self._days[day]
+            if chats.pop(chat_id, None) is not None and not chats:
+                del self._days[day]
+
+    def prune(self, before: date) -> None:
+        """지난 날짜 정리 (저장소가 직접 삭제한 메모리 밖 채팅방의 일정 포함)"""
+        for day in [day for day in self._days if day < before]:
+            del self._days[day]
+
+    def chats_on(self, day: date) -> List[str]:
+        """그날 일정이 있을 수 있는 채팅방 (정렬된 목록)"""
+        return sorted(self._days.get(day, {}).keys() | self._series.keys())
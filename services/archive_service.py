@@ -0,0 +1,130 @@
+# services/archive_service.py
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+from config import Config
+from models.recurrence import Recurrence
+from models.schedule import Schedule
+from services.metrics_service import metrics
+
+class ArchiveService:
+    """지난 일정을 채팅방·월별 압축 세그먼트에 덧붙여 보관하는 보관소
+
+    세그먼트는 {보관 디렉토리}/{chat_id}/{YYYY-MM}.jsonl.gz (시작 시각이 속한 현지 월)이며,
+    정리할 때마다 한 줄에 일정 하나인 JSON을 gzip 멤버 하나로 압축해 파일 끝에 덧붙인다.
+    여러 gzip 멤버를 이어 붙인 파일도 하나의 gzip 스트림으로 읽히므로 기존 내용은 다시 쓰지 않는다.
+    이미 세그먼트에 있는 일정(번호와 시작 시각이 같은 일정)은 다시 덧붙이지 않으므로 같은 일정을 여러 번 보관해도 된다.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Config.ARCHIVE_DIR if directory is None else directory
+        self.archived_count = 0
+        self._lock = threading.Lock()  # 스레드 풀에서 보관하므로 같은 세그먼트에 동시에 덧붙이지 않도록 함
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    @staticmethod
+    def _month(ts: int) -> str:
+        return datetime.fromtimestamp(ts, Config.TIMEZONE).strftime('%Y-%m')
+
+    def segment_path(self, chat_id: str, month: str) -> str:
+        return os.path.join(self.directory, chat_id, f"{month}.jsonl.gz")
+
+    @staticmethod
+    def _to_record(schedule: Schedule) -> Dict:
+        record = {'id': schedule.id, 'title': schedule.title, 'start_ts': schedule.start_ts}
+        if schedule.end_ts is not None:
+            record['end_ts'] = schedule.end_ts
+        if schedule.recurrence is not None:
+            record['recurrence'] = schedule.recurrence.to_dict()
+        return record
+
+    @staticmethod
+    def _from_record(record: Dict) -> Schedule:
+        return Schedule.from_epoch(
+            record['title'], record['start_ts'], record.get('end_ts'), record.get('id'),
+            Recurrence.from_dict(record['recurrence']) if record.get('recurrence') else None
+        )
+
+    def archive(self, chat_id: str, schedules: Iterable[Schedule]) -> int:
+        """일정을 월별 세그먼트에 덧붙임 (이미 보관된 일정은 건너뛰고, 새로 보관한 일정 수 반환)"""
+        if not self.enabled:
+            return 0
+        by_month: Dict[str, List[Schedule]] = {}
+        for schedule in schedules:
+            by_month.setdefault(self._month(schedule.start_ts), []).append(schedule)
+
+        count = 0
+        with self._lock:
+            for month, month_schedules in by_month.items():
+                started = time.perf_counter()
+                path = self.segment_path(chat_id, month)
+                archived = set()  # 세그먼트에 이미 있는 (일정 번호, 시작 시각)
+                if os.path.exists(path):
+                    archived = {(record.get('id'), record['start_ts']) for record in self._read_segment(path)}
+                lines = []
+                for schedule in month_schedules:
+                    key = (schedule.id, schedule.start_ts)
+                    if key in archived:
+                        continue
+                    archived.add(key)
+                    lines.append(json.dumps(self._to_record(schedule), ensure_ascii=False, separators=(',', ':')))
+                if not lines:
+                    continue
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                data = gzip.compress(('\n'.join(lines) + '\n').encode('utf-8'))
+                with open(path, 'ab') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                metrics.observe('storage_write_duration_seconds', time.perf_counter() - started, kind='archive')
+                metrics.inc('storage_write_bytes_total', len(data), kind='archive')
+                count += len(lines)
+            self.archived_count += count
+        metrics.inc('schedules_archived_total', count)
+        return count
+
+    def _months(self, chat_id: str, start: date, end: date) -> List[str]:
+        """기간에 걸친 세그먼트 중 실제로 있는 월 (오래된 순)"""
+        months = []
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            name = f"{year:04d}-{month:02d}"
+            if os.path.exists(self.segment_path(chat_id, name)):
+                months.append(name)
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return months
+
+    def _read_segment(self, path: str) -> Iterator[Dict]:
+        """세그먼트를 줄 단위로 풀어 읽음 (기록 중 끊긴 마지막 멤버는 읽은 곳까지만 사용)"""
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.endswith('\n'):
+                        yield json.loads(line)
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            logging.warning(f"보관 세그먼트 {path}의 끝부분이 손상되어 읽을 수 있는 곳까지만 사용합니다.")
+
+    def iter_history(self, chat_id: str, start: datetime, end: datetime) -> Iterator[Schedule]:
+        """시작 시각이 [start, end] 안인 보관 일정을 시작 시각 순으로 생성 (기간에 걸친 월의 세그먼트만 읽음)"""
+        if not self.enabled:
+            return
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        local_start, local_end = start.astimezone(Config.TIMEZONE), end.astimezone(Config.TIMEZONE)
+        for month in self._months(chat_id, local_start.date(), local_end.date()):
+            # 세그먼트 안은 정리한 순서이므로 한 달치 결과만 정렬해서 내보냄
+            records = [
+                record for record in self._read_segment(self.segment_path(chat_id, month))
+                if start_ts <= record['start_ts'] <= end_ts
+            ]
+            records.sort(key=lambda record: (record['start_ts'], record.get('id') or 0))
+            for record in records:
+                yield self._from_record(record)
@@ -0,0 +1,180 @@
+# services/base_storage_service.py
+import asyncio
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Callable, Collection, Dict, List, Optional, Set, Tuple
+from models.recurrence import Recurrence
+from models.schedule import Schedule
+from services.date_service import DateService
+from services.metrics_service import metrics
+
+class BaseStorageService(ABC):
+    """일정 저장소 인터페이스"""
+
+    # True이면 시작 시 전체를 읽지 않고 채팅방별로 필요할 때 불러옴
+    lazy_load = False
+
+    def datetime_to_str(self, dt: datetime) -> str:
+        """datetime 객체를 문자열로 변환"""
+        return dt.isoformat() if dt else None
+
+    def str_to_datetime(self, dt_str: str) -> datetime:
+        """문자열을 datetime 객체로 변환"""
+        return datetime.fromisoformat(dt_str) if dt_str else None
+
+    def serialize_schedule(self, schedule: Schedule) -> Dict:
+        """Schedule 객체를 JSON 직렬화 가능한 형태로 변환"""
+        data = {
+            'title': schedule.title,
+            'datetime': self.datetime_to_str(schedule.datetime),
+            'end_time': self.datetime_to_str(schedule.end_time),
+            'id': schedule.id
+        }
+        if schedule.recurrence is not None:
+            data['recurrence'] = schedule.recurrence.to_dict()
+        return data
+
+    def deserialize_schedule(self, data: Dict) -> Schedule:
+        """JSON 데이터를 Schedule 객체로 변환"""
+        return self.deserialize_schedules([data])[0]
+
+    def deserialize_schedules(self, items: List[Dict]) -> List[Schedule]:
+        """JSON 데이터 목록을 Schedule 객체로 일괄 변환 (시각 문자열은 한 번에 epoch 초로 변환)"""
+        starts = DateService.iso_to_epochs([data['datetime'] for data in items])
+        ends = DateService.iso_to_epochs([data.get('end_time') for data in items])
+        return [
+            Schedule.from_epoch(
+                title=data['title'],
+                start_ts=start_ts,
+                end_ts=end_ts,
+                id=data.get('id'),
+                recurrence=Recurrence.from_dict(data['recurrence']) if data.get('recurrence') else None
+            )
+            for data, start_ts, end_ts in zip(items, starts, ends)
+        ]
+
+    def assign_missing_ids(self, schedules: List[Schedule]) -> List[Schedule]:
+        """ID가 없는 기존 데이터에 저장 순서대로 ID 부여"""
+        next_id = max((s.id for s in schedules if s.id is not None), default=0) + 1
+        for schedule in schedules:
+            if schedule.id is None:
+                schedule.id = next_id
+                next_id += 1
+        return schedules
+
+    @abstractmethod
+    def load_schedules(self) -> Dict[str, List[Schedule]]:
+        """저장된 모든 일정 불러오기"""
+
+    @abstractmethod
+    def save_schedules(self, schedules: Dict[str, List[Schedule]]) -> None:
+        """모든 일정 저장"""
+
+    def apply_change(self, schedules: Dict[str, List[Schedule]], change: Dict[str, Any]) -> None:
+        """변경 1건 반영"""
+        self.apply_changes(schedules, [change])
+
+    def apply_changes(self, schedules: Dict[str, List[Schedule]], changes: List[Dict[str, Any]]) -> None:
+        """여러 변경을 한 번에 반영 (기본 구현은 전체 저장)"""
+        self.save_schedules(schedules)
+
+    def run_after_save(self, callback: Callable[[], None]) -> None:
+        """앞서 apply_changes로 넘긴 변경이 저장된 뒤 callback 실행 (이벤트 루프가 돌고 있으면 스레드 풀에서)
+
+        기본 구현은 apply_changes가 돌아왔을 때 이미 저장되어 있으므로 바로 실행을 예약한다.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._run_callback(callback)
+            return
+        loop.run_in_executor(None, self._run_callback, callback)
+
+    @staticmethod
+    def _run_callback(callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception as e:
+            logging.error(f"저장 후 작업 실패: {e}")
+
+    def pending_chats(self) -> Set[str]:
+        """아직 저장하지 않은 변경이 있는 채팅방 (메모리에서 내리면 변경을 잃으므로 유지해야 함)"""
+        return set()
+
+    def snapshot(self, schedules: Dict[str, List[Schedule]], changes: List[Dict[str, Any]]) -> Dict[str, List[Schedule]]:
+        """백그라운드 저장에 넘길 상태 사본 (기본 구현은 전체 얕은 복사)"""
+        return {chat_id: list(chat_schedules) for chat_id, chat_schedules in schedules.items()}
+
+    def load_chat(self, chat_id: str) -> List[Schedule]:
+        """특정 채팅방의 일정 불러오기"""
+        return self.load_schedules().get(chat_id, [])
+
+    def query_range(self, chat_id: str, start: datetime, end: datetime) -> Optional[List[Schedule]]:
+        """기간 조회를 저장소에서 처리 (지원하지 않으면 None)"""
+        return None
+
+    def delete_before(self, before: datetime, skip_chats: Collection[str] = ()) -> Optional[int]:
+        """기준 시각 이전 일정을 저장소에서 삭제 (skip_chats의 채팅방 제외, 지원하지 않으면 None)"""
+        return None
+
+    def query_before(self, before: datetime, skip_chats: Collection[str] = ()) -> Optional[List[Tuple[str, Schedule]]]:
+        """delete_before가 삭제할 (chat_id, 일정) 조회 (지원하지 않으면 None)"""
+        return None
+
+    def query_upcoming(self, after: datetime) -> Optional[List[Tuple[str, Schedule]]]:
+        """전체 채팅방에서 기준 시각 이후에 시작하는 (chat_id, 일정) 조회 (지원하지 않으면 None)"""
+        return None
+
+    async def start(self) -> None:
+        """봇 시작 시 호출 (백그라운드 작업이 필요한 저장소용)"""
+
+    async def stop(self) -> None:
+        """봇 종료 시 호출"""
+        self.close()
+
+    def close(self) -> None:
+        """저장소 자원 정리"""
+
+    def _read_snapshot(self, path: str) -> Dict[str, List[Schedule]]:
+        """JSON 스냅샷 파일 읽기"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                return {
+                    chat_id: self.assign_missing_ids(self.deserialize_schedules(schedules))
+                    for chat_id, schedules in data.items()
+                }
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            # 손상된 파일을 덮어쓰지 않고 옆으로 옮겨 보존
+            corrupt_path = f"{path}.corrupt-{int(time.time())}"
+            os.replace(path, corrupt_path)
+            logging.error(f"{path} 파일이 손상되어 {corrupt_path}로 옮겼습니다.")
+            return {}
+
+    @staticmethod
+    def _record_write(kind: str, size: Optional[int], started: float) -> None:
+        """저장 파일 기록 지표 (종류별 횟수·시간·바이트)"""
+        metrics.observe('storage_write_duration_seconds', time.perf_counter() - started, kind=kind)
+        if size:
+            metrics.inc('storage_write_bytes_total', size, kind=kind)
+
+    def _atomic_write_json(self, path: str, data: Dict, indent: Optional[int] = None) -> None:
+        """임시 파일에 기록 후 rename하여 중간에 끊겨도 기존 파일이 유지되도록 저장"""
+        started = time.perf_counter()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            if indent is None:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            else:
+                json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+            size = os.fstat(f.fileno()).st_size
+        os.replace(tmp_path, path)
+        self._record_write('json', size, started)
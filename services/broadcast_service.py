@@ -0,0 +1,182 @@
+# services/broadcast_service.py
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import date
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from config import Config
+from models.schedule import Schedule
+from services.metrics_service import metrics
+from services.schedule_service import ScheduleService
+
+class BroadcastService:
+    """그날 일정이 있는 채팅방마다 아침 브리핑을 보내는 발송기
+
+    대상은 ScheduleService의 날짜별 색인으로 고르고, 정해진 수의 발송 작업이 대상 목록을 나눠 가져가며 보낸다
+    (속도 제한과 재시도는 send가 거치는 발송 계층이 맡음). 보낸 채팅방과 실패한 채팅방은 한 줄씩 바로 기록 파일 끝에
+    덧붙이므로(디스크 동기화는 BROADCAST_FSYNC_EVERY줄마다), 보내던 도중 재시작하면 보낸 채팅방은 건너뛰고 나머지와
+    실패한 채팅방부터 이어서 보낸다. 실패한 채팅방은 BROADCAST_RETRY_ROUNDS번까지 다시 보낸 뒤에 끝을 기록한다.
+
+    기록 파일은 한 줄에 JSON 하나: {"day": 날짜} 다음에 {"sent": [chat_id]}, {"failed": [chat_id]}가 이어지고,
+    끝나면 {"finished": true}.
+    """
+
+    def __init__(self, schedule_service: ScheduleService, state_path: Optional[str] = None,
+                 concurrency: Optional[int] = None, fsync_every: Optional[int] = None,
+                 retry_rounds: Optional[int] = None, retry_delay: Optional[float] = None):
+        self.schedule_service = schedule_service
+        self.state_path = state_path or Config.BROADCAST_STATE_PATH
+        self.concurrency = concurrency or Config.BROADCAST_CONCURRENCY
+        self.fsync_every = fsync_every or Config.BROADCAST_FSYNC_EVERY
+        self.retry_rounds = Config.BROADCAST_RETRY_ROUNDS if retry_rounds is None else retry_rounds
+        self.retry_delay = Config.BROADCAST_RETRY_DELAY if retry_delay is None else retry_delay
+
+        self.day: Optional[date] = None  # 기록 중인 브리핑 날짜
+        self.sent: Set[str] = set()  # 그날 브리핑을 보낸 채팅방
+        self.failed: Set[str] = set()  # 마지막 시도가 실패한 채팅방 (보내지 않은 것으로 보고 다시 보냄)
+        self.finished = False
+        self.load()
+        self._running = False
+
+        self.sent_count = 0
+        self.skipped_count = 0  # 후보였지만 그날 일정이 없던 채팅방
+        self.failed_count = 0
+        self.last_duration: Optional[float] = None
+
+        metrics.register_collector('broadcast_chats_total', 'counter', "아침 브리핑 대상 채팅방 수 (결과별)", lambda: {
+            (('result', 'sent'),): self.sent_count,
+            (('result', 'skipped'),): self.skipped_count,
+            (('result', 'failed'),): self.failed_count,
+        })
+
+    def load(self) -> None:
+        """기록 파일 불러오기 (기록 중 끊긴 마지막 줄은 무시)"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        try:
+            for line in lines:
+                if not line.endswith('\n'):
+                    break
+                record = json.loads(line)
+                if 'day' in record:
+                    self.day, self.sent, self.failed, self.finished = date.fromisoformat(record['day']), set(), set(), False
+                elif self.day is not None:
+                    self.sent.update(record.get('sent', ()))
+                    self.failed.difference_update(record.get('sent', ()))
+                    self.failed.update(record.get('failed', ()))
+                    self.finished = self.finished or bool(record.get('finished'))
+        except (json.JSONDecodeError, TypeError, ValueError):
+            logging.warning(f"{self.state_path} 파일의 일부를 읽을 수 없어 읽은 곳까지만 사용합니다.")
+
+    def _begin(self, day: date) -> None:
+        """새 날짜의 기록 시작 (이전 날짜 기록은 버림)"""
+        self.day, self.sent, self.failed, self.finished = day, set(), set(), False
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'day': day.isoformat()}) + '\n')
+        os.replace(tmp_path, self.state_path)
+
+    def has_unfinished(self, day: date) -> bool:
+        """그날 브리핑을 보내다 멈췄는지 (재시작 후 이어서 보낼지 판단)"""
+        return self.day == day and not self.finished
+
+    async def broadcast(self, day: date, send: Callable[[str, date, List[Schedule]], Awaitable[None]]) -> int:
+        """그날 일정이 있는 채팅방에 브리핑 발송 (보낸 채팅방 수 반환, 이미 끝낸 날짜면 0)"""
+        if self._running:
+            logging.info("아침 브리핑을 이미 보내는 중이라 건너뜁니다.")
+            return 0
+        if self.day != day:
+            self._begin(day)
+        elif self.finished:
+            return 0
+
+        self._running = True
+        started = time.perf_counter()
+        candidates = [chat_id for chat_id in self.schedule_service.get_agenda_chats(day) if chat_id not in self.sent]
+        resumed = len(self.sent)
+        sent_count = 0
+        state = open(self.state_path, 'a', encoding='utf-8')
+        unsynced = 0
+
+        def record(entry: Dict) -> None:
+            # 한 줄씩 바로 넘겨 프로세스가 재시작돼도 기록된 채팅방은 다시 보내지 않음 (fsync는 묶어서)
+            nonlocal unsynced
+            state.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            state.flush()
+            unsynced += 1
+            if unsynced >= self.fsync_every:
+                os.fsync(state.fileno())
+                unsynced = 0
+
+        async def send_one(chat_id: str) -> None:
+            nonlocal sent_count
+            send_started = time.perf_counter()
+            try:
+                schedules = self.schedule_service.get_day_schedules(chat_id, day)
+                if not schedules:
+                    self.skipped_count += 1
+                    return
+                await send(chat_id, day, schedules)
+            except Exception as e:
+                self.failed.add(chat_id)
+                record({'failed': [chat_id]})
+                logging.warning(f"아침 브리핑 발송 실패 (chat {chat_id}): {e}")
+                return
+            metrics.observe('broadcast_send_duration_seconds', time.perf_counter() - send_started)
+            self.sent.add(chat_id)
+            self.failed.discard(chat_id)
+            self.sent_count += 1
+            sent_count += 1
+            record({'sent': [chat_id]})
+
+        async def send_all(targets: List[str]) -> None:
+            chats = iter(targets)
+
+            async def worker() -> None:
+                # 작업마다 남은 대상을 하나씩 가져가므로 동시에 보내는 채팅방은 concurrency개를 넘지 않음
+                for chat_id in chats:
+                    await send_one(chat_id)
+
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(targets)))))
+
+        try:
+            self.failed.clear()  # 지난번에 실패한 채팅방도 보내지 않은 채팅방이므로 대상에 들어 있음
+            await send_all(candidates)
+            for _ in range(self.retry_rounds):
+                if not self.failed:
+                    break
+                await asyncio.sleep(self.retry_delay)
+                retry, self.failed = sorted(self.failed), set()
+                logging.info(f"아침 브리핑 실패한 채팅방 {len(retry)}개 다시 발송")
+                await send_all(retry)
+            self.failed_count += len(self.failed)
+            record({'finished': True})
+            self.finished = True
+        finally:
+            state.flush()
+            os.fsync(state.fileno())
+            state.close()
+            self._running = False
+
+        self.last_duration = time.perf_counter() - started
+        metrics.observe('broadcast_duration_seconds', self.last_duration)
+        resumed_note = f", 재시작 전에 보낸 {resumed}개 제외" if resumed else ""
+        failed_note = f", {len(self.failed)}개 실패" if self.failed else ""
+        logging.info(f"아침 브리핑 완료 ({day}): 후보 {len(candidates)}개 중 {sent_count}개 발송{resumed_note}"
+                     f"{failed_note}, {self.last_duration:.1f}s")
+        return sent_count
+
+    def stats(self) -> dict:
+        return {
+            'day': self.day.isoformat() if self.day else None,
+            'sent': self.sent_count,
+            'skipped': self.skipped_count,
+            'failed': self.failed_count,
+            'last_duration': self.last_duration,
+        }
@@ -1,9 +1,20 @@
 # services/date_service.py
-from datetime import datetime, timedelta
-from typing import Tuple, Optional
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Dict, Iterable, List, Tuple, Optional
 from config import Config
+from models.recurrence import Recurrence
 
 class DateService:
+    # 날짜별 pytz 시간대 정보 캐시 (하루 안에 UTC 오프셋이 바뀌는 날은 None)
+    _LOCAL_TZINFO_CACHE: Dict[date, Optional[tzinfo]] = {}
+    LOCAL_TZINFO_CACHE_SIZE = 4096
+
+    # 저장된 ISO 문자열의 날짜·시각·UTC 오프셋 부분별 초 단위 값 캐시
+    _ISO_DAY_CACHE: Dict[str, int] = {}
+    _ISO_TIME_CACHE: Dict[str, int] = {}
+    _ISO_OFFSET_CACHE: Dict[str, int] = {}
+    _EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
     @staticmethod
     def get_week_range(date: datetime) -> Tuple[datetime, datetime]:
         """주의 시작일과 종료일 반환"""
@@ -23,8 +34,102 @@ class DateService:
     @staticmethod
     def parse_datetime(date_str: str, time_str: str) -> datetime:
         """날짜와 시간 문자열을 datetime으로 변환"""
-        dt = datetime.strptime(f"{date_str} {time_str}", Config.DATETIME_FORMAT)
-        return Config.TIMEZONE.localize(dt)
+        dt = None
+        # YYYY-MM-DD HH:MM 고정 형식은 strptime 없이 바로 변환
+        if (len(date_str) == 10 and len(time_str) == 5 and date_str[4] == '-' and date_str[7] == '-'
+                and time_str[2] == ':'):
+            digits = date_str[:4] + date_str[5:7] + date_str[8:] + time_str[:2] + time_str[3:]
+            if digits.isascii() and digits.isdigit():
+                try:
+                    dt = datetime(int(digits[:4]), int(digits[4:6]), int(digits[6:8]),
+                                  int(digits[8:10]), int(digits[10:]))
+                except ValueError:
+                    pass  # 범위를 벗어난 값은 strptime과 같은 오류를 내도록 아래에서 처리
+        if dt is None:
+            dt = datetime.strptime(f"{date_str} {time_str}", Config.DATETIME_FORMAT)
+        return DateService.localize(dt)
+
+    @staticmethod
+    def localize(dt: datetime) -> datetime:
+        """현지 시각에 시간대 부여 (pytz localize 결과를 날짜별로 캐시)"""
+        cache = DateService._LOCAL_TZINFO_CACHE
+        day = dt.date()
+        if day in cache:
+            tz = cache[day]
+        else:
+            if len(cache) >= DateService.LOCAL_TZINFO_CACHE_SIZE:
+                cache.clear()
+            first = Config.TIMEZONE.localize(datetime.combine(day, time.min)).tzinfo
+            last = Config.TIMEZONE.localize(datetime.combine(day, time.max)).tzinfo
+            tz = cache[day] = first if first is last else None
+        if tz is None:
+            return Config.TIMEZONE.localize(dt)
+        return dt.replace(tzinfo=tz)
+
+    @staticmethod
+    def iso_to_epochs(values: Iterable[Optional[str]]) -> List[Optional[int]]:
+        """저장된 ISO 문자열을 epoch 초로 일괄 변환 (빈 값은 None)"""
+        day_cache = DateService._ISO_DAY_CACHE
+        time_cache = DateService._ISO_TIME_CACHE
+        offset_cache = DateService._ISO_OFFSET_CACHE
+        epochs = []
+        append = epochs.append
+        for value in values:
+            if not value:
+                append(None)
+                continue
+            # isoformat()이 만드는 'YYYY-MM-DDTHH:MM:SS+HH:MM' 형식은 부분별 캐시로 계산
+            if len(value) == 25 and value[10] == 'T':
+                day = day_cache.get(value[:10])
+                if day is None:
+                    day = DateService._iso_day_seconds(value[:10])
+                seconds = time_cache.get(value[11:19])
+                if seconds is None:
+                    seconds = DateService._iso_time_seconds(value[11:19])
+                offset = offset_cache.get(value[19:])
+                if offset is None:
+                    offset = DateService._iso_offset_seconds(value[19:])
+                if day is not None and seconds is not None and offset is not None:
+                    append(day + seconds - offset)
+                    continue
+            append(int(datetime.fromisoformat(value).timestamp()))
+        return epochs
+
+    @staticmethod
+    def iso_to_epoch(value: Optional[str]) -> Optional[int]:
+        """저장된 ISO 문자열 1개를 epoch 초로 변환"""
+        return DateService.iso_to_epochs((value,))[0]
+
+    @staticmethod
+    def _iso_day_seconds(value: str) -> Optional[int]:
+        try:
+            day = date.fromisoformat(value)
+        except ValueError:
+            return None
+        seconds = DateService._ISO_DAY_CACHE[value] = (day.toordinal() - DateService._EPOCH_ORDINAL) * 86400
+        return seconds
+
+    @staticmethod
+    def _iso_time_seconds(value: str) -> Optional[int]:
+        if value[2:3] != ':' or value[5:6] != ':':
+            return None
+        try:
+            parsed = time.fromisoformat(value)
+        except ValueError:
+            return None
+        seconds = DateService._ISO_TIME_CACHE[value] = parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+        return seconds
+
+    @staticmethod
+    def _iso_offset_seconds(value: str) -> Optional[int]:
+        if len(value) != 6 or value[0] not in '+-' or value[3] != ':':
+            return None
+        try:
+            offset = datetime.fromisoformat(f"2000-01-01T00:00:00{value}").utcoffset()
+        except ValueError:
+            return None
+        seconds = DateService._ISO_OFFSET_CACHE[value] = int(offset.total_seconds())
+        return seconds
 
     @staticmethod
     def parse_datetime_range(date_str: str, time_range_str: str) -> Tuple[datetime, Optional[datetime]]:
@@ -49,3 +154,88 @@ class DateService:
                 
         except ValueError as e:
             raise ValueError(f"잘못된 시간 형식입니다: {time_range_str}")
+
+    # 반복 주기 입력값 (한글/영문)
+    RECURRENCE_FREQUENCIES = {
+        '매일': 'daily', 'daily': 'daily',
+        '매주': 'weekly', 'weekly': 'weekly',
+        '매월': 'monthly', 'monthly': 'monthly'
+    }
+
+    @staticmethod
+    def parse_recurrence(args: List[str]) -> Tuple[Recurrence, List[str]]:
+        """'매주:월,수 [every=N] [until=YYYY-MM-DD] [count=N]' 형식의 반복 규칙과 나머지 인자 반환"""
+        if not args:
+            raise ValueError("반복 주기를 입력해주세요: 매일, 매주[:요일,...], 매월")
+        freq_str, _, weekday_str = args[0].partition(':')
+        freq = DateService.RECURRENCE_FREQUENCIES.get(freq_str.lower())
+        if freq is None:
+            raise ValueError(f"알 수 없는 반복 주기입니다: {freq_str}")
+
+        weekdays = []
+        if weekday_str:
+            if freq != 'weekly':
+                raise ValueError("요일은 매주 반복에만 지정할 수 있습니다.")
+            for name in weekday_str.split(','):
+                if name not in Config.WEEKDAY_NAMES:
+                    raise ValueError(f"알 수 없는 요일입니다: {name}")
+                weekdays.append(Config.WEEKDAY_NAMES.index(name))
+
+        options = {}
+        rest = args[1:]
+        while rest and '=' in rest[0]:
+            key, _, value = rest.pop(0).partition('=')
+            if key not in ('every', 'until', 'count'):
+                raise ValueError(f"알 수 없는 반복 옵션입니다: {key}")
+            try:
+                if key == 'every':
+                    options['interval'] = int(value)
+                elif key == 'until':
+                    options['until'] = date.fromisoformat(value)
+                else:
+                    options['count'] = int(value)
+            except ValueError:
+                raise ValueError(f"잘못된 반복 옵션입니다: {key}={value}")
+        if options.get('count', 0) > Config.RECURRENCE_MAX_COUNT:
+            raise ValueError(f"반복 횟수는 {Config.RECURRENCE_MAX_COUNT}회까지 지정할 수 있습니다.")
+        today = datetime.now(Config.TIMEZONE).date()
+        if 'until' in options and options['until'].year > today.year + Config.RECURRENCE_MAX_YEARS:
+            raise ValueError(f"반복 종료일은 {Config.RECURRENCE_MAX_YEARS}년 뒤까지 지정할 수 있습니다.")
+        # 간격·횟수가 1 미만이면 Recurrence가 ValueError
+        return Recurrence(freq=freq, weekdays=sorted(set(weekdays)), **options), rest
+
+    # 시간 길이 단위별 분
+    _DURATION_UNITS = {'h': 60, '시간': 60, 'm': 1, '분': 1}
+
+    @staticmethod
+    def parse_duration(text: str) -> timedelta:
+        """'90'(분), '90m', '1h30m', '1:30', '1시간30분' 형식의 길이"""
+        value = text.strip().lower().replace(' ', '')
+        try:
+            if ':' in value:
+                hours, minutes = value.split(':')
+                total = int(hours) * 60 + int(minutes)
+            elif value.isdigit():
+                total = int(value)
+            else:
+                total = 0
+                number = ''
+                rest = value
+                while rest:
+                    if rest[0].isdigit():
+                        number += rest[0]
+                        rest = rest[1:]
+                        continue
+                    unit = next((unit for unit in DateService._DURATION_UNITS if rest.startswith(unit)), None)
+                    if unit is None or not number:
+                        raise ValueError
+                    total += int(number) * DateService._DURATION_UNITS[unit]
+                    number = ''
+                    rest = rest[len(unit):]
+                if number:
+                    raise ValueError
+        except ValueError:
+            raise ValueError(f"잘못된 시간 길이입니다: {text}")
+        if total <= 0:
+            raise ValueError("시간 길이는 1분 이상이어야 합니다.")
+        return timedelta(minutes=total)
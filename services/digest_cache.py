@@ -0,0 +1,31 @@
+# services/digest_cache.py
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from config import Config
+
+class DigestCache:
+    """렌더링된 주간 일정과 날짜별 구간 문자열 (또는 목록 페이지 나눔)을 보관하는 LRU 캐시"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or Config.DIGEST_CACHE_SIZE
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        text = self._entries.get(key)
+        if text is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return text
+
+    def put(self, key: Hashable, text: Any) -> None:
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,65 @@
+# services/expiry_service.py
+import heapq
+from typing import Dict, List, Mapping, Tuple
+from models.schedule import Schedule
+from services.schedule_index import ChatScheduleIndex
+
+class ExpiryService:
+    """전체 채팅방 일정의 종료 시각을 최소 힙으로 관리하여 지난 일정만 골라냄"""
+
+    # 삭제·수정으로 남은 무효 항목이 이 개수를 넘으면 힙을 다시 만듦
+    COMPACT_SLACK = 1024
+
+    def __init__(self):
+        self._heap: List[Tuple[float, str, int]] = []  # (종료 epoch, chat_id, 일정 번호)
+        self._stale = 0  # 삭제·수정으로 무효가 된 항목 수
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @staticmethod
+    def expire_ts(schedule: Schedule) -> float:
+        """일정이 끝나는 시각 (종료 시간이 없으면 시작 시각, 반복 일정은 마지막 회차 기준)"""
+        expire_ts = schedule.expire_ts()
+        return float('inf') if expire_ts is None else expire_ts
+
+    def push(self, chat_id: str, schedule: Schedule) -> None:
+        heapq.heappush(self._heap, (self.expire_ts(schedule), chat_id, schedule.id))
+
+    def push_chat(self, chat_id: str, schedules: ChatScheduleIndex) -> None:
+        for schedule in schedules:
+            self.push(chat_id, schedule)
+
+    def mark_stale(self, count: int = 1) -> None:
+        """일정 삭제·수정으로 기존 항목이 무효가 되었음을 기록"""
+        self._stale += count
+
+    def rebuild(self, schedules: Mapping[str, ChatScheduleIndex]) -> None:
+        """현재 일정 전체로 힙을 다시 구성"""
+        self._heap = [
+            (self.expire_ts(schedule), chat_id, schedule.id)
+            for chat_id, chat_schedules in schedules.items()
+            for schedule in chat_schedules
+        ]
+        heapq.heapify(self._heap)
+        self._stale = 0
+
+    def pop_expired(self, schedules: Mapping[str, ChatScheduleIndex], before_ts: float) -> Dict[str, List[int]]:
+        """before_ts 이전에 끝난 일정을 힙에서 꺼내 채팅방별 번호 목록으로 반환"""
+        expired: Dict[str, List[int]] = {}
+        seen = set()
+        heap = self._heap
+        while heap and heap[0][0] < before_ts:
+            ts, chat_id, schedule_id = heapq.heappop(heap)
+            chat_schedules = schedules.get(chat_id)
+            schedule = chat_schedules.get(schedule_id) if chat_schedules is not None else None
+            # 이미 삭제되었거나 수정되어 종료 시각이 바뀐 항목은 건너뜀
+            if schedule is None or self.expire_ts(schedule) != ts or (chat_id, schedule_id) in seen:
+                self._stale = max(self._stale - 1, 0)
+                continue
+            seen.add((chat_id, schedule_id))
+            expired.setdefault(chat_id, []).append(schedule_id)
+
+        if self._stale > self.COMPACT_SLACK and self._stale * 2 > len(heap):
+            self.rebuild(schedules)
+        return expired
@@ -0,0 +1,225 @@
+# services/ical_service.py
+import logging
+from datetime import datetime, time, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import pytz
+from config import Config
+from models.recurrence import Recurrence
+from models.schedule import Schedule
+
+class ICalService:
+    """iCalendar(.ics) 문서를 한 줄씩 만들고 읽는 스트리밍 변환기 (RFC 5545의 VEVENT 일부만 지원)"""
+
+    PRODID = "-//TelegramSchedule//Weekly Schedule Bot//KO"
+    FOLD_OCTETS = 75
+    EVENT_PROPERTIES = ('DTSTART', 'DTEND', 'SUMMARY', 'RRULE', 'EXDATE')  # 가져올 때 읽는 속성
+    RRULE_FREQUENCIES = {'daily': 'DAILY', 'weekly': 'WEEKLY', 'monthly': 'MONTHLY'}
+    BYDAY_NAMES = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+    def __init__(self):
+        self.skipped_count = 0  # 가져오기 중 건너뛴 VEVENT 수
+
+    # ----- 내보내기 -----
+
+    @staticmethod
+    def escape_text(text: str) -> str:
+        return (text.replace('\\', '\\\\').replace(';', '\\;')
+                .replace(',', '\\,').replace('\n', '\\n'))
+
+    @classmethod
+    def fold_line(cls, line: str) -> str:
+        """75옥텟마다 줄을 접어 CRLF로 끝나는 문자열 반환 (UTF-8 문자 중간에서 자르지 않음)"""
+        if len(line.encode('utf-8')) <= cls.FOLD_OCTETS:
+            return line + "\r\n"
+        parts = []
+        current = []
+        size = 0
+        limit = cls.FOLD_OCTETS
+        for char in line:
+            char_size = len(char.encode('utf-8'))
+            if size + char_size > limit:
+                parts.append(''.join(current))
+                current = []
+                size = 0
+                limit = cls.FOLD_OCTETS - 1  # 이어지는 줄은 앞의 공백 1칸 포함
+            current.append(char)
+            size += char_size
+        parts.append(''.join(current))
+        return "\r\n ".join(parts) + "\r\n"
+
+    @staticmethod
+    def format_utc(value: datetime) -> str:
+        return value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    def format_recurrence(self, schedule: Schedule) -> str:
+        """반복 규칙을 RRULE / EXDATE 줄로 변환"""
+        recurrence = schedule.recurrence
+        rule = f"FREQ={self.RRULE_FREQUENCIES[recurrence.freq]};INTERVAL={recurrence.interval}"
+        if recurrence.weekdays:
+            rule += ";BYDAY=" + ','.join(self.BYDAY_NAMES[weekday] for weekday in recurrence.weekdays)
+        if recurrence.until:
+            # 종료일 당일(현지 시간)까지 포함
+            until = Config.TIMEZONE.localize(datetime.combine(recurrence.until, time.max))
+            rule += f";UNTIL={self.format_utc(until)}"
+        if recurrence.count:
+            rule += f";COUNT={recurrence.count}"
+        lines = f"RRULE:{rule}\r\n"
+        if recurrence.exceptions:
+            clock_time = schedule.datetime.astimezone(Config.TIMEZONE).time().replace(tzinfo=None)
+            exdates = ','.join(
+                self.format_utc(Config.TIMEZONE.localize(datetime.combine(day, clock_time)))
+                for day in recurrence.exceptions
+            )
+            lines += self.fold_line(f"EXDATE:{exdates}")
+        return lines
+
+    def iter_export(self, chat_id: str, schedules: Iterable[Schedule]) -> Iterator[str]:
+        """VCALENDAR 문서를 VEVENT 단위 문자열로 차례대로 생성"""
+        yield f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{self.PRODID}\r\nCALSCALE:GREGORIAN\r\n"
+        dtstamp = self.format_utc(datetime.now(timezone.utc))
+        for schedule in schedules:
+            event = (
+                f"BEGIN:VEVENT\r\n"
+                f"UID:{chat_id}-{schedule.id}@telegram-schedule\r\n"
+                f"DTSTAMP:{dtstamp}\r\n"
+                f"DTSTART:{self.format_utc(schedule.datetime)}\r\n"
+            )
+            if schedule.end_time:
+                event += f"DTEND:{self.format_utc(schedule.end_time)}\r\n"
+            if schedule.recurrence:
+                event += self.format_recurrence(schedule)
+            event += self.fold_line(f"SUMMARY:{self.escape_text(schedule.title)}")
+            yield event + "END:VEVENT\r\n"
+        yield "END:VCALENDAR\r\n"
+
+    # ----- 가져오기 -----
+
+    @staticmethod
+    def unescape_text(text: str) -> str:
+        if '\\' not in text:
+            return text
+        result = []
+        chars = iter(text)
+        for char in chars:
+            if char == '\\':
+                escaped = next(chars, '')
+                result.append('\n' if escaped in ('n', 'N') else escaped)
+            else:
+                result.append(char)
+        return ''.join(result)
+
+    @staticmethod
+    def iter_unfolded(lines: Iterable[str]) -> Iterator[str]:
+        """접힌 줄(공백·탭으로 시작하는 줄)을 앞 줄에 이어 붙여 논리적인 줄 단위로 반환"""
+        current: Optional[str] = None
+        for line in lines:
+            line = line.rstrip('\r\n')
+            if line[:1] in (' ', '\t') and current is not None:
+                current += line[1:]
+                continue
+            if current is not None:
+                yield current
+            current = line
+        if current:
+            yield current
+
+    @staticmethod
+    def parse_property(line: str) -> Tuple[str, Dict[str, str], str]:
+        """'NAME;PARAM=VALUE:값' 형식을 (이름, 매개변수, 값)으로 분리"""
+        head, _, value = line.partition(':')
+        name, *params = head.split(';')
+        parameters = {}
+        for param in params:
+            key, _, param_value = param.partition('=')
+            parameters[key.upper()] = param_value.strip('"')
+        return name.upper(), parameters, value
+
+    @staticmethod
+    def parse_datetime(value: str, parameters: Dict[str, str]) -> datetime:
+        """DATE / DATE-TIME 값을 시간대가 있는 datetime으로 변환 (시간대가 없으면 Config.TIMEZONE)"""
+        value = value.strip()
+        year, month, day = int(value[0:4]), int(value[4:6]), int(value[6:8])
+        if len(value) < 15 or parameters.get('VALUE') == 'DATE':
+            # 종일 일정은 현지 자정으로 처리
+            return Config.TIMEZONE.localize(datetime(year, month, day))
+        parsed = datetime(year, month, day, int(value[9:11]), int(value[11:13]), int(value[13:15]))
+        if value.endswith('Z'):
+            return parsed.replace(tzinfo=timezone.utc).astimezone(Config.TIMEZONE)
+        tz = Config.TIMEZONE
+        tzid = parameters.get('TZID')
+        if tzid:
+            try:
+                tz = pytz.timezone(tzid)
+            except pytz.UnknownTimeZoneError:
+                pass
+        return tz.localize(parsed).astimezone(Config.TIMEZONE)
+
+    def iter_events(self, lines: Iterable[str]) -> Iterator[Schedule]:
+        """줄 단위 입력에서 VEVENT를 하나씩 읽어 일정으로 반환 (문서 전체를 메모리에 올리지 않음)"""
+        event: Optional[Dict[str, List[Tuple[Dict[str, str], str]]]] = None
+        for line in self.iter_unfolded(lines):
+            if line == 'BEGIN:VEVENT':
+                event = {}
+                continue
+            if event is None:
+                continue
+            if line == 'END:VEVENT':
+                schedule = self._build_schedule(event)
+                if schedule is not None:
+                    yield schedule
+                event = None
+                continue
+            if line[:7].upper().startswith(self.EVENT_PROPERTIES):
+                name, parameters, value = self.parse_property(line)
+                if name in self.EVENT_PROPERTIES:
+                    event.setdefault(name, []).append((parameters, value))
+
+    def parse_recurrence(self, rule: str, exdates: List[Tuple[Dict[str, str], str]]) -> Recurrence:
+        """RRULE 값과 EXDATE 목록을 반복 규칙으로 변환 (지원하지 않는 규칙은 ValueError)"""
+        parts = dict(part.partition('=')[::2] for part in rule.upper().split(';') if part)
+        frequencies = {value: key for key, value in self.RRULE_FREQUENCIES.items()}
+        if parts.get('FREQ') not in frequencies:
+            raise ValueError(f"지원하지 않는 반복 주기입니다: {parts.get('FREQ')}")
+        unsupported = set(parts) - {'FREQ', 'INTERVAL', 'BYDAY', 'UNTIL', 'COUNT', 'WKST'}
+        if unsupported:
+            raise ValueError(f"지원하지 않는 반복 규칙입니다: {','.join(sorted(unsupported))}")
+
+        freq = frequencies[parts['FREQ']]
+        weekdays = []
+        if 'BYDAY' in parts:
+            if freq != 'weekly':
+                raise ValueError("BYDAY는 매주 반복에서만 지원합니다.")
+            weekdays = sorted(self.BYDAY_NAMES.index(day) for day in parts['BYDAY'].split(','))
+        exceptions = [
+            self.parse_datetime(exdate, parameters).date()
+            for parameters, value in exdates for exdate in value.split(',')
+        ]
+        # 간격·횟수가 1 미만인 규칙은 Recurrence가 ValueError로 거름 (건너뛴 VEVENT로 셈)
+        return Recurrence(
+            freq=freq,
+            interval=int(parts.get('INTERVAL', 1)),
+            weekdays=weekdays,
+            until=self.parse_datetime(parts['UNTIL'], {}).date() if 'UNTIL' in parts else None,
+            count=int(parts['COUNT']) if 'COUNT' in parts else None,
+            exceptions=exceptions
+        )
+
+    def _build_schedule(self, event: Dict[str, List[Tuple[Dict[str, str], str]]]) -> Optional[Schedule]:
+        try:
+            start_parameters, start_value = event['DTSTART'][0]
+            start = self.parse_datetime(start_value, start_parameters)
+            end = None
+            if 'DTEND' in event:
+                end_parameters, end_value = event['DTEND'][0]
+                end = self.parse_datetime(end_value, end_parameters)
+                if end_parameters.get('VALUE') == 'DATE' or end <= start:
+                    end = None  # 종일 일정과 길이가 없는 일정은 종료 시간 생략
+            recurrence = None
+            if 'RRULE' in event:
+                recurrence = self.parse_recurrence(event['RRULE'][0][1], event.get('EXDATE', []))
+        except (KeyError, ValueError) as e:
+            self.skipped_count += 1
+            logging.debug(f"VEVENT를 건너뜁니다: {e}")
+            return None
+        title = self.unescape_text(event['SUMMARY'][0][1]) if 'SUMMARY' in event else ''
+        return Schedule(title=title or '(제목 없음)', datetime=start, end_time=end, recurrence=recurrence)
@@ -0,0 +1,160 @@
+# services/interval_tree.py
+import random
+from typing import Iterable, List, Optional, Tuple
+
+class _Node:
+    __slots__ = ('key', 'end', 'priority', 'left', 'right', 'max_end')
+
+    def __init__(self, key: Tuple[int, int], end: int, priority: float):
+        self.key = key  # (시작 epoch, 일정 번호)
+        self.end = end
+        self.priority = priority
+        self.left: Optional['_Node'] = None
+        self.right: Optional['_Node'] = None
+        self.max_end = end  # 서브트리에서 가장 늦은 종료 시각
+
+
+class IntervalTree:
+    """시작 시각 순 treap에 서브트리의 최대 종료 시각을 붙인 구간 트리
+
+    추가·삭제 O(log n), [start, end)와 겹치는 구간 조회 O(log n + k) (k는 겹치는 구간 수).
+    구간은 반열림 [시작, 종료)이므로 앞 일정이 끝나는 시각에 시작하는 일정은 겹치지 않는다.
+    """
+
+    def __init__(self, items: Iterable[Tuple[int, int, int]] = ()):
+        """items: 시작 시각 순으로 정렬된 (시작 epoch, 일정 번호, 종료 epoch)"""
+        self._random = random.Random()
+        self._root: Optional[_Node] = None
+        self._size = 0
+        self._build(items)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _build(self, items: Iterable[Tuple[int, int, int]]) -> None:
+        """정렬된 구간으로 O(n)에 treap 구성 (오른쪽 가장자리 스택으로 만드는 카테시안 트리)"""
+        spine: List[_Node] = []
+        for start, item_id, end in items:
+            node = _Node((start, item_id), end, self._random.random())
+            last = None
+            while spine and spine[-1].priority < node.priority:
+                last = spine.pop()
+            node.left = last
+            if spine:
+                spine[-1].right = node
+            spine.append(node)
+            self._size += 1
+        if spine:
+            self._root = spine[0]
+            self._update_all(self._root)
+
+    @classmethod
+    def _update_all(cls, node: _Node) -> int:
+        """후위 순회로 서브트리 최대 종료 시각 계산 (트리 깊이는 기대값 O(log n))"""
+        max_end = node.end
+        if node.left is not None:
+            max_end = max(max_end, cls._update_all(node.left))
+        if node.right is not None:
+            max_end = max(max_end, cls._update_all(node.right))
+        node.max_end = max_end
+        return max_end
+
+    @staticmethod
+    def _update(node: _Node) -> None:
+        max_end = node.end
+        if node.left is not None and node.left.max_end > max_end:
+            max_end = node.left.max_end
+        if node.right is not None and node.right.max_end > max_end:
+            max_end = node.right.max_end
+        node.max_end = max_end
+
+    @classmethod
+    def _split(cls, node: Optional[_Node], key: Tuple[int, int]) -> Tuple[Optional[_Node], Optional[_Node]]:
+        """key보다 작은 노드와 크거나 같은 노드로 분리"""
+        if node is None:
+            return None, None
+        if node.key < key:
+            node.right, right = cls._split(node.right, key)
+            cls._update(node)
+            return node, right
+        left, node.left = cls._split(node.left, key)
+        cls._update(node)
+        return left, node
+
+    @classmethod
+    def _merge(cls, left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+        """left의 모든 키가 right보다 작을 때 두 트리를 합침"""
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = cls._merge(left.right, right)
+            cls._update(left)
+            return left
+        right.left = cls._merge(left, right.left)
+        cls._update(right)
+        return right
+
+    def insert(self, start: int, item_id: int, end: int) -> None:
+        new = _Node((start, item_id), end, self._random.random())
+
+        def insert(node: Optional[_Node]) -> _Node:
+            if node is None:
+                return new
+            if new.priority > node.priority:
+                new.left, new.right = self._split(node, new.key)
+                self._update(new)
+                return new
+            if new.key < node.key:
+                node.left = insert(node.left)
+            else:
+                node.right = insert(node.right)
+            self._update(node)
+            return node
+
+        self._root = insert(self._root)
+        self._size += 1
+
+    def remove(self, start: int, item_id: int) -> bool:
+        """(시작 시각, 번호)가 같은 구간 삭제 (없으면 False)"""
+        key = (start, item_id)
+        removed = False
+
+        def remove(node: Optional[_Node]) -> Optional[_Node]:
+            nonlocal removed
+            if node is None:
+                return None
+            if key < node.key:
+                node.left = remove(node.left)
+            elif node.key < key:
+                node.right = remove(node.right)
+            else:
+                removed = True
+                return self._merge(node.left, node.right)
+            self._update(node)
+            return node
+
+        self._root = remove(self._root)
+        if removed:
+            self._size -= 1
+        return removed
+
+    def overlapping(self, start: int, end: int) -> List[Tuple[int, int, int]]:
+        """[start, end)와 겹치는 (시작 epoch, 번호, 종료 epoch)를 시작 시각 순으로 반환"""
+        found: List[Tuple[int, int, int]] = []
+
+        def visit(node: Optional[_Node]) -> None:
+            # 서브트리의 모든 구간이 start 이전에 끝나면 통째로 건너뜀
+            if node is None or node.max_end <= start:
+                return
+            visit(node.left)
+            node_start = node.key[0]
+            if node_start >= end:
+                return  # 오른쪽 서브트리는 더 늦게 시작
+            if node.end > start:
+                found.append((node_start, node.key[1], node.end))
+            visit(node.right)
+
+        visit(self._root)
+        return found
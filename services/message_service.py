@@ -1,55 +1,302 @@
-from datetime import datetime, timedelta
-from typing import List, Dict
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Dict, Optional, Tuple
 from models.schedule import Schedule
 from config import Config
+from services.digest_cache import DigestCache
 
 class MessageService:
+    def __init__(self):
+        # (채팅방, 주 시작일, 오늘, 버전) 단위로 렌더링 결과 재사용
+        self.digest_cache = DigestCache()
+
+    @staticmethod
+    def format_date_label(day: date, today: date) -> str:
+        """'YYYY-MM-DD (요일)' 형식 날짜 머리글 (오늘이면 표시 추가)"""
+        label = f"{day.strftime('%Y-%m-%d')} ({Config.WEEKDAY_NAMES[day.weekday()]})"
+        if day == today:
+            label += " ✨ Today"
+        return label
+
+    @staticmethod
+    def format_day_section(day: date, schedules: List[Schedule], today: date) -> str:
+        """하루치 일정 구간 렌더링"""
+        section = f"📌 {MessageService.format_date_label(day, today)}\n"
+        for schedule in schedules:
+            schedule_time = schedule.datetime
+            time_str = schedule_time.strftime('%H:%M')
+            if schedule.end_time:
+                end_time = schedule.end_time
+                time_str = f"{time_str} ~ {end_time.strftime('%H:%M')}"
+            section += f"    ⌚️ {time_str} {schedule.title}\n"
+        return section + "\n"
+
+    @staticmethod
+    def format_week_header(week_start: datetime) -> str:
+        week_end = week_start + timedelta(days=7)
+        return f"📅 {week_start.strftime('%Y-%m-%d')} ~ {week_end.strftime('%Y-%m-%d')} 주간 일정\n\n"
+
     @staticmethod
     def format_weekly_schedule(schedules: List[Schedule], start_date: datetime) -> str:
         """주간 일정을 포맷팅"""
         if not schedules:
             return "이번 주 등록된 일정이 없습니다."
 
-        daily_schedules: Dict[str, List[Schedule]] = {}
+        daily_schedules: Dict[date, List[Schedule]] = {}
         week_start = start_date.astimezone(Config.TIMEZONE)
         week_end = (week_start + timedelta(days=7)).astimezone(Config.TIMEZONE)
         now = datetime.now(Config.TIMEZONE)
-        
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
         # 현재 시간 이후의 일정만 필터링
-        future_schedules = [
-            schedule for schedule in sorted(schedules, key=lambda x: x.datetime)
-            if schedule.datetime.astimezone(Config.TIMEZONE) >= now.replace(hour=0, minute=0, second=0, microsecond=0)
-        ]
-        
-        for schedule in future_schedules:
-            schedule_date = schedule.datetime.astimezone(Config.TIMEZONE)
-            if week_start <= schedule_date <= week_end:
-                date_str = schedule_date.strftime('%Y-%m-%d (%a)')
-                for eng, kor in Config.WEEKDAY_MAP.items():
-                    date_str = date_str.replace(f'({eng})', f'({kor})')
-                
-                # 현재 날짜인 경우 Today 표시 추가
-                if schedule_date.date() == now.date():
-                    date_str += " ✨ Today"
-                
-                if date_str not in daily_schedules:
-                    daily_schedules[date_str] = []
-                daily_schedules[date_str].append(schedule)
+        for schedule in sorted(schedules, key=lambda x: x.datetime):
+            schedule_date = schedule.datetime
+            if schedule_date >= today_start and week_start <= schedule_date <= week_end:
+                daily_schedules.setdefault(schedule_date.date(), []).append(schedule)
 
         if not daily_schedules:
             return "이번 주 예정된 일정이 없습니다."
 
-        message = f"📅 {week_start.strftime('%Y-%m-%d')} ~ {week_end.strftime('%Y-%m-%d')} 주간 일정\n\n"
-        
-        for date, day_schedules in daily_schedules.items():
-            message += f"📌 {date}\n"
-            for schedule in day_schedules:
-                schedule_time = schedule.datetime.astimezone(Config.TIMEZONE)
-                time_str = schedule_time.strftime('%H:%M')
-                if schedule.end_time:
-                    end_time = schedule.end_time.astimezone(Config.TIMEZONE)
-                    time_str = f"{time_str} ~ {end_time.strftime('%H:%M')}"
-                message += f"    ⌚️ {time_str} {schedule.title}\n"
-            message += "\n"
-
-        return message
\ No newline at end of file
+        message = MessageService.format_week_header(week_start)
+        for day, day_schedules in daily_schedules.items():
+            message += MessageService.format_day_section(day, day_schedules, now.date())
+
+        return message
+
+    @staticmethod
+    def format_reminder(schedule: Schedule) -> str:
+        """일정 시작 전 알림 메시지"""
+        start = schedule.datetime
+        time_str = start.strftime('%H:%M')
+        if schedule.end_time:
+            time_str += f" ~ {schedule.end_time.strftime('%H:%M')}"
+        return f"⏰ 곧 시작하는 일정이 있습니다!\n📌 {start.strftime('%Y-%m-%d')} {time_str} {schedule.title}"
+
+    @staticmethod
+    def format_morning_digest(day: date, schedules: List[Schedule]) -> str:
+        """아침 브리핑 (그날 일정 전체)"""
+        return (f"☀️ 좋은 아침입니다! 오늘 일정이 {len(schedules)}개 있습니다.\n\n"
+                f"{MessageService.format_day_section(day, schedules, day)}"
+                "💡 이번 주 일정: /week")
+
+    @staticmethod
+    def format_time_range(schedule: Schedule) -> str:
+        """'HH:MM' 또는 'HH:MM ~ HH:MM'"""
+        time_str = schedule.datetime.strftime('%H:%M')
+        if schedule.end_time:
+            time_str += f" ~ {schedule.end_time.strftime('%H:%M')}"
+        return time_str
+
+    @staticmethod
+    def format_conflict_warning(conflicts: List[Schedule]) -> str:
+        """추가·수정한 일정과 겹치는 일정 안내"""
+        message = f"⚠️ 시간이 겹치는 일정이 {len(conflicts)}개 있습니다:\n"
+        for schedule in conflicts:
+            message += (f"    {schedule.id}. {schedule.datetime.strftime('%Y-%m-%d')} "
+                        f"{MessageService.format_time_range(schedule)} {schedule.title}\n")
+        return message.rstrip('\n')
+
+    @staticmethod
+    def format_conflicts(conflicts: List[Tuple[Schedule, Schedule]], week_start: datetime) -> str:
+        """주간 겹치는 일정 쌍 목록 (나중에 시작하는 일정의 날짜별로 묶음)"""
+        week_end = week_start + timedelta(days=6)
+        period = f"{week_start.strftime('%Y-%m-%d')} ~ {week_end.strftime('%Y-%m-%d')}"
+        if not conflicts:
+            return f"✅ {period} 주에는 겹치는 일정이 없습니다."
+
+        today = datetime.now(Config.TIMEZONE).date()
+        message = f"⚠️ {period} 겹치는 일정 {len(conflicts)}건\n\n"
+        current_date = None
+        for first, second in conflicts:
+            day = second.datetime.date()
+            if day != current_date:
+                if current_date is not None:
+                    message += "\n"
+                current_date = day
+                message += f"📌 {MessageService.format_date_label(day, today)}\n"
+            message += (f"    {first.id}. {MessageService.format_time_range(first)} {first.title}\n"
+                        f"    ↔ {second.id}. {MessageService.format_time_range(second)} {second.title}\n")
+        return message + "\n💡 일정 수정: /edit [번호] [날짜] [시간] [제목]"
+
+    @staticmethod
+    def format_search_results(query: str, schedules: List[Schedule], limit: int) -> str:
+        """검색 결과 목록 (최대 limit개, 일정 번호 포함)"""
+        if not schedules:
+            return f"🔍 '{query}'이(가) 들어간 일정이 없습니다."
+
+        message = f"🔍 '{query}' 검색 결과 {len(schedules)}개\n\n"
+        for schedule in schedules[:limit]:
+            day = schedule.datetime.strftime('%Y-%m-%d')
+            weekday = Config.WEEKDAY_NAMES[schedule.datetime.weekday()]
+            repeat_mark = "🔁 " if schedule.recurrence else ""
+            message += (f"    {schedule.id}. {day} ({weekday}) {MessageService.format_time_range(schedule)} "
+                        f"{repeat_mark}{schedule.title}\n")
+        if len(schedules) > limit:
+            message += f"    … 외 {len(schedules) - limit}개 (from=YYYY-MM-DD to=YYYY-MM-DD로 기간을 좁혀 보세요)\n"
+        return message.rstrip('\n')
+
+    @staticmethod
+    def format_history(schedules: Iterable[Schedule], start: datetime, end: datetime, limit: int) -> str:
+        """보관된 지난 일정 목록 (시작 시각 순 스트림에서 limit개까지만 읽음)"""
+        period = f"{start.strftime('%Y-%m-%d')} ~ {end.strftime('%Y-%m-%d')}"
+        message = ""
+        count = 0
+        current_date = None
+        today = datetime.now(Config.TIMEZONE).date()
+        for schedule in schedules:
+            if count == limit:
+                message += "\n… 이후 일정은 기간을 좁혀 다시 조회해 주세요. (/history [시작일] [종료일])"
+                break
+            day = schedule.datetime.date()
+            if day != current_date:
+                if current_date is not None:
+                    message += "\n"
+                current_date = day
+                message += f"📌 {MessageService.format_date_label(day, today)}\n"
+            repeat_mark = "🔁 " if schedule.recurrence else ""
+            message += f"    ⌚️ {MessageService.format_time_range(schedule)} {repeat_mark}{schedule.title}\n"
+            count += 1
+
+        if not count:
+            return f"🗄 {period} 기간에 보관된 지난 일정이 없습니다."
+        return f"🗄 {period} 지난 일정\n\n" + message.rstrip('\n')
+
+    @staticmethod
+    def format_duration(duration: timedelta) -> str:
+        """'1시간 30분' 형식"""
+        hours, minutes = divmod(int(duration.total_seconds() // 60), 60)
+        parts = []
+        if hours:
+            parts.append(f"{hours}시간")
+        if minutes or not hours:
+            parts.append(f"{minutes}분")
+        return ' '.join(parts)
+
+    @staticmethod
+    def format_free_slots(day: date, slots: List[Tuple[datetime, datetime]], duration: timedelta) -> str:
+        """근무 시간 중 비어 있는 구간 목록"""
+        length = MessageService.format_duration(duration)
+        label = MessageService.format_date_label(day, datetime.now(Config.TIMEZONE).date())
+        if not slots:
+            return f"😢 {label}에는 {length} 이상 비어 있는 시간이 없습니다."
+
+        message = f"🕒 {label} {length} 이상 빈 시간 ({Config.WORK_DAY_START} ~ {Config.WORK_DAY_END})\n\n"
+        for slot_start, slot_end in slots:
+            message += f"    ⌚️ {slot_start.strftime('%H:%M')} ~ {slot_end.strftime('%H:%M')}\n"
+        return message.rstrip('\n')
+
+    # 목록 한 줄의 고정 부분 길이 ('    ' + '. ⌚️ ' + 'HH:MM' + 줄바꿈, 종료 시각 ' ~ HH:MM', 반복 표시 '🔁 ')
+    _LIST_LINE_CHARS = 15
+    _LIST_END_CHARS = 8
+    _LIST_REPEAT_CHARS = 2
+    _LIST_HEADER_CHARS = 35  # '📌 YYYY-MM-DD (요일) ✨ Today' 머리글과 앞 빈 줄
+    _LIST_FRAME_CHARS = 150  # 제목 줄과 아래 도움말
+
+    @classmethod
+    def paginate(cls, schedules: List[Schedule]) -> List[int]:
+        """페이지별 시작 위치 (LIST_PAGE_SIZE개 또는 LIST_PAGE_MAX_CHARS자를 넘지 않도록, 렌더링 없이 길이만 계산)"""
+        budget = Config.LIST_PAGE_MAX_CHARS - cls._LIST_FRAME_CHARS
+        starts = []
+        count = chars = 0
+        current_day = None
+        # 날짜 머리글 수는 어림값이면 되므로 현지 날짜는 첫 일정의 UTC 오프셋으로 계산
+        offset = cls._utc_offset(schedules[0].start_ts) if schedules else 0
+        for index, schedule in enumerate(schedules):
+            line = cls._LIST_LINE_CHARS + len(str(schedule.id)) + len(schedule.title)
+            if schedule.end_ts is not None:
+                line += cls._LIST_END_CHARS
+            if schedule.recurrence is not None:
+                line += cls._LIST_REPEAT_CHARS
+            day = (schedule.start_ts + offset) // 86400
+            if not starts or count >= Config.LIST_PAGE_SIZE or chars + line + cls._LIST_HEADER_CHARS > budget:
+                starts.append(index)
+                count = chars = 0
+                current_day = None
+            if day != current_day:
+                chars += cls._LIST_HEADER_CHARS
+                current_day = day
+            count += 1
+            chars += line
+        return starts
+
+    @staticmethod
+    def _utc_offset(ts: int) -> int:
+        return int(datetime.fromtimestamp(ts, Config.TIMEZONE).utcoffset().total_seconds())
+
+    def format_list_page(self, schedules: List[Schedule], starts: List[int], page: int) -> Tuple[str, int, int]:
+        """/list의 page번째 페이지만 렌더링 (schedules는 시작 시각 순 목록, starts는 paginate 결과)
+
+        (본문, 실제 페이지 번호, 전체 페이지 수) 반환
+        """
+        today = datetime.now(Config.TIMEZONE).date()
+        if not schedules:
+            return "등록된 일정이 없습니다.", 0, 0
+
+        page = min(max(page, 0), len(starts) - 1)
+        end = starts[page + 1] if page + 1 < len(starts) else len(schedules)
+        message = "📋 전체 일정 목록:"
+        if len(starts) > 1:
+            message += f" ({page + 1}/{len(starts)} 페이지, 총 {len(schedules)}개)"
+        message += "\n\n"
+
+        # 목록이 시작 시각 순이므로 날짜가 바뀔 때마다 머리글만 추가 (페이지 첫 줄에도 머리글)
+        current_date = None
+        for schedule in schedules[starts[page]:end]:
+            schedule_date = schedule.datetime
+            if schedule_date.date() != current_date:
+                if current_date is not None:
+                    message += "\n"
+                current_date = schedule_date.date()
+                message += f"📌 {self.format_date_label(current_date, today)}\n"
+            repeat_mark = "🔁 " if schedule.recurrence else ""
+            message += f"    {schedule.id}. ⌚️ {self.format_time_range(schedule)} {repeat_mark}{schedule.title}\n"
+        message += "\n"
+
+        message += "💡 일정 삭제: /delete [번호]\n💡 일정 수정: /edit [번호] [날짜] [시간] [제목]"
+        return message, page, len(starts)
+
+    @staticmethod
+    def _week_key(chat_id: str, week_start: datetime, versions: Tuple[int, ...]) -> tuple:
+        return ('week', chat_id, week_start.date(), datetime.now(Config.TIMEZONE).date(), versions)
+
+    def get_cached_weekly_digest(self, chat_id: str, week_start: datetime,
+                                 versions: Tuple[int, ...]) -> Optional[str]:
+        """같은 버전으로 이미 렌더링한 주간 일정 (없으면 None)"""
+        return self.digest_cache.get(self._week_key(chat_id, week_start, versions))
+
+    def format_weekly_digest(self, chat_id: str, week_start: datetime, versions: Tuple[int, ...],
+                             week: Dict[date, List[Schedule]]) -> str:
+        """주간 일정 렌더링 (format_weekly_schedule과 같은 결과, 바뀌지 않은 날짜 구간은 캐시 재사용)
+
+        versions는 ScheduleService.get_versions(chat_id, 주의 날짜들), week는 날짜별 일정.
+        """
+        today = datetime.now(Config.TIMEZONE).date()
+        week_key = self._week_key(chat_id, week_start, versions)
+        message = self.digest_cache.get(week_key)
+        if message is not None:
+            return message
+
+        chat_version = versions[0]
+        has_schedules = False
+        sections = []
+        for (day, day_schedules), day_version in zip(week.items(), versions[1:]):
+            if day >= today:
+                # 날짜별 구간은 해당 날짜가 바뀌었을 때만 다시 렌더링
+                day_key = ('day', chat_id, day, day == today, chat_version, day_version)
+                section = self.digest_cache.get(day_key)
+                if section is None:
+                    section = self.format_day_section(day, day_schedules, today) if day_schedules else ''
+                    self.digest_cache.put(day_key, section)
+                if section:
+                    sections.append(section)
+                    has_schedules = True
+            elif day_schedules:
+                has_schedules = True
+
+        if sections:
+            message = self.format_week_header(week_start) + ''.join(sections)
+        elif has_schedules:
+            message = "이번 주 예정된 일정이 없습니다."
+        else:
+            message = "이번 주 등록된 일정이 없습니다."
+        self.digest_cache.put(week_key, message)
+        return message
@@ -0,0 +1,270 @@
+# services/metrics_service.py
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# 정렬된 (라벨 이름, 값) 목록
+Labels = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    """고정 구간 누적 히스토그램 (관측 1건당 이진 탐색 한 번)"""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """분위수 추정값 (해당 관측이 속한 구간의 상한, 마지막 구간이면 가장 큰 상한)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return self.buckets[-1]
+
+class MetricsService:
+    """프로세스 안에서 모으는 카운터/히스토그램과 수집 시점에 계산하는 게이지 (Prometheus 텍스트 형식 출력)"""
+
+    LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._buckets: Dict[str, Sequence[float]] = {}
+        # 이름 -> (종류, 설명)
+        self._descriptions: Dict[str, Tuple[str, str]] = {}
+        # 수집할 때 값을 읽어 오는 함수 (숫자, {라벨: 숫자} 또는 Histogram 반환)
+        self._collectors: Dict[str, Callable[[], Union[float, Dict[Labels, float], Histogram]]] = {}
+        self.started_at = time.time()
+
+    @staticmethod
+    def _labels(labels: Dict[str, str]) -> Labels:
+        return tuple(sorted((name, str(value)) for name, value in labels.items())) if labels else ()
+
+    def describe(self, name: str, kind: str, help_text: str, buckets: Optional[Sequence[float]] = None) -> None:
+        """지표 종류(counter | gauge | histogram)와 설명 등록"""
+        self._descriptions[name] = (kind, help_text)
+        if buckets is not None:
+            self._buckets[name] = buckets
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        series = self._counters.setdefault(name, {})
+        key = self._labels(labels)
+        series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        series = self._histograms.setdefault(name, {})
+        key = self._labels(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(self._buckets.get(name, self.LATENCY_BUCKETS))
+        histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """블록 실행 시간을 히스토그램에 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def register_collector(self, name: str, kind: str, help_text: str,
+                           collect: Callable[[], Union[float, Dict[Labels, float], Histogram]]) -> None:
+        """수집할 때마다 호출해 값을 읽는 지표 등록 (이미 다른 곳에서 세고 있는 값용)"""
+        self.describe(name, kind, help_text)
+        self._collectors[name] = collect
+
+    def counter_value(self, name: str, **labels: str) -> float:
+        return self._counters.get(name, {}).get(self._labels(labels), 0.0)
+
+    def histograms(self, name: str) -> Dict[Labels, Histogram]:
+        return self._histograms.get(name, {})
+
+    def track_command(self, command: str, handler: Callable):
+        """명령어 핸들러의 처리 시간과 빠져나온 예외 수 기록"""
+        async def tracked(update, context):
+            started = time.perf_counter()
+            try:
+                return await handler(update, context)
+            except Exception:
+                self.inc('bot_command_errors_total', command=command)
+                raise
+            finally:
+                self.observe('bot_command_duration_seconds', time.perf_counter() - started, command=command)
+        return tracked
+
+    # 출력
+
+    @staticmethod
+    def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+        items = labels + extra
+        if not items:
+            return ''
+        return '{' + ','.join(
+            f'{name}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+            for name, value in items
+        ) + '}'
+
+    @staticmethod
+    def _format_value(value: float) -> str:
+        if value == float('inf'):
+            return '+Inf'
+        return repr(float(value)) if value != int(value) else str(int(value))
+
+    def _render_histogram(self, lines: List[str], name: str, labels: Labels, histogram: Histogram) -> None:
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{self._format_labels(labels, (('le', self._format_value(bound)),))} "
+                         f"{cumulative}")
+        lines.append(f"{name}_bucket{self._format_labels(labels, (('le', '+Inf'),))} {histogram.count}")
+        lines.append(f"{name}_sum{self._format_labels(labels)} {self._format_value(histogram.sum)}")
+        lines.append(f"{name}_count{self._format_labels(labels)} {histogram.count}")
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (0.0.4)"""
+        lines: List[str] = []
+        names = sorted(set(self._counters) | set(self._histograms) | set(self._collectors))
+        for name in names:
+            kind, help_text = self._descriptions.get(name, ('untyped', ''))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(self._counters.get(name, {}).items()):
+                lines.append(f"{name}{self._format_labels(labels)} {self._format_value(value)}")
+            for labels, histogram in sorted(self._histograms.get(name, {}).items()):
+                self._render_histogram(lines, name, labels, histogram)
+            if name in self._collectors:
+                try:
+                    value = self._collectors[name]()
+                except Exception as e:
+                    logging.warning(f"지표 수집 실패 ({name}): {e}")
+                    continue
+                if isinstance(value, Histogram):
+                    self._render_histogram(lines, name, (), value)
+                elif isinstance(value, dict):
+                    for labels, item in sorted(value.items()):
+                        lines.append(f"{name}{self._format_labels(labels)} {self._format_value(item)}")
+                else:
+                    lines.append(f"{name} {self._format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def format_stats(self) -> str:
+        """/stats 명령용 요약"""
+        uptime = int(time.time() - self.started_at)
+        lines = [f"📊 봇 상태 (가동 {uptime // 3600}시간 {uptime % 3600 // 60}분)", ""]
+
+        commands = self.histograms('bot_command_duration_seconds')
+        if commands:
+            lines.append("⌨️ 명령어 (횟수 / p50 / p99 / 오류)")
+            for labels, histogram in sorted(commands.items(), key=lambda item: -item[1].count):
+                command = dict(labels).get('command', '?')
+                errors = int(self.counter_value('bot_command_errors_total', command=command))
+                lines.append(f"  /{command}: {histogram.count}회 / {histogram.quantile(0.5) * 1000:g}ms / "
+                             f"{histogram.quantile(0.99) * 1000:g}ms / {errors}")
+            lines.append("")
+
+        api_calls = self.histograms('telegram_api_duration_seconds')
+        if api_calls:
+            lines.append("📤 텔레그램 API (횟수 / p50 / p99)")
+            for labels, histogram in sorted(api_calls.items(), key=lambda item: -item[1].count):
+                lines.append(f"  {dict(labels).get('method', '?')}: {histogram.count}회 / "
+                             f"{histogram.quantile(0.5) * 1000:g}ms / {histogram.quantile(0.99) * 1000:g}ms")
+            lines.append("")
+
+        writes = self.histograms('storage_write_duration_seconds')
+        if writes:
+            lines.append("💾 저장 (횟수 / 기록량 / p99)")
+            for labels, histogram in sorted(writes.items()):
+                kind = dict(labels).get('kind', '?')
+                written = self.counter_value('storage_write_bytes_total', kind=kind)
+                lines.append(f"  {kind}: {histogram.count}회 / {written / 1024 / 1024:.1f} MiB / "
+                             f"{histogram.quantile(0.99) * 1000:g}ms")
+            lines.append("")
+
+        for name, label in (('schedule_chats_loaded', "메모리에 올린 채팅방"), ('schedules_loaded', "메모리의 일정"),
+                            ('outbound_queue_depth', "발송 대기"), ('reminders_pending', "대기 중인 알림")):
+            if name in self._collectors:
+                try:
+                    lines.append(f"{label}: {self._format_value(self._collectors[name]())}")
+                except Exception:
+                    continue
+        return '\n'.join(lines).rstrip()
+
+
+class MetricsServer:
+    """/metrics 요청에 Prometheus 텍스트 형식으로 응답하는 최소 HTTP 서버 (봇과 같은 이벤트 루프에서 실행)"""
+
+    def __init__(self, metrics_service: MetricsService, host: str, port: int):
+        self.metrics_service = metrics_service
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logging.info(f"지표 엔드포인트: http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # 헤더는 읽고 버림
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b'\r\n', b'\n', b''):
+                pass
+            parts = request_line.decode('latin-1').split()
+            if len(parts) >= 2 and parts[0] == 'GET' and parts[1].split('?')[0] == '/metrics':
+                status, content_type = '200 OK', 'text/plain; version=0.0.4; charset=utf-8'
+                body = self.metrics_service.render().encode('utf-8')
+            else:
+                status, content_type, body = '404 Not Found', 'text/plain; charset=utf-8', b'not found\n'
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode('latin-1') + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+# 서비스 어디서나 같은 지표 모음에 기록 (Config처럼 모듈 전역으로 사용)
+metrics = MetricsService()
+
+metrics.describe('bot_command_duration_seconds', 'histogram', "명령어 핸들러 처리 시간 (답장 발송 포함)")
+metrics.describe('bot_command_errors_total', 'counter', "명령어 처리 중 발생한 예외 수")
+metrics.describe('telegram_api_duration_seconds', 'histogram', "텔레그램 API 호출 시간 (속도 제한 대기 제외)")
+metrics.describe('telegram_api_errors_total', 'counter', "텔레그램 API 호출 실패 수 (재시도 포함)")
+metrics.describe('storage_write_duration_seconds', 'histogram', "저장 파일 기록 시간")
+metrics.describe('storage_write_bytes_total', 'counter', "저장 파일에 기록한 바이트 수")
+metrics.describe('storage_changes_total', 'counter', "저장소에 넘긴 변경 수")
+metrics.describe('storage_apply_duration_seconds', 'histogram', "변경 반영 호출 시간 (백그라운드 저장이면 대기열 추가까지)")
+metrics.describe('storage_load_duration_seconds', 'histogram', "저장소에서 일정을 불러온 시간")
+metrics.describe('storage_flush_duration_seconds', 'histogram', "백그라운드 저장 1회 시간")
+metrics.describe('schedule_chats_evicted_total', 'counter', "오래 쓰지 않아 메모리에서 내린 채팅방 수")
+metrics.describe('broadcast_duration_seconds', 'histogram', "아침 브리핑 전체 발송 시간",
+                 buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600))
+metrics.describe('broadcast_send_duration_seconds', 'histogram', "아침 브리핑 채팅방별 발송 시간 (속도 제한 대기 포함)")
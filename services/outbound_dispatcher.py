@@ -0,0 +1,266 @@
+# services/outbound_dispatcher.py
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+from telegram.error import BadRequest, NetworkError, RetryAfter, TimedOut
+from config import Config
+from services.metrics_service import metrics
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """토큰 1개를 쓰려면 기다려야 하는 시간 (0이면 바로 사용 가능)"""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def consume(self) -> None:
+        self._refill()
+        self.tokens -= 1
+
+    def is_full(self) -> bool:
+        """다시 가득 찼는지 (새로 만든 버킷과 같은 상태)"""
+        self._refill()
+        return self.tokens >= self.capacity
+
+
+class OutboundJob:
+    """발송 대기 중인 API 호출 1건"""
+
+    __slots__ = ('chat_id', 'call', 'coalesce_key', 'future', 'started', 'name', 'metered')
+
+    def __init__(self, chat_id: str, call: Callable[[], Awaitable[Any]], coalesce_key: Optional[str],
+                 future: asyncio.Future, name: str = 'call', metered: bool = False):
+        self.chat_id = chat_id
+        self.call = call
+        self.coalesce_key = coalesce_key
+        self.future = future
+        self.started = False
+        self.name = name  # 지표에 쓸 API 메서드 이름
+        self.metered = metered  # True이면 작업 대신 작업 안의 API 호출마다 토큰 사용 (MeteredBot)
+
+
+class MeteredBot:
+    """API 메서드를 부를 때마다 발송 계층의 토큰을 얻고 호출하는 bot 래퍼 (API를 여러 번 부르는 작업용)"""
+
+    def __init__(self, dispatcher: 'OutboundDispatcher', chat_id: str, bot: Any):
+        self._dispatcher = dispatcher
+        self._chat_id = chat_id
+        self._bot = bot
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        method = getattr(self._bot, name)
+
+        async def call(*args, **kwargs) -> Any:
+            await self._dispatcher._acquire(self._chat_id)
+            return await method(*args, **kwargs)
+        return call
+
+
+class OutboundDispatcher:
+    """CommandHandlers와 bot 사이의 발송 계층 (전체/채팅방별 속도 제한, 재시도, 채팅방별 병합)"""
+
+    # 채팅방 버킷이 이만큼 쌓이면 가득 찬 버킷을 정리 (정리 후 남은 수의 두 배마다 다시 정리)
+    MIN_BUCKET_SWEEP = 1024
+
+    def __init__(self, global_rate: Optional[float] = None, chat_rate: Optional[float] = None,
+                 chat_burst: Optional[int] = None, coalesce_window: Optional[float] = None,
+                 max_retries: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        self.global_rate = global_rate or Config.OUTBOUND_GLOBAL_RATE
+        self.chat_rate = chat_rate or Config.OUTBOUND_CHAT_RATE
+        self.chat_burst = chat_burst or Config.OUTBOUND_CHAT_BURST
+        self.coalesce_window = Config.OUTBOUND_COALESCE_WINDOW if coalesce_window is None else coalesce_window
+        self.max_retries = Config.OUTBOUND_MAX_RETRIES if max_retries is None else max_retries
+        self.clock = clock
+        self.sleep = sleep
+
+        self.global_bucket = TokenBucket(self.global_rate, self.global_rate, clock)
+        self.chat_buckets: Dict[str, TokenBucket] = {}
+        self._bucket_sweep_at = self.MIN_BUCKET_SWEEP
+        self.queues: Dict[str, Deque[OutboundJob]] = {}
+        self.workers: Dict[str, asyncio.Task] = {}
+        # 아직 시작하지 않은 병합 가능 작업 ((chat_id, key) -> 작업)
+        self.coalescing: Dict[Tuple[str, str], OutboundJob] = {}
+        self.blocked_until = 0.0  # RetryAfter로 전체 발송이 멈춘 시각
+
+        self.sent_count = 0
+        self.merged_count = 0
+        self.dropped_count = 0
+        self.retry_count = 0
+        self.max_queue_depth = 0
+
+        metrics.register_collector('outbound_queue_depth', 'gauge', "발송 대기 중인 작업 수", self.queue_depth)
+        metrics.register_collector('outbound_jobs_total', 'counter', "발송 계층 작업 수 (결과별)", lambda: {
+            (('result', 'sent'),): self.sent_count,
+            (('result', 'merged'),): self.merged_count,
+            (('result', 'dropped'),): self.dropped_count,
+            (('result', 'retried'),): self.retry_count,
+        })
+
+    def submit(self, chat_id: str, call: Callable[[], Awaitable[Any]],
+               coalesce_key: Optional[str] = None, name: Optional[str] = None,
+               metered: bool = False) -> asyncio.Future:
+        """발송 작업 등록 (같은 채팅방의 작업은 등록 순서대로 실행)
+
+        coalesce_key가 있으면 coalesce_window 동안 같은 키의 작업을 모아 마지막 것만 실행한다.
+        작업 하나가 API를 여러 번 부르면 metered=True로 등록하고 작업 안에서 metered_bot()으로 호출해
+        호출마다 토큰을 쓴다 (작업 자체는 토큰을 쓰지 않음).
+        """
+        if coalesce_key is not None:
+            pending = self.coalescing.get((chat_id, coalesce_key))
+            if pending is not None and not pending.started:
+                pending.call = call
+                self.merged_count += 1
+                return pending.future
+
+        loop = asyncio.get_running_loop()
+        job = OutboundJob(chat_id, call, coalesce_key, loop.create_future(),
+                          name or getattr(call, '__name__', 'call'), metered)
+        if coalesce_key is not None:
+            self.coalescing[(chat_id, coalesce_key)] = job
+            loop.call_later(self.coalesce_window, self._enqueue, job)
+        else:
+            self._enqueue(job)
+        return job.future
+
+    async def call(self, chat_id: str, func: Callable[..., Awaitable[Any]], /, *args, **kwargs) -> Any:
+        """API 호출을 순서대로 발송하고 결과 반환 (bot.send_message(chat_id=...)처럼 키워드 인자로 chat_id를 넘겨도 됨)"""
+        return await self.submit(chat_id, lambda: func(*args, **kwargs), name=getattr(func, '__name__', None))
+
+    def metered_bot(self, chat_id: str, bot: Any) -> MeteredBot:
+        """호출마다 chat_id의 토큰을 쓰는 bot (metered=True로 등록한 작업 안에서 사용)"""
+        return MeteredBot(self, chat_id, bot)
+
+    def _enqueue(self, job: OutboundJob) -> None:
+        queue = self.queues.setdefault(job.chat_id, deque())
+        queue.append(job)
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth())
+        if job.chat_id not in self.workers:
+            self.workers[job.chat_id] = asyncio.create_task(self._drain(job.chat_id))
+
+    async def _drain(self, chat_id: str) -> None:
+        """채팅방 대기열을 순서대로 발송"""
+        queue = self.queues[chat_id]
+        try:
+            while queue:
+                job = queue.popleft()
+                job.started = True
+                if job.coalesce_key is not None:
+                    self.coalescing.pop((chat_id, job.coalesce_key), None)
+                await self._run(job)
+        finally:
+            del self.workers[chat_id]
+            if not queue:
+                del self.queues[chat_id]
+
+    async def _acquire(self, chat_id: str) -> None:
+        """채팅방 및 전체 토큰을 얻을 때까지 대기"""
+        chat_bucket = self.chat_buckets.get(chat_id)
+        if chat_bucket is None:
+            if len(self.chat_buckets) >= self._bucket_sweep_at:
+                self._prune_chat_buckets()
+            chat_bucket = self.chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst, self.clock)
+        while True:
+            wait = max(self.blocked_until - self.clock(), chat_bucket.delay(), self.global_bucket.delay())
+            if wait <= 0:
+                break
+            await self.sleep(wait)
+        chat_bucket.consume()
+        self.global_bucket.consume()
+
+    def _prune_chat_buckets(self) -> None:
+        """한동안 보내지 않아 다시 가득 찬 채팅방 버킷은 새로 만들 때와 같으므로 버림 (발송 중인 채팅방은 유지)"""
+        for chat_id in [chat_id for chat_id, bucket in self.chat_buckets.items()
+                        if chat_id not in self.workers and bucket.is_full()]:
+            del self.chat_buckets[chat_id]
+        self._bucket_sweep_at = max(self.MIN_BUCKET_SWEEP, 2 * len(self.chat_buckets))
+
+    async def _run(self, job: OutboundJob) -> None:
+        for attempt in range(self.max_retries + 1):
+            if not job.metered:
+                await self._acquire(job.chat_id)
+            started = time.perf_counter()
+            try:
+                result = await job.call()
+            except RetryAfter as e:
+                self._record_call(job, started, e)
+                retry_after = e.retry_after
+                if isinstance(retry_after, timedelta):
+                    retry_after = retry_after.total_seconds()
+                self.blocked_until = max(self.blocked_until, self.clock() + float(retry_after))
+                error = e
+            except BadRequest as e:
+                # NetworkError의 하위 클래스지만 다시 보내도 같은 결과이므로 재시도하지 않음
+                self._record_call(job, started, e)
+                self.dropped_count += 1
+                job.future.set_exception(e)
+                return
+            except (TimedOut, NetworkError) as e:
+                self._record_call(job, started, e)
+                await self.sleep(min(2 ** attempt, 30))
+                error = e
+            except Exception as e:
+                self._record_call(job, started, e)
+                self.dropped_count += 1
+                job.future.set_exception(e)
+                return
+            else:
+                self._record_call(job, started)
+                self.sent_count += 1
+                job.future.set_result(result)
+                return
+            self.retry_count += 1
+
+        logging.warning(f"발송 재시도 초과로 버립니다 (chat {job.chat_id}): {error}")
+        self.dropped_count += 1
+        job.future.set_exception(error)
+
+    @staticmethod
+    def _record_call(job: OutboundJob, started: float, error: Optional[Exception] = None) -> None:
+        metrics.observe('telegram_api_duration_seconds', time.perf_counter() - started, method=job.name)
+        if error is not None:
+            metrics.inc('telegram_api_errors_total', method=job.name, error=type(error).__name__)
+
+    async def stop(self) -> None:
+        """종료 전에 대기 중인 발송(병합 대기 포함)을 마저 처리"""
+        pending = [job.future for job in self.coalescing.values()]
+        pending += [job.future for queue in self.queues.values() for job in queue]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if self.workers:
+            await asyncio.gather(*self.workers.values(), return_exceptions=True)
+        logging.info(f"발송 계층 통계: {self.stats()}")
+
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self.queues.values()) + sum(
+            1 for job in self.coalescing.values() if not job.started
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'queue_depth': self.queue_depth(),
+            'max_queue_depth': self.max_queue_depth,
+            'active_chats': len(self.workers),
+            'chat_buckets': len(self.chat_buckets),
+            'sent': self.sent_count,
+            'merged': self.merged_count,
+            'dropped': self.dropped_count,
+            'retries': self.retry_count,
+        }
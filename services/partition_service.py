@@ -0,0 +1,149 @@
+# services/partition_service.py
+import json
+import logging
+import os
+import shutil
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+from config import Config
+from models.schedule import Schedule
+from services.pinned_digest_service import PinnedDigestService
+from services.storage_factory import create_storage_service, default_storage_path
+
+class PartitionService:
+    """채팅방을 작업 프로세스(파티션)에 나누고, 프로세스 수가 바뀌면 저장된 데이터를 새 파티션으로 옮김
+
+    파티션 i/n의 파일은 원래 경로의 디렉토리 아래 part-i-of-n/에 둔다 (저널 디렉토리 등도 파티션별로 분리).
+    파티션이 1개면 원래 경로를 그대로 쓰므로 한 프로세스 모드의 데이터가 곧 1개짜리 파티션이다.
+    """
+
+    def __init__(self, count: int, backend: Optional[str] = None, state_path: Optional[str] = None):
+        self.count = max(count, 1)
+        self.backend = backend or Config.STORAGE_BACKEND
+        self.state_path = state_path or Config.PARTITION_STATE_PATH
+        # 작업 프로세스에서 Config 경로를 바꾸기 전의 원래 경로
+        self.storage_path = default_storage_path(self.backend)
+        self.reminder_state_path = Config.REMINDER_STATE_PATH
+        self.pinned_digest_path = Config.PINNED_DIGEST_PATH
+        self.broadcast_state_path = Config.BROADCAST_STATE_PATH
+
+    @staticmethod
+    def partition_of(chat_id, count: int) -> int:
+        """채팅방이 속한 파티션 번호 (프로세스가 달라도 같은 값이 나오도록 crc32 사용)"""
+        return zlib.crc32(str(chat_id).encode('utf-8')) % count
+
+    @staticmethod
+    def partition_path(path: str, index: int, count: int) -> str:
+        if count == 1:
+            return path
+        return os.path.join(os.path.dirname(path), f"part-{index}-of-{count}", os.path.basename(path))
+
+    def paths(self, index: int, count: Optional[int] = None) -> Tuple[str, str, str]:
+        """파티션의 (저장소, 알림 기록, 고정 메시지) 경로"""
+        count = count or self.count
+        return (
+            self.partition_path(self.storage_path, index, count),
+            self.partition_path(self.reminder_state_path, index, count),
+            self.partition_path(self.pinned_digest_path, index, count),
+        )
+
+    def use_partition(self, index: int) -> str:
+        """작업 프로세스가 자기 파티션 파일을 쓰도록 설정하고 저장소 경로 반환"""
+        storage_path, reminder_state_path, pinned_digest_path = self.paths(index)
+        Config.REMINDER_STATE_PATH = reminder_state_path
+        Config.PINNED_DIGEST_PATH = pinned_digest_path
+        # 아침 브리핑 진행 기록은 그날만 쓰이므로 재분배 때 옮기지 않음
+        Config.BROADCAST_STATE_PATH = self.partition_path(self.broadcast_state_path, index, self.count)
+        return storage_path
+
+    def stored_count(self) -> int:
+        """마지막으로 데이터를 나눠 둔 파티션 수 (기록이 없으면 한 프로세스 모드의 1개)"""
+        return int(self._read_json(self.state_path, {'count': 1})['count'])
+
+    def rebalance(self) -> bool:
+        """저장된 파티션 수가 설정과 다르면 모든 데이터를 읽어 새 파티션으로 다시 나눔
+
+        새 파티션을 모두 쓴 뒤에 파티션 수 기록을 바꾸므로, 도중에 멈추면 다음 시작 때 처음부터 다시 한다.
+        """
+        old_count = self.stored_count()
+        if old_count == self.count:
+            return False
+
+        schedules: Dict[str, List[Schedule]] = {}
+        sent: List[list] = []
+        message_ids: Dict[str, int] = {}
+        for index in range(old_count):
+            storage_path, reminder_state_path, pinned_digest_path = self.paths(index, old_count)
+            storage = create_storage_service(self.backend, storage_path)
+            schedules.update(storage.load_schedules())
+            storage.close()
+            sent.extend(self._read_json(reminder_state_path, {'sent': []})['sent'])
+            message_ids.update(PinnedDigestService(pinned_digest_path).message_ids)
+
+        # 이전에 멈춘 재분배가 남긴 파일 정리
+        self._remove_layout(self.count)
+        for index in range(self.count):
+            storage_path, reminder_state_path, pinned_digest_path = self.paths(index)
+            os.makedirs(os.path.dirname(storage_path) or '.', exist_ok=True)
+            storage = create_storage_service(self.backend, storage_path)
+            storage.save_schedules({
+                chat_id: chat_schedules for chat_id, chat_schedules in schedules.items()
+                if self.partition_of(chat_id, self.count) == index
+            })
+            storage.close()
+
+            # 보낸 알림 기록 ([chat_id, 일정 번호, 시작 epoch] 목록)은 형식 그대로 나눔
+            self._write_json(reminder_state_path, {
+                'sent': [key for key in sent if self.partition_of(key[0], self.count) == index]
+            })
+            pinned_digest_service = PinnedDigestService(pinned_digest_path)
+            pinned_digest_service.message_ids = {
+                chat_id: message_id for chat_id, message_id in message_ids.items()
+                if self.partition_of(chat_id, self.count) == index
+            }
+            pinned_digest_service.save()
+
+        self._write_json(self.state_path, {'count': self.count})
+
+        self._remove_layout(old_count)
+        logging.info(f"파티션 재분배 완료: {old_count}개 → {self.count}개 "
+                     f"(채팅방 {len(schedules)}개, 일정 {sum(len(s) for s in schedules.values())}개)")
+        return True
+
+    @staticmethod
+    def _read_json(path: str, default: Dict) -> Dict:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default
+
+    @staticmethod
+    def _write_json(path: str, data: Dict) -> None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def _remove_layout(self, count: int) -> None:
+        """count개로 나눠 둔 파티션 파일 삭제"""
+        if count > 1:
+            directories: Set[str] = {
+                os.path.dirname(path) for index in range(count) for path in self.paths(index, count)
+            }
+            for directory in directories:
+                shutil.rmtree(directory, ignore_errors=True)
+            return
+
+        # 한 프로세스 모드의 파일 (저장소 종류별 부속 파일 포함)
+        paths = [self.storage_path, f"{self.storage_path}.journal", f"{self.storage_path}-wal",
+                 f"{self.storage_path}-shm", self.reminder_state_path, self.pinned_digest_path,
+                 self.broadcast_state_path]
+        if self.backend == 'json':
+            paths.append(os.path.join(os.path.dirname(self.storage_path), 'journal'))
+        for path in paths:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,108 @@
+# services/pinned_digest_service.py
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Optional
+from telegram.error import BadRequest
+from config import Config
+
+class PinnedDigestService:
+    """채팅방마다 고정된 주간 일정 메시지를 기억해 두고 내용이 바뀔 때만 수정"""
+
+    def __init__(self, file_path: Optional[str] = None):
+        self.file_path = file_path or Config.PINNED_DIGEST_PATH
+        self.message_ids: Dict[str, int] = self.load()
+        # 마지막으로 반영한 본문 해시 (재시작 후 첫 수정은 텔레그램이 변경 여부를 판단)
+        self.digest_hashes: Dict[str, str] = {}
+        # 새로 보냈지만 아직 고정하지 못한 채팅방 -> 고정 해제할 이전 메시지 번호 (RetryAfter 등으로 재시도할 때 마저 고정)
+        self.pending_pins: Dict[str, Optional[int]] = {}
+
+        self.edit_count = 0
+        self.skip_count = 0
+        self.send_count = 0
+
+    def load(self) -> Dict[str, int]:
+        """저장된 고정 메시지 번호 불러오기"""
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                return {chat_id: int(message_id) for chat_id, message_id in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, ValueError):
+            logging.warning(f"{self.file_path} 파일을 읽을 수 없어 고정 메시지 정보를 초기화합니다.")
+            return {}
+
+    def save(self) -> None:
+        """고정 메시지 번호 저장 (새 메시지를 고정했을 때만 호출)"""
+        os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
+        tmp_path = f"{self.file_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.message_ids, f)
+        os.replace(tmp_path, self.file_path)
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    async def refresh(self, bot, chat_id: str, text: str) -> None:
+        """고정된 주간 일정 갱신 (변경 없으면 생략, 가능하면 수정, 안 되면 새로 보내고 고정)
+
+        BadRequest가 아닌 API 오류(RetryAfter, NetworkError)는 발송 계층이 다시 시도하도록 그대로 전달한다.
+        """
+        if chat_id in self.pending_pins:
+            await self._pin(bot, chat_id, self.pending_pins[chat_id])
+
+        digest_hash = self.hash_text(text)
+        if self.digest_hashes.get(chat_id) == digest_hash:
+            self.skip_count += 1
+            return
+
+        message_id = self.message_ids.get(chat_id)
+        if message_id is not None:
+            try:
+                await bot.edit_message_text(chat_id=chat_id, message_id=message_id, text=text)
+                self.digest_hashes[chat_id] = digest_hash
+                self.edit_count += 1
+                return
+            except BadRequest as e:
+                if 'not modified' in str(e).lower():
+                    self.digest_hashes[chat_id] = digest_hash
+                    self.skip_count += 1
+                    return
+                # 메시지가 삭제되었거나 수정할 수 없으면 새로 보내서 고정
+                logging.info(f"고정 메시지 수정 실패, 새로 고정합니다: {e}")
+
+        sent_message = await bot.send_message(chat_id=chat_id, text=text)
+        self.send_count += 1
+        self.message_ids[chat_id] = sent_message.message_id
+        self.digest_hashes[chat_id] = digest_hash
+        self.pending_pins[chat_id] = message_id
+        self.save()
+        await self._pin(bot, chat_id, message_id)
+
+    async def _pin(self, bot, chat_id: str, old_message_id: Optional[int]) -> None:
+        """새로 보낸 주간 일정 메시지를 고정하고 이전 메시지 고정 해제"""
+        if old_message_id is not None:
+            try:
+                await bot.unpin_chat_message(chat_id=chat_id, message_id=old_message_id)
+            except BadRequest as unpin_error:
+                logging.debug(f"이전 고정 메시지 해제 실패: {unpin_error}")
+
+        try:
+            await bot.pin_chat_message(
+                chat_id=chat_id,
+                message_id=self.message_ids[chat_id],
+                disable_notification=True
+            )
+        except BadRequest as pin_error:
+            logging.warning(f"메시지 고정 실패: {pin_error}")
+        del self.pending_pins[chat_id]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'pinned_chats': len(self.message_ids),
+            'edits': self.edit_count,
+            'skipped': self.skip_count,
+            'sends': self.send_count,
+        }
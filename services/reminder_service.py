@@ -0,0 +1,207 @@
+# services/reminder_service.py
+import asyncio
+import heapq
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Iterable, List, Optional, Set, Tuple
+from config import Config
+from models.schedule import Schedule
+from services.metrics_service import metrics
+
+# (chat_id, 일정 번호, 시작 epoch) - 시작 시각이 바뀌면 다른 알림으로 취급
+ReminderKey = Tuple[str, int, float]
+
+class ReminderService:
+    """전체 채팅방의 알림 시각을 최소 힙 하나로 관리하고, 단일 작업이 시간 순서대로 발송"""
+
+    # 봇이 꺼져 있던 동안 놓친 알림은 시작 후 이 시간(초)까지만 보냄
+    MISSED_GRACE = 300
+
+    def __init__(self, lead_minutes: Optional[int] = None, state_path: Optional[str] = None,
+                 concurrency: Optional[int] = None, clock: Callable[[], float] = time.time):
+        self.lead_seconds = 60 * (Config.REMINDER_LEAD_MINUTES if lead_minutes is None else lead_minutes)
+        self.state_path = state_path or Config.REMINDER_STATE_PATH
+        self.concurrency = concurrency or Config.REMINDER_CONCURRENCY
+        self.clock = clock
+
+        self._heap: List[Tuple[float, str, int, float]] = []  # (알림 epoch, chat_id, 일정 번호, 시작 epoch)
+        self.sent: Set[ReminderKey] = self.load()  # 이미 보낸 알림 (재시작 시 다시 보내지 않음)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.sent_count = 0
+        self.failed_count = 0
+        self.stale_count = 0
+
+        metrics.register_collector('reminders_pending', 'gauge', "대기 중인 알림 수", lambda: len(self._heap))
+        metrics.register_collector('reminders_total', 'counter', "처리한 알림 수 (결과별)", lambda: {
+            (('result', 'sent'),): self.sent_count,
+            (('result', 'failed'),): self.failed_count,
+            (('result', 'stale'),): self.stale_count,
+        })
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def load(self) -> Set[ReminderKey]:
+        """보낸 알림 기록 불러오기"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return {(chat_id, schedule_id, start_ts) for chat_id, schedule_id, start_ts in json.load(f)['sent']}
+        except FileNotFoundError:
+            return set()
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            logging.warning(f"{self.state_path} 파일을 읽을 수 없어 알림 기록을 초기화합니다.")
+            return set()
+
+    def save(self) -> None:
+        """보낸 알림 기록 저장 (시작 시각이 지난 기록은 정리)"""
+        cutoff = self.clock() - self.MISSED_GRACE
+        self.sent = {key for key in self.sent if key[2] >= cutoff}
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'sent': sorted(self.sent)}))
+        os.replace(tmp_path, self.state_path)
+
+    def _next_unsent(self, chat_id: str, series: Schedule, after_ts: float) -> Optional[Schedule]:
+        """반복 일정에서 after_ts 이후(포함) 아직 알림을 보내지 않은 첫 회차"""
+        occurrence = series.next_occurrence(datetime.fromtimestamp(after_ts, Config.TIMEZONE))
+        while occurrence is not None and (chat_id, series.id, occurrence.start_ts) in self.sent:
+            occurrence = series.next_occurrence(occurrence.datetime + timedelta(seconds=1))
+        return occurrence
+
+    def push(self, chat_id: str, schedule: Schedule) -> None:
+        """일정의 알림 등록 (반복 일정은 다음 회차 하나만, 수정·삭제된 일정의 기존 항목은 발송 시점에 걸러냄)"""
+        if schedule.recurrence is not None:
+            schedule = self._next_unsent(chat_id, schedule, self.clock() - self.MISSED_GRACE)
+            if schedule is None:
+                return
+        start_ts = schedule.start_ts
+        if start_ts + self.MISSED_GRACE < self.clock() or (chat_id, schedule.id, start_ts) in self.sent:
+            return
+        entry = (start_ts - self.lead_seconds, chat_id, schedule.id, start_ts)
+        heapq.heappush(self._heap, entry)
+        # 대기 중인 다음 알림보다 빠르면 발송 작업을 깨움
+        if self._wakeup is not None and self._heap[0] is entry:
+            self._wakeup.set()
+
+    def rebuild(self, schedules: Iterable[Tuple[str, Schedule]]) -> None:
+        """저장소의 (chat_id, 일정) 목록으로 힙을 한 번에 다시 구성"""
+        now = self.clock()
+        lead = self.lead_seconds
+        sent = self.sent
+        heap = []
+        for chat_id, schedule in schedules:
+            if schedule.recurrence is not None:
+                schedule = self._next_unsent(chat_id, schedule, now - self.MISSED_GRACE)
+                if schedule is None:
+                    continue
+            start_ts = schedule.start_ts
+            if start_ts + self.MISSED_GRACE >= now and (chat_id, schedule.id, start_ts) not in sent:
+                heap.append((start_ts - lead, chat_id, schedule.id, start_ts))
+        heapq.heapify(heap)
+        self._heap = heap
+
+    def next_due(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, lookup: Callable[[str, int], Optional[Schedule]],
+                now_ts: float) -> List[Tuple[str, Schedule]]:
+        """now_ts까지 알림 시각이 된 일정 중 아직 유효한 것만 꺼냄"""
+        due = []
+        seen = set()
+        heap = self._heap
+        while heap and heap[0][0] <= now_ts:
+            _, chat_id, schedule_id, start_ts = heapq.heappop(heap)
+            key = (chat_id, schedule_id, start_ts)
+            if key in seen or key in self.sent:
+                self.stale_count += 1
+                continue
+            schedule = lookup(chat_id, schedule_id)
+            if schedule is not None and schedule.recurrence is not None:
+                schedule = self._advance_series(chat_id, schedule, start_ts, now_ts)
+            # 삭제되었거나 시작 시각이 바뀐 일정, 너무 늦은 알림은 건너뜀
+            if schedule is None or schedule.start_ts != start_ts or start_ts + self.MISSED_GRACE < now_ts:
+                self.stale_count += 1
+                continue
+            seen.add(key)
+            due.append((chat_id, schedule))
+        return due
+
+    def _advance_series(self, chat_id: str, series: Schedule, start_ts: float, now_ts: float) -> Optional[Schedule]:
+        """꺼낸 항목이 반복 일정의 실제 회차이면 그 회차를 반환하고 다음 회차 알림을 등록"""
+        occurrence = series.next_occurrence(datetime.fromtimestamp(start_ts, Config.TIMEZONE))
+        if occurrence is None or occurrence.start_ts != start_ts:
+            return None  # 규칙이 바뀌어 더 이상 없는 회차
+        following = self._next_unsent(chat_id, series, max(start_ts + 1, now_ts - self.MISSED_GRACE))
+        if following is not None:
+            following_ts = following.start_ts
+            heapq.heappush(self._heap, (following_ts - self.lead_seconds, chat_id, series.id, following_ts))
+        return occurrence
+
+    async def dispatch_due(self, send: Callable[[str, Schedule], Awaitable[None]],
+                           lookup: Callable[[str, int], Optional[Schedule]], now_ts: float) -> int:
+        """알림 시각이 된 일정을 동시 발송 수를 제한해 보내고 보낸 기록 저장"""
+        due = self.pop_due(lookup, now_ts)
+        if not due:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send_one(chat_id: str, schedule: Schedule) -> None:
+            async with semaphore:
+                try:
+                    await send(chat_id, schedule)
+                except Exception as e:
+                    self.failed_count += 1
+                    logging.warning(f"알림 발송 실패 (chat {chat_id}, 번호 {schedule.id}): {e}")
+                    return
+                self.sent.add((chat_id, schedule.id, schedule.start_ts))
+                self.sent_count += 1
+
+        await asyncio.gather(*(send_one(chat_id, schedule) for chat_id, schedule in due))
+        self.save()
+        return len(due)
+
+    async def start(self, send: Callable[[str, Schedule], Awaitable[None]],
+                    lookup: Callable[[str, int], Optional[Schedule]]) -> None:
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(send, lookup))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logging.info(f"알림 통계: {self.stats()}")
+
+    async def _run(self, send: Callable[[str, Schedule], Awaitable[None]],
+                   lookup: Callable[[str, int], Optional[Schedule]]) -> None:
+        """다음 알림 시각까지 잠들었다가 깨어나서 발송 (더 빠른 알림이 등록되면 바로 깨어남)"""
+        while True:
+            try:
+                await self.dispatch_due(send, lookup, self.clock())
+            except Exception as e:
+                logging.error(f"알림 발송 중 오류 발생: {e}")
+            next_due = self.next_due()
+            timeout = None if next_due is None else max(next_due - self.clock(), 0)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            'pending': len(self._heap),
+            'sent': self.sent_count,
+            'failed': self.failed_count,
+            'stale': self.stale_count,
+        }
@@ -0,0 +1,118 @@
+# services/schedule_index.py
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from config import Config
+from models.schedule import Schedule
+from services.interval_tree import IntervalTree
+from services.title_index import TitleIndex
+
+class ChatScheduleIndex:
+    """한 채팅방의 일정을 시작 시각 순으로 유지하는 인덱스 (ID로 조회)
+
+    반복 일정은 첫 회차 시각으로 정렬할 수 없으므로 따로 보관하고, 조회하는 쪽에서 회차를 펼친다.
+    """
+
+    def __init__(self, schedules: Iterable[Schedule] = ()):
+        self._keys: List[Tuple[float, int]] = []  # 단일 일정의 (시작 epoch, id) 정렬 목록
+        self._by_id: Dict[int, Schedule] = {}
+        self._series: Dict[int, Schedule] = {}  # 반복 일정
+        self._intervals: Optional[IntervalTree] = None  # 겹침 조회용 구간 트리 (처음 조회할 때 만듦)
+        self._titles: Optional[TitleIndex] = None  # 제목 검색용 역색인 (처음 검색할 때 만듦)
+        self.next_id = 1
+        for schedule in schedules:
+            self.add(schedule)
+
+    @staticmethod
+    def _key(schedule: Schedule) -> Tuple[float, int]:
+        return (schedule.start_ts, schedule.id)
+
+    @staticmethod
+    def busy_end(schedule: Schedule) -> int:
+        """겹침 판단에 쓰는 종료 epoch (종료 시간이 없으면 DEFAULT_EVENT_MINUTES분짜리로 봄)"""
+        if schedule.end_ts is not None and schedule.end_ts > schedule.start_ts:
+            return schedule.end_ts
+        return schedule.start_ts + Config.DEFAULT_EVENT_MINUTES * 60
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Schedule]:
+        """단일 일정을 시작 시각 순으로, 이어서 반복 일정을 순회"""
+        by_id = self._by_id
+        yield from (by_id[schedule_id] for _, schedule_id in self._keys)
+        yield from self._series.values()
+
+    def __contains__(self, schedule_id: int) -> bool:
+        return schedule_id in self._by_id
+
+    def get(self, schedule_id: int) -> Optional[Schedule]:
+        return self._by_id.get(schedule_id)
+
+    def add(self, schedule: Schedule) -> Schedule:
+        """일정 추가 (ID가 없으면 새로 부여)"""
+        if schedule.id is None:
+            schedule.id = self.next_id
+        self.next_id = max(self.next_id, schedule.id + 1)
+        self._by_id[schedule.id] = schedule
+        if self._titles is not None:
+            self._titles.add(schedule.id, schedule.title)
+        if schedule.recurrence is not None:
+            self._series[schedule.id] = schedule
+        else:
+            insort(self._keys, self._key(schedule))
+            if self._intervals is not None:
+                self._intervals.insert(schedule.start_ts, schedule.id, self.busy_end(schedule))
+        return schedule
+
+    def remove(self, schedule_id: int) -> Optional[Schedule]:
+        """ID로 일정 삭제"""
+        schedule = self._by_id.pop(schedule_id, None)
+        if schedule is not None:
+            if self._titles is not None:
+                self._titles.remove(schedule_id)
+            if schedule.recurrence is not None:
+                del self._series[schedule_id]
+            else:
+                pos = bisect_left(self._keys, self._key(schedule))
+                del self._keys[pos]
+                if self._intervals is not None:
+                    self._intervals.remove(schedule.start_ts, schedule_id)
+        return schedule
+
+    def replace(self, schedule_id: int, new_schedule: Schedule) -> Optional[Schedule]:
+        """같은 ID를 유지한 채 일정 교체"""
+        old_schedule = self.remove(schedule_id)
+        if old_schedule is None:
+            return None
+        new_schedule.id = schedule_id
+        self.add(new_schedule)
+        return old_schedule
+
+    def series(self) -> List[Schedule]:
+        """반복 일정 목록"""
+        return list(self._series.values())
+
+    def range(self, start_ts: float, end_ts: float) -> List[Schedule]:
+        """시작 시각이 [start_ts, end_ts] 안에 있는 단일 일정 (반복 일정 제외)"""
+        lo = bisect_left(self._keys, (start_ts,))
+        hi = bisect_right(self._keys, (end_ts, float('inf')))
+        by_id = self._by_id
+        return [by_id[schedule_id] for _, schedule_id in self._keys[lo:hi]]
+
+    def overlapping(self, start_ts: int, end_ts: int) -> List[Schedule]:
+        """[start_ts, end_ts)와 겹치는 단일 일정 (반복 일정 제외, 시작 시각 순)"""
+        by_id = self._by_id
+        if self._intervals is None:
+            self._intervals = IntervalTree(
+                (start, schedule_id, self.busy_end(by_id[schedule_id])) for start, schedule_id in self._keys
+            )
+        return [by_id[schedule_id] for _, schedule_id, _ in self._intervals.overlapping(start_ts, end_ts)]
+
+    def search(self, query: str) -> List[Schedule]:
+        """제목에 검색어가 들어 있는 일정 (단일 일정은 시작 시각 순, 이어서 반복 일정)"""
+        by_id = self._by_id
+        if self._titles is None:
+            self._titles = TitleIndex((schedule_id, schedule.title) for schedule_id, schedule in by_id.items())
+        found = [by_id[schedule_id] for schedule_id in self._titles.search(query)]
+        found.sort(key=lambda schedule: (schedule.recurrence is not None, schedule.start_ts, schedule.id))
+        return found
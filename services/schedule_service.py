@@ -1,144 +1,444 @@
-from datetime import datetime
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import date, datetime, time, timedelta
+import heapq
+import itertools
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from config import Config
 from models.schedule import Schedule
 from services.date_service import DateService
-from services.storage_service import StorageService
+from services.agenda_index import AgendaIndex
+from services.archive_service import ArchiveService
+from services.base_storage_service import BaseStorageService
+from services.expiry_service import ExpiryService
+from services.metrics_service import Histogram, metrics
+from services.reminder_service import ReminderService
+from services.schedule_index import ChatScheduleIndex
 
 class ScheduleService:
-    def __init__(self, storage_service: StorageService):
+    def __init__(self, storage_service: BaseStorageService, archive_service: Optional[ArchiveService] = None):
         self.storage_service = storage_service
-        self.schedules = self.storage_service.load_schedules()
+        # 정리한 지난 일정은 버리지 않고 압축 보관소로 옮김
+        self.archive_service = archive_service or ArchiveService()
+        # 채팅방별로 시작 시각 순 인덱스 유지 (지연 로딩 저장소는 접근한 채팅방만 최근에 쓴 순서로 메모리에 올림)
+        self.schedules: Dict[str, ChatScheduleIndex] = OrderedDict()
+        if not storage_service.lazy_load:
+            with metrics.timer('storage_load_duration_seconds', scope='all'):
+                self.schedules = {
+                    chat_id: ChatScheduleIndex(chat_schedules)
+                    for chat_id, chat_schedules in self.storage_service.load_schedules().items()
+                }
+        # 렌더링 캐시 무효화용 버전 (채팅방 전체 / 채팅방의 날짜별)
+        self._chat_versions: Dict[str, int] = {}
+        self._day_versions: Dict[Tuple[str, date], int] = {}
+        self._revisions: Dict[str, int] = {}  # 채팅방의 모든 변경마다 올라가는 번호
+
+        # 종료 시각 힙으로 지난 일정만 골라 만료
+        self.expiry_service = ExpiryService()
+        self.expiry_service.rebuild(self.schedules)
+        # 날짜별 일정이 있는 채팅방 (아침 브리핑 대상, 아래에서 오늘 이후 일정으로 채움)
+        self.agenda_index = AgendaIndex()
         self.cleanup_old_schedules()  # 초기화할 때 지난 일정 정리
 
-    def cleanup_old_schedules(self) -> None:
-        """지난 일정 정리"""
+        # 다가오는 일정 알림과 날짜별 색인 (저장소를 한 번 훑어서 함께 구성, 이미 보낸 알림은 제외)
+        self.reminder_service = ReminderService()
+        self.reminder_service.rebuild(self._index_agenda(self._iter_upcoming(self._today_start())))
+
+        metrics.register_collector('schedule_chats_loaded', 'gauge', "메모리에 올린 채팅방 수",
+                                   lambda: len(self.schedules))
+        metrics.register_collector('schedules_loaded', 'gauge', "메모리에 올린 일정 수",
+                                   lambda: sum(len(chat_schedules) for chat_schedules in self.schedules.values()))
+        metrics.register_collector('schedules_per_chat', 'histogram', "메모리에 올린 채팅방별 일정 수",
+                                   self._schedules_per_chat)
+
+    def _schedules_per_chat(self) -> Histogram:
+        histogram = Histogram(metrics.SIZE_BUCKETS)
+        for chat_schedules in self.schedules.values():
+            histogram.observe(len(chat_schedules))
+        return histogram
+
+    def _save(self, *changes: Dict) -> None:
+        """변경을 저장소에 반영하고 호출 시간 기록"""
+        with metrics.timer('storage_apply_duration_seconds'):
+            self.storage_service.apply_changes(self.schedules, list(changes))
+        metrics.inc('storage_changes_total', len(changes))
+
+    def _iter_upcoming(self, after: datetime) -> Iterator[Tuple[str, Schedule]]:
+        """after 이후에 시작하는 전체 채팅방의 (chat_id, 일정) (반복 일정은 모두)"""
+        if self.storage_service.lazy_load:
+            upcoming = self.storage_service.query_upcoming(after)
+            if upcoming is not None:
+                return iter(upcoming)
+            logging.warning("저장소가 다가오는 일정 조회를 지원하지 않아 전체 일정을 읽어 알림을 구성합니다.")
+            source = self.storage_service.load_schedules()
+        else:
+            source = self.schedules
+        after_ts = after.timestamp()
+        return (
+            (chat_id, schedule)
+            for chat_id, chat_schedules in source.items()
+            for schedule in chat_schedules
+            if schedule.recurrence is not None or schedule.start_ts >= after_ts
+        )
+
+    def _index_agenda(self, schedules: Iterable[Tuple[str, Schedule]]) -> Iterator[Tuple[str, Schedule]]:
+        """(chat_id, 일정)을 날짜별 색인에 넣으면서 그대로 넘김 (알림 힙 구성과 한 번에 훑기 위함)"""
+        agenda_index = self.agenda_index
+        for chat_id, schedule in schedules:
+            agenda_index.add(chat_id, schedule)
+            yield chat_id, schedule
+
+    def _load_chat(self, chat_id: str) -> ChatScheduleIndex:
+        """채팅방의 일정 인덱스 반환 (지연 로딩 저장소는 첫 접근 시 읽고, 쓸 때마다 최근 순서로 옮김)"""
+        if chat_id in self.schedules:
+            if self.storage_service.lazy_load:
+                self.schedules.move_to_end(chat_id)
+            return self.schedules[chat_id]
+        if self.storage_service.lazy_load:
+            with metrics.timer('storage_load_duration_seconds', scope='chat'):
+                self.schedules[chat_id] = ChatScheduleIndex(self.storage_service.load_chat(chat_id))
+            self.expiry_service.push_chat(chat_id, self.schedules[chat_id])
+            self._expire_schedules()  # 처음 불러온 채팅방의 지난 일정 정리
+            self._evict_idle_chats(chat_id)
+        else:
+            self.schedules[chat_id] = ChatScheduleIndex()
+        return self.schedules[chat_id]
+
+    def _evict_idle_chats(self, keep: str) -> None:
+        """LOADED_CHATS_MAX를 넘으면 keep을 뺀 가장 오래 쓰지 않은 채팅방부터 메모리에서 내림 (다음 접근 때 다시 읽음)
+
+        저장하지 않은 변경이 남은 채팅방은 내리지 않는다 (백그라운드 저장이 메모리 상태를 읽어 쓰므로).
+        """
+        excess = len(self.schedules) - Config.LOADED_CHATS_MAX
+        if Config.LOADED_CHATS_MAX <= 0 or excess <= 0:
+            return
+        pending = self.storage_service.pending_chats()
+        pending.add(keep)
+        evicted = list(itertools.islice((chat_id for chat_id in self.schedules if chat_id not in pending), excess))
+        for chat_id in evicted:
+            # 힙에 남은 항목은 만료 때 채팅방이 없으므로 무효 항목으로 건너뜀
+            self.expiry_service.mark_stale(len(self.schedules.pop(chat_id)))
+        metrics.inc('schedule_chats_evicted_total', len(evicted))
+
+    def _has_chat(self, chat_id: str) -> bool:
+        """메모리 또는 저장소에 일정이 있을 수 있는 채팅방인지 확인"""
+        return chat_id in self.schedules or self.storage_service.lazy_load
+
+    def _touch(self, chat_id: str, *schedules: Schedule) -> None:
+        """일정이 속한 날짜의 버전을 올려 해당 날짜의 캐시만 무효화"""
+        self._revisions[chat_id] = self._revisions.get(chat_id, 0) + 1
+        for schedule in schedules:
+            if schedule.recurrence is not None:
+                # 여러 날짜에 걸친 반복 일정은 채팅방 전체를 무효화
+                self._chat_versions[chat_id] = self._chat_versions.get(chat_id, 0) + 1
+                continue
+            key = (chat_id, schedule.datetime.date())
+            self._day_versions[key] = self._day_versions.get(key, 0) + 1
+
+    def get_versions(self, chat_id: str, days: Iterable[date]) -> Tuple[int, ...]:
+        """(채팅방 버전, 날짜별 버전...) 반환"""
+        return (self._chat_versions.get(chat_id, 0),) + tuple(
+            self._day_versions.get((chat_id, day), 0) for day in days
+        )
+
+    @staticmethod
+    def _today_start() -> datetime:
         now = datetime.now(Config.TIMEZONE)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        any_changes = False
-        for chat_id in self.schedules:
-            # 현재 시간 이후의 일정만 필터링
-            current_schedules = [
-                schedule for schedule in self.schedules[chat_id]
-                if schedule.datetime.astimezone(Config.TIMEZONE) >= today_start
-            ]
-            
-            # 일정이 필터링되었다면 변경사항 있음
-            if len(current_schedules) != len(self.schedules[chat_id]):
-                self.schedules[chat_id] = current_schedules
-                any_changes = True
-        
-        # 변경사항이 있는 경우에만 저장
-        if any_changes:
-            self.storage_service.save_schedules(self.schedules)
-            logging.info("지난 일정이 정리되었습니다.")
-
-    def add_schedule(self, chat_id: str, schedule: Schedule) -> None:
-        """일정 추가 및 저장"""
-        if chat_id not in self.schedules:
-            self.schedules[chat_id] = []
-        self.schedules[chat_id].append(schedule)
-        self.cleanup_old_schedules()  # 새 일정 추가할 때마다 정리
-        self.storage_service.save_schedules(self.schedules)
+        return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def _expire_schedules(self) -> int:
+        """오늘 이전에 끝난 일정을 힙에서 꺼내 삭제하고, 변경된 채팅방만 저장"""
+        expired = self.expiry_service.pop_expired(self.schedules, self._today_start().timestamp())
+        if not expired:
+            return 0
+
+        changes = []
+        archived: Dict[str, List[Schedule]] = {}
+        for chat_id, schedule_ids in expired.items():
+            chat_schedules = self.schedules[chat_id]
+            removed = [chat_schedules.remove(schedule_id) for schedule_id in schedule_ids]
+            for schedule in removed:
+                self._touch(chat_id, schedule)
+                self.agenda_index.remove(chat_id, schedule)
+            archived[chat_id] = removed
+            changes.append({'op': 'expire', 'chat_id': chat_id, 'schedule_ids': schedule_ids})
+        self._save(*changes)
+        if self.archive_service.enabled:
+            # 만료가 저장된 뒤 이벤트 루프 밖에서 보관 (보관 전에 끊겨도 보관소는 일정 번호로 중복을 거름)
+            self.storage_service.run_after_save(lambda: self._archive(archived))
+        return sum(len(schedule_ids) for schedule_ids in expired.values())
+
+    def _archive(self, archived: Dict[str, List[Schedule]]) -> None:
+        """채팅방별 지난 일정을 보관소로 옮김 (저장 후 작업으로 스레드 풀에서도 실행됨)"""
+        for chat_id, schedules in archived.items():
+            self.archive_service.archive(chat_id, schedules)
+
+    def _archive_unloaded(self, before: datetime) -> None:
+        """저장소에서 바로 삭제할 메모리 밖 채팅방의 지난 일정을 먼저 보관 (메모리의 채팅방은 만료 힙이 보관)"""
+        rows = self.storage_service.query_before(before, self.schedules.keys())
+        if not rows:
+            return
+        by_chat: Dict[str, List[Schedule]] = {}
+        for chat_id, schedule in rows:
+            by_chat.setdefault(chat_id, []).append(schedule)
+        self._archive(by_chat)
+
+    def cleanup_old_schedules(self) -> int:
+        """지난 일정 정리 (정리된 일정 수 반환)"""
+        removed_count = self._expire_schedules()
+        self.agenda_index.prune(self._today_start().date())
+
+        # 저장소가 직접 삭제할 수 있으면 메모리에 없는 채팅방까지 한 번에 정리
+        if self.storage_service.lazy_load:
+            if self.archive_service.enabled:
+                self._archive_unloaded(self._today_start())
+            # 메모리의 채팅방은 위에서 만료한 변경으로 지워지므로 제외 (백그라운드 저장 전이라도 두 번 세지 않음)
+            deleted_count = self.storage_service.delete_before(self._today_start(), self.schedules.keys())
+            if deleted_count is not None:
+                removed_count += deleted_count
+
+        if removed_count:
+            logging.info(f"지난 일정 {removed_count}개가 정리되었습니다.")
+        return removed_count
+
+    def add_schedule(self, chat_id: str, schedule: Schedule) -> Schedule:
+        """일정 추가 및 저장 (번호가 부여된 일정 반환)"""
+        self._load_chat(chat_id).add(schedule)
+        self._touch(chat_id, schedule)
+        self.agenda_index.add(chat_id, schedule)
+        self.expiry_service.push(chat_id, schedule)
+        self.reminder_service.push(chat_id, schedule)
+        self._save({'op': 'add', 'chat_id': chat_id, 'schedule': schedule})
+        return schedule
+
+    def add_schedules(self, chat_id: str, schedules: Iterable[Schedule]) -> List[Schedule]:
+        """여러 일정을 한 번에 추가하고 변경 묶음 하나로 저장 (제너레이터도 한 번만 순회)"""
+        chat_schedules = self._load_chat(chat_id)
+        added = []
+        changes = []
+        for schedule in schedules:
+            chat_schedules.add(schedule)
+            self._touch(chat_id, schedule)
+            self.agenda_index.add(chat_id, schedule)
+            self.expiry_service.push(chat_id, schedule)
+            self.reminder_service.push(chat_id, schedule)
+            added.append(schedule)
+            changes.append({'op': 'add', 'chat_id': chat_id, 'schedule': schedule})
+        if changes:
+            self._save(*changes)
+        return added
 
     def get_schedules(self, chat_id: str) -> List[Schedule]:
-        """특정 채팅방의 모든 일정 조회"""
-        return self.schedules.get(chat_id, [])
+        """특정 채팅방의 모든 일정 조회 (시작 시각 순)"""
+        if self._has_chat(chat_id):
+            return list(self._load_chat(chat_id))
+        return []
 
     def clear_schedules(self, chat_id: str) -> None:
         """특정 채팅방의 모든 일정 초기화 및 저장"""
-        self.schedules[chat_id] = []
-        self.storage_service.save_schedules(self.schedules)
+        if chat_id in self.schedules:
+            self.expiry_service.mark_stale(len(self.schedules[chat_id]))
+        self.agenda_index.discard_chat(chat_id)
+        self.schedules[chat_id] = ChatScheduleIndex()
+        self._chat_versions[chat_id] = self._chat_versions.get(chat_id, 0) + 1
+        self._revisions[chat_id] = self._revisions.get(chat_id, 0) + 1
+        self._save({'op': 'clear', 'chat_id': chat_id})
+
+    @staticmethod
+    def _merge_occurrences(single: List[Schedule], series: Iterable[Schedule],
+                           start: datetime, end: datetime) -> List[Schedule]:
+        """단일 일정 목록에 반복 일정의 [start, end] 회차를 끼워 넣음 (시작 시각 순)"""
+        occurrences = [occurrence for schedule in series for occurrence in schedule.occurrences(start, end)]
+        if not occurrences:
+            return single
+        merged = single + occurrences
+        merged.sort(key=lambda schedule: schedule.datetime)
+        return merged
+
+    def get_range_schedules(self, chat_id: str, start: datetime, end: datetime) -> List[Schedule]:
+        """시작 시각이 [start, end] 안에 있는 일정 (반복 일정은 이 기간의 회차만 펼침, 시작 시각 순)"""
+        if chat_id not in self.schedules and self.storage_service.lazy_load:
+            # 메모리에 없는 채팅방은 저장소의 기간 조회로 처리 (반복 일정은 함께 반환됨)
+            ranged = self.storage_service.query_range(chat_id, start, end)
+            if ranged is not None:
+                return self._merge_occurrences(
+                    [s for s in ranged if s.recurrence is None],
+                    [s for s in ranged if s.recurrence is not None],
+                    start, end
+                )
+        if not self._has_chat(chat_id):
+            return []
+        chat_schedules = self._load_chat(chat_id)
+        return self._merge_occurrences(
+            chat_schedules.range(start.timestamp(), end.timestamp()), chat_schedules.series(), start, end
+        )
+
+    def get_day_schedules(self, chat_id: str, day: date) -> List[Schedule]:
+        """특정 날짜(현지 시간)의 일정"""
+        start = Config.TIMEZONE.localize(datetime.combine(day, time.min))
+        end = Config.TIMEZONE.localize(datetime.combine(day, time.max))
+        return self.get_range_schedules(chat_id, start, end)
 
     def get_week_schedules(self, chat_id: str, base_date: datetime) -> List[Schedule]:
         """특정 주의 일정만 필터링"""
         start_date, end_date = DateService.get_week_range(base_date)
-        schedules = self.get_schedules(chat_id)
-        
-        filtered_schedules = []
-        for schedule in schedules:
-            # 일정의 datetime을 현지 시간대로 변환
-            schedule_dt = schedule.datetime.astimezone(Config.TIMEZONE)
-            if start_date <= schedule_dt <= end_date:
-                filtered_schedules.append(schedule)
-                
-        return filtered_schedules
+        return self.get_range_schedules(chat_id, start_date, end_date)
     
-    def get_schedule_by_index(self, chat_id: str, display_index: int) -> Optional[Schedule]:
-        """표시 인덱스로 일정 조회 (1부터 시작)"""
-        schedules = self.get_schedules(chat_id)
-        actual_index = display_index - 1  # 실제 인덱스로 변환
-        if 0 <= actual_index < len(schedules):
-            return schedules[actual_index]
-        return None
-
-    def delete_schedule(self, chat_id: str, display_index: int) -> bool:
-        """일정 삭제 (1부터 시작하는 인덱스 사용)"""
-        if chat_id not in self.schedules:
+    def _busy_schedules(self, chat_id: str, start_ts: int, end_ts: int) -> List[Schedule]:
+        """[start_ts, end_ts)와 겹치는 일정 (구간 트리 조회, 반복 일정은 이 기간의 회차만 펼침, 시작 시각 순)"""
+        if not self._has_chat(chat_id):
+            return []
+        chat_schedules = self._load_chat(chat_id)
+        busy = chat_schedules.overlapping(start_ts, end_ts)
+        busy_end = ChatScheduleIndex.busy_end
+        occurrences = []
+        for series in chat_schedules.series():
+            # 기간 전에 시작해 기간 안까지 이어지는 회차도 포함
+            window_start = datetime.fromtimestamp(start_ts - (busy_end(series) - series.start_ts), Config.TIMEZONE)
+            occurrences.extend(
+                occurrence
+                for occurrence in series.occurrences(window_start, datetime.fromtimestamp(end_ts, Config.TIMEZONE))
+                if occurrence.start_ts < end_ts and busy_end(occurrence) > start_ts
+            )
+        if occurrences:
+            busy += occurrences
+            busy.sort(key=lambda schedule: (schedule.start_ts, schedule.id))
+        return busy
+
+    def find_conflicts(self, chat_id: str, schedule: Schedule) -> List[Schedule]:
+        """일정과 시간이 겹치는 같은 채팅방의 다른 일정 (반복 일정은 겹치는 회차)"""
+        busy = self._busy_schedules(chat_id, schedule.start_ts, ChatScheduleIndex.busy_end(schedule))
+        return [other for other in busy if other.id != schedule.id]
+
+    def get_conflicts(self, chat_id: str, start: datetime, end: datetime) -> List[Tuple[Schedule, Schedule]]:
+        """[start, end) 안에서 서로 겹치는 일정 쌍 (나중에 시작하는 일정 기준 시작 시각 순)"""
+        start_ts, end_ts = int(start.timestamp()), int(end.timestamp())
+        busy_end = ChatScheduleIndex.busy_end
+        conflicts = []
+        active: List[Tuple[int, int, Schedule]] = []  # 진행 중인 일정의 (종료 epoch, 순번, 일정) 힙
+        for order, schedule in enumerate(self._busy_schedules(chat_id, start_ts, end_ts)):
+            while active and active[0][0] <= schedule.start_ts:
+                heapq.heappop(active)
+            schedule_end = busy_end(schedule)
+            for other_end, _, other in sorted(active):
+                # 두 일정이 모두 기간 전에 시작했으면 겹치는 부분이 기간 안에 있을 때만
+                if min(other_end, schedule_end) > start_ts:
+                    conflicts.append((other, schedule))
+            heapq.heappush(active, (schedule_end, order, schedule))
+        return conflicts
+
+    def find_free_slots(self, chat_id: str, day: date, duration: timedelta) -> List[Tuple[datetime, datetime]]:
+        """근무 시간(WORK_DAY_START~WORK_DAY_END) 중 duration 이상 비어 있는 구간 (오늘이면 지금 이후만)"""
+        day_str = day.strftime(Config.DATE_FORMAT)
+        work_start = DateService.parse_datetime(day_str, Config.WORK_DAY_START)
+        work_end = DateService.parse_datetime(day_str, Config.WORK_DAY_END)
+        cursor = int(work_start.timestamp())
+        end_ts = int(work_end.timestamp())
+        now_ts = datetime.now(Config.TIMEZONE).timestamp()
+        if now_ts > cursor:
+            cursor = int(-(-now_ts // 60) * 60)  # 다음 분 단위로 올림
+        length = int(duration.total_seconds())
+
+        slots = []
+        busy_end = ChatScheduleIndex.busy_end
+        for schedule in self._busy_schedules(chat_id, cursor, end_ts):
+            if schedule.start_ts - cursor >= length:
+                slots.append((cursor, schedule.start_ts))
+            cursor = max(cursor, busy_end(schedule))
+        if end_ts - cursor >= length:
+            slots.append((cursor, end_ts))
+        return [
+            (datetime.fromtimestamp(slot_start, Config.TIMEZONE), datetime.fromtimestamp(slot_end, Config.TIMEZONE))
+            for slot_start, slot_end in slots
+        ]
+
+    def search_schedules(self, chat_id: str, query: str, start: Optional[datetime] = None,
+                         end: Optional[datetime] = None) -> List[Schedule]:
+        """제목에 검색어가 들어 있는 일정 (시작 시각이 [start, end] 안인 것만, 시작 시각 순)
+
+        반복 일정은 기간 안(기간 시작이 없으면 오늘 이후)의 가장 가까운 회차로 반환한다.
+        """
+        if not self._has_chat(chat_id):
+            return []
+        start_ts = start.timestamp() if start else float('-inf')
+        end_ts = end.timestamp() if end else float('inf')
+        found = []
+        for schedule in self._load_chat(chat_id).search(query):
+            if schedule.recurrence is not None:
+                schedule = schedule.next_occurrence(start or self._today_start())
+                if schedule is None:
+                    continue
+            if start_ts <= schedule.start_ts <= end_ts:
+                found.append(schedule)
+        found.sort(key=lambda schedule: (schedule.start_ts, schedule.id))
+        return found
+
+    def get_history(self, chat_id: str, start: datetime, end: datetime) -> Iterator[Schedule]:
+        """보관소의 지난 일정 중 시작 시각이 [start, end] 안인 것 (시작 시각 순 스트림)"""
+        return self.archive_service.iter_history(chat_id, start, end)
+
+    def get_schedule(self, chat_id: str, schedule_id: int) -> Optional[Schedule]:
+        """일정 번호로 조회"""
+        if not self._has_chat(chat_id):
+            return None
+        return self._load_chat(chat_id).get(schedule_id)
+
+    def delete_schedule(self, chat_id: str, schedule_id: int) -> Optional[Schedule]:
+        """일정 번호로 삭제 (삭제된 일정 반환)"""
+        if not self._has_chat(chat_id):
+            return None
+        removed = self._load_chat(chat_id).remove(schedule_id)
+        if removed is not None:
+            self._touch(chat_id, removed)
+            self.agenda_index.remove(chat_id, removed)
+            self.expiry_service.mark_stale()
+            self._save({'op': 'delete', 'chat_id': chat_id, 'schedule_id': schedule_id})
+        return removed
+
+    def edit_schedule(self, chat_id: str, schedule_id: int, new_schedule: Schedule) -> bool:
+        """일정 번호로 수정 (번호는 그대로 유지)"""
+        if not self._has_chat(chat_id):
             return False
-        
-        actual_index = display_index - 1  # 실제 인덱스로 변환
-        if 0 <= actual_index < len(self.schedules[chat_id]):
-            self.schedules[chat_id].pop(actual_index)
-            self.storage_service.save_schedules(self.schedules)
-            return True
-        return False
+        old_schedule = self._load_chat(chat_id).replace(schedule_id, new_schedule)
+        if old_schedule is None:
+            return False
+        self._touch(chat_id, old_schedule, new_schedule)
+        self.agenda_index.remove(chat_id, old_schedule)
+        self.agenda_index.add(chat_id, new_schedule)
+        if ExpiryService.expire_ts(old_schedule) != ExpiryService.expire_ts(new_schedule):
+            self.expiry_service.mark_stale()
+            self.expiry_service.push(chat_id, new_schedule)
+        if old_schedule.start_ts != new_schedule.start_ts or old_schedule.recurrence != new_schedule.recurrence:
+            self.reminder_service.push(chat_id, new_schedule)
+        self._save({'op': 'edit', 'chat_id': chat_id, 'schedule_id': schedule_id, 'schedule': new_schedule})
+        return True
 
-    def edit_schedule(self, chat_id: str, display_index: int, new_schedule: Schedule) -> bool:
-        """일정 수정 (1부터 시작하는 인덱스 사용)"""
-        if chat_id not in self.schedules:
+    def skip_occurrence(self, chat_id: str, schedule_id: int, day: date) -> bool:
+        """반복 일정의 특정 날짜 회차만 건너뛰도록 예외 추가"""
+        schedule = self.get_schedule(chat_id, schedule_id)
+        if schedule is None or schedule.recurrence is None:
             return False
-        
-        actual_index = display_index - 1  # 실제 인덱스로 변환
-        if 0 <= actual_index < len(self.schedules[chat_id]):
-            self.schedules[chat_id][actual_index] = new_schedule
-            self.storage_service.save_schedules(self.schedules)
+        if day in schedule.recurrence.exceptions:
             return True
-        return False
+        recurrence = replace(schedule.recurrence, exceptions=schedule.recurrence.exceptions + [day])
+        return self.edit_schedule(chat_id, schedule_id, schedule.copy(recurrence=recurrence))
 
-    def list_schedules(self, chat_id: str) -> str:
-        """일정 목록 표시 (인덱스 포함)"""
-        schedules = self.get_schedules(chat_id)
-        if not schedules:
-            return "등록된 일정이 없습니다."
+    def get_revision(self, chat_id: str) -> int:
+        """채팅방 일정이 바뀔 때마다 올라가는 번호 (목록 페이지 캐시 무효화용)"""
+        return self._revisions.get(chat_id, 0)
 
-        # 날짜별로 그룹화하고 정렬
-        daily_schedules: Dict[str, List[Tuple[int, Schedule]]] = {}
-        now = datetime.now(Config.TIMEZONE)
-        
-        # 인덱스와 함께 날짜별로 그룹화
-        for i, schedule in enumerate(schedules):
-            schedule_date = schedule.datetime.astimezone(Config.TIMEZONE)
-            date_str = schedule_date.strftime('%Y-%m-%d (%a)')
-            
-            # 한글 요일로 변환
-            for eng, kor in Config.WEEKDAY_MAP.items():
-                date_str = date_str.replace(f'({eng})', f'({kor})')
-            
-            # 오늘 날짜인 경우 표시
-            if schedule_date.date() == now.date():
-                date_str += " ✨ Today"
-            
-            if date_str not in daily_schedules:
-                daily_schedules[date_str] = []
-            daily_schedules[date_str].append((i+1, schedule))  # 1-based index
-
-        message = "📋 전체 일정 목록:\n\n"
-        
-        # 날짜별로 정렬하여 출력
-        for date_str, day_schedules in sorted(daily_schedules.items(), 
-                                            key=lambda x: datetime.strptime(x[0].split(' ')[0], '%Y-%m-%d')):
-            message += f"📌 {date_str}\n"
-            # 같은 날짜 내에서 시간순 정렬
-            for idx, schedule in sorted(day_schedules, key=lambda x: x[1].datetime):
-                time_str = schedule.datetime.strftime('%H:%M')
-                if schedule.end_time:
-                    end_time = schedule.end_time.astimezone(Config.TIMEZONE)
-                    time_str += f" ~ {end_time.strftime('%H:%M')}"
-                message += f"    {idx}. ⌚️ {time_str} {schedule.title}\n"
-            message += "\n"
-        
-        message += "💡 일정 삭제: /delete [번호]\n💡 일정 수정: /edit [번호] [날짜] [시간] [제목]"
-        return message
\ No newline at end of file
+    def get_list_schedules(self, chat_id: str) -> List[Schedule]:
+        """/list에 보여줄 일정 (단일 일정 전체와 앞으로 RECURRENCE_LIST_DAYS일 동안의 반복 회차, 시작 시각 순)"""
+        if not self._has_chat(chat_id):
+            return []
+        chat_schedules = self._load_chat(chat_id)
+        today_start = self._today_start()
+        return self._merge_occurrences(
+            chat_schedules.range(float('-inf'), float('inf')), chat_schedules.series(),
+            today_start, today_start + timedelta(days=Config.RECURRENCE_LIST_DAYS)
+        )
+
+    def get_agenda_chats(self, day: date) -> List[str]:
+        """그날 일정이 있을 수 있는 채팅방 (날짜별 색인 조회, 빈 채팅방은 get_day_schedules로 거름)"""
+        return self.agenda_index.chats_on(day)
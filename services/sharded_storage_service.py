@@ -0,0 +1,217 @@
+# services/sharded_storage_service.py
+import glob
+import json
+import os
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from models.schedule import Schedule
+from config import Config
+from services.base_storage_service import BaseStorageService
+from services.date_service import DateService
+
+class ShardedStorageService(BaseStorageService):
+    """채팅방(또는 해시 버킷)별 샤드 파일로 나누어 변경된 샤드만 다시 쓰는 저장소
+
+    샤드를 쓸 때마다 그 샤드의 다가오는 일정 요약을 upcoming.jsonl 끝에 덧붙여, 시작할 때 알림과 날짜별 색인을
+    모든 샤드를 읽지 않고 요약 파일 하나로 구성한다. 요약에는 기록 당시 샤드 파일의 수정 시각과 크기를 함께 남겨,
+    요약을 남기지 못하고 끊긴 샤드는 알아보고 그 샤드만 다시 읽는다.
+    """
+
+    lazy_load = True
+    SUMMARY_FILE = 'upcoming.jsonl'
+
+    def __init__(self, shard_dir: str = "data/shards", buckets: Optional[int] = None):
+        self.shard_dir = shard_dir
+        # 0이면 채팅방마다 파일 1개, 양수이면 chat_id 해시로 해당 개수의 버킷에 나눔
+        self.buckets = Config.SHARD_BUCKETS if buckets is None else buckets
+        self.dirty_chats: Set[str] = set()
+        self.summary_path = os.path.join(self.shard_dir, self.SUMMARY_FILE)
+        self._appended_summaries = 0
+        os.makedirs(self.shard_dir, exist_ok=True)
+
+    def shard_path(self, chat_id: str) -> str:
+        """채팅방이 속한 샤드 파일 경로"""
+        if self.buckets:
+            bucket = zlib.crc32(chat_id.encode('utf-8')) % self.buckets
+            return os.path.join(self.shard_dir, f"bucket-{bucket:04d}.json")
+        return os.path.join(self.shard_dir, f"chat-{chat_id}.json")
+
+    def _read_shard(self, path: str) -> Dict[str, List[Dict]]:
+        """샤드 파일의 원본 JSON 읽기"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def load_schedules(self) -> Dict[str, List[Schedule]]:
+        """모든 샤드의 일정 불러오기"""
+        schedules: Dict[str, List[Schedule]] = {}
+        for path in sorted(glob.glob(os.path.join(self.shard_dir, '*.json'))):
+            schedules.update(self._read_snapshot(path))
+        return schedules
+
+    def load_chat(self, chat_id: str) -> List[Schedule]:
+        """채팅방이 속한 샤드만 읽어서 반환"""
+        data = self._read_snapshot(self.shard_path(chat_id))
+        return data.get(chat_id, [])
+
+    def _summarize(self, path: str, data: Dict[str, List[Dict]], since: float) -> Optional[Dict]:
+        """샤드 원본 JSON에서 since 이후에 시작하는 일정과 반복 일정만 뽑은 요약 (번호 없는 옛 데이터면 None)"""
+        upcoming = {}
+        for chat_id, items in data.items():
+            if any(item.get('id') is None for item in items):
+                return None  # 번호는 채팅방 전체를 읽을 때 부여되므로 요약하지 않음
+            starts = DateService.iso_to_epochs([item['datetime'] for item in items])
+            kept = [item for item, start_ts in zip(items, starts) if item.get('recurrence') or start_ts >= since]
+            if kept:
+                upcoming[chat_id] = kept
+        stat = os.stat(path)
+        return {'shard': os.path.basename(path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                'since': since, 'upcoming': upcoming}
+
+    def _read_summaries(self) -> Tuple[Dict[str, Dict], int]:
+        """샤드별 마지막 요약과 요약 파일의 줄 수 (기록 중 끊긴 줄은 무시)"""
+        summaries: Dict[str, Dict] = {}
+        lines = 0
+        try:
+            with open(self.summary_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        summary = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(summary, dict) and 'shard' in summary:
+                        summaries[summary['shard']] = summary
+        except FileNotFoundError:
+            pass
+        return summaries, lines
+
+    def _append_summaries(self, summaries: List[Dict]) -> None:
+        """샤드 요약을 요약 파일 끝에 덧붙임 (덧붙인 줄이 임계치를 넘으면 샤드별 최신 요약만 남김)"""
+        with open(self.summary_path, 'a', encoding='utf-8') as f:
+            for summary in summaries:
+                f.write(json.dumps(summary, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._appended_summaries += len(summaries)
+        if self._appended_summaries >= Config.JOURNAL_COMPACT_THRESHOLD:
+            latest, _ = self._read_summaries()
+            self._write_summaries([
+                summary for name, summary in latest.items() if os.path.exists(os.path.join(self.shard_dir, name))
+            ])
+            self._appended_summaries = 0
+
+    def _write_summaries(self, summaries: List[Dict]) -> None:
+        """요약 파일을 샤드별 최신 요약 한 줄씩으로 다시 씀 (임시 파일 + rename)"""
+        tmp_path = f"{self.summary_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for summary in summaries:
+                f.write(json.dumps(summary, ensure_ascii=False, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.summary_path)
+
+    def query_upcoming(self, after: datetime) -> Optional[List[Tuple[str, Schedule]]]:
+        """샤드별 요약으로 기준 시각 이후 일정 조회 (요약이 없거나 그 뒤에 바뀐 샤드만 직접 읽음)"""
+        after_ts = after.timestamp()
+        summaries, lines = self._read_summaries()
+        kept: List[Dict] = []  # 요약 파일에 남길 샤드별 요약
+        refreshed = False
+        upcoming = []
+        chat_ids: List[str] = []  # 요약의 일정은 모아서 한 번에 변환
+        items: List[Dict] = []
+        for entry in os.scandir(self.shard_dir):
+            if not entry.name.endswith('.json') or not entry.is_file():
+                continue
+            stat = entry.stat()
+            summary = summaries.get(entry.name)
+            if (summary is None or summary['mtime_ns'] != stat.st_mtime_ns or summary['size'] != stat.st_size
+                    or summary['since'] > after_ts):
+                refreshed = True
+                try:
+                    summary = self._summarize(entry.path, self._read_shard(entry.path), after_ts)
+                except json.JSONDecodeError:
+                    summary = None
+                if summary is None:
+                    # 번호 없는 옛 데이터나 손상된 샤드는 채팅방 전체를 읽는 경로로 처리
+                    upcoming.extend(
+                        (chat_id, schedule)
+                        for chat_id, chat_schedules in self._read_snapshot(entry.path).items()
+                        for schedule in chat_schedules
+                        if schedule.recurrence is not None or schedule.start_ts >= after_ts
+                    )
+                    continue
+            kept.append(summary)
+            for chat_id, chat_items in summary['upcoming'].items():
+                chat_ids.extend([chat_id] * len(chat_items))
+                items.extend(chat_items)
+        upcoming.extend(
+            (chat_id, schedule) for chat_id, schedule in zip(chat_ids, self.deserialize_schedules(items))
+            if schedule.recurrence is not None or schedule.start_ts >= after_ts
+        )
+        if refreshed or lines > len(kept):
+            self._write_summaries(kept)
+        return upcoming
+
+    def pending_chats(self) -> Set[str]:
+        # 저장에 실패해 다음 flush에서 다시 쓸 채팅방 (set 복사는 GIL을 놓지 않으므로 저장 스레드와 겹쳐도 안전)
+        return set(self.dirty_chats)
+
+    def mark_dirty(self, chat_id: str) -> None:
+        """다음 flush 때 다시 써야 하는 채팅방으로 표시"""
+        self.dirty_chats.add(chat_id)
+
+    def changed_chats(self, changes: List[Dict[str, Any]]) -> Set[str]:
+        """변경 목록에서 영향을 받은 채팅방 추출"""
+        chat_ids = set()
+        for change in changes:
+            if change.get('chat_id') is not None:
+                chat_ids.add(change['chat_id'])
+            chat_ids.update(change.get('chat_ids', ()))
+        return chat_ids
+
+    def apply_changes(self, schedules: Dict[str, List[Schedule]], changes: List[Dict[str, Any]]) -> None:
+        """변경된 채팅방을 표시하고 해당 샤드만 저장"""
+        for chat_id in self.changed_chats(changes):
+            self.mark_dirty(chat_id)
+        self.flush(schedules)
+
+    def snapshot(self, schedules: Dict[str, List[Schedule]], changes: List[Dict[str, Any]]) -> Dict[str, List[Schedule]]:
+        """변경된 채팅방만 복사"""
+        return {
+            chat_id: list(schedules.get(chat_id, []))
+            for chat_id in self.changed_chats(changes) | self.dirty_chats
+        }
+
+    def save_schedules(self, schedules: Dict[str, List[Schedule]]) -> None:
+        """전달된 채팅방들의 샤드를 모두 저장"""
+        self.dirty_chats.update(schedules.keys())
+        self.flush(schedules)
+
+    def flush(self, schedules: Dict[str, List[Schedule]]) -> None:
+        """변경 표시된 채팅방의 샤드만 임시 파일 + rename으로 저장"""
+        chats_by_shard: Dict[str, List[str]] = {}
+        since = datetime.now(Config.TIMEZONE).replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        summaries = []
+        for chat_id in self.dirty_chats:
+            chats_by_shard.setdefault(self.shard_path(chat_id), []).append(chat_id)
+
+        for path, chat_ids in chats_by_shard.items():
+            # 버킷 모드에서는 같은 파일의 다른 채팅방 데이터를 유지
+            data = self._read_shard(path) if self.buckets else {}
+            for chat_id in chat_ids:
+                chat_schedules = schedules.get(chat_id)
+                if chat_schedules:
+                    data[chat_id] = [self.serialize_schedule(s) for s in chat_schedules]
+                else:
+                    data.pop(chat_id, None)
+
+            if data:
+                self._atomic_write_json(path, data)
+                summary = self._summarize(path, data, since)
+                if summary is not None:
+                    summaries.append(summary)
+            elif os.path.exists(path):
+                os.remove(path)
+        if summaries:
+            self._append_summaries(summaries)
+        self.dirty_chats.clear()
@@ -0,0 +1,346 @@
+# services/snapshot_storage_service.py
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from models.recurrence import Recurrence
+from models.schedule import Schedule
+from config import Config
+from services.base_storage_service import BaseStorageService
+
+# (시작 epoch, 종료 epoch 또는 None, 번호, 제목, 반복 규칙 JSON 또는 None)
+Row = Tuple[int, Optional[int], int, str, Optional[str]]
+
+class SnapshotStorageService(BaseStorageService):
+    """바이너리 스냅샷을 mmap으로 열어 처음 접근한 채팅방의 레코드만 디코딩하는 저장소
+
+    파일 구성: 헤더 | 채팅방 디렉토리 (채팅방 ID 문자열 번호, 첫 레코드, 레코드 수) |
+    고정 길이 일정 레코드 (채팅방별 시작 시각 순) | 문자열 표 (오프셋 배열 + UTF-8 데이터).
+    변경은 채팅방 단위 최신 상태를 저널에 한 줄씩 추가하고, 임계치를 넘으면 새 스냅샷으로 합친다.
+    """
+
+    lazy_load = True
+
+    MAGIC = b'TGSNAP01'
+    # 매직, 채팅방 수, 레코드 수, 문자열 수, 디렉토리/레코드/문자열 표 위치
+    HEADER = struct.Struct('<8sIIIQQQ')
+    DIRECTORY_ENTRY = struct.Struct('<III')
+    # 시작 epoch, 종료 epoch, 번호, 제목 문자열 번호, 반복 규칙 문자열 번호
+    RECORD = struct.Struct('<qqIII')
+    STRING_OFFSET = struct.Struct('<Q')
+    NO_END = -2 ** 63
+    NO_STRING = 0xFFFFFFFF
+
+    def __init__(self, file_path: Optional[str] = None, compact_threshold: Optional[int] = None):
+        self.file_path = file_path or Config.SNAPSHOT_STORAGE_PATH
+        self.journal_path = f"{self.file_path}.journal"
+        self.compact_threshold = compact_threshold or Config.JOURNAL_COMPACT_THRESHOLD
+        self.journal_entries = 0
+        # 백그라운드 저장 스레드의 압축과 루프의 채팅방 로딩이 같은 mmap을 쓰므로 잠금으로 보호
+        self._lock = threading.RLock()
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._directory: Dict[str, Tuple[int, int]] = {}  # chat_id -> (첫 레코드, 레코드 수)
+        self._overrides: Dict[str, List[Dict]] = {}  # 스냅샷 이후 저널에 기록된 채팅방별 최신 상태
+        self._journal_file = None
+        self._records_offset = 0
+        self._string_offsets: Optional[memoryview] = None  # 문자열 표 오프셋 배열 (mmap 위의 뷰)
+        self._string_data_offset = 0
+        self._strings: List[Optional[str]] = []  # 한 번 디코딩한 문자열 (같은 제목이 많아 재사용)
+        os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
+        self._open_snapshot()
+        self._load_journal()
+
+    # 스냅샷 읽기
+
+    def _open_snapshot(self) -> None:
+        """스냅샷 파일을 mmap으로 열고 채팅방 디렉토리만 읽어 둠"""
+        self._close_snapshot()
+        try:
+            self._file = open(self.file_path, 'rb')
+        except FileNotFoundError:
+            return
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, chat_count, _, string_count, directory_offset, records_offset, strings_offset = \
+                self.HEADER.unpack_from(self._mmap, 0)
+            if magic != self.MAGIC:
+                raise ValueError(f"알 수 없는 파일 형식입니다: {magic!r}")
+        except (ValueError, struct.error) as e:
+            # 손상된 파일을 덮어쓰지 않고 옆으로 옮겨 보존
+            self._close_snapshot()
+            corrupt_path = f"{self.file_path}.corrupt-{int(time.time())}"
+            os.replace(self.file_path, corrupt_path)
+            logging.error(f"{self.file_path} 파일을 읽을 수 없어 {corrupt_path}로 옮겼습니다: {e}")
+            return
+
+        self._records_offset = records_offset
+        offsets_size = (string_count + 1) * self.STRING_OFFSET.size
+        self._string_offsets = memoryview(self._mmap)[strings_offset:strings_offset + offsets_size].cast('Q')
+        self._string_data_offset = strings_offset + offsets_size
+        self._strings = [None] * string_count
+        view = self._mmap[directory_offset:directory_offset + chat_count * self.DIRECTORY_ENTRY.size]
+        self._directory = {
+            self._read_string(chat_index): (first, count)
+            for chat_index, first, count in self.DIRECTORY_ENTRY.iter_unpack(view)
+        }
+
+    def _close_snapshot(self) -> None:
+        if self._string_offsets is not None:
+            self._string_offsets.release()  # mmap 위의 뷰가 남아 있으면 닫을 수 없음
+            self._string_offsets = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._directory = {}
+        self._strings = []
+
+    def _read_string(self, index: int) -> Optional[str]:
+        """문자열 표에서 index번 문자열 읽기"""
+        if index == self.NO_STRING:
+            return None
+        value = self._strings[index]
+        if value is None:
+            offsets = self._string_offsets
+            data_offset = self._string_data_offset
+            value = self._strings[index] = \
+                self._mmap[data_offset + offsets[index]:data_offset + offsets[index + 1]].decode('utf-8')
+        return value
+
+    def _iter_records(self, first: int, count: int) -> Iterator[Tuple[int, int, int, int, int]]:
+        start = self._records_offset + first * self.RECORD.size
+        return self.RECORD.iter_unpack(self._mmap[start:start + count * self.RECORD.size])
+
+    def _decode_chat(self, chat_id: str) -> List[Schedule]:
+        """스냅샷에 있는 채팅방 하나의 레코드를 Schedule로 변환"""
+        entry = self._directory.get(chat_id)
+        if entry is None:
+            return []
+        return [self._record_to_schedule(record) for record in self._iter_records(*entry)]
+
+    def _record_to_schedule(self, record: Tuple[int, int, int, int, int]) -> Schedule:
+        start_ts, end_ts, schedule_id, title_index, recurrence_index = record
+        recurrence = self._read_string(recurrence_index)
+        return Schedule.from_epoch(
+            title=self._read_string(title_index),
+            start_ts=start_ts,
+            end_ts=None if end_ts == self.NO_END else end_ts,
+            id=schedule_id,
+            recurrence=Recurrence.from_dict(json.loads(recurrence)) if recurrence else None
+        )
+
+    def _chat_ids(self) -> List[str]:
+        return list(self._directory.keys() | self._overrides.keys())
+
+    # 저장소 인터페이스
+
+    def load_chat(self, chat_id: str) -> List[Schedule]:
+        """채팅방 하나만 디코딩 (저널에 더 최신 상태가 있으면 그것을 사용)"""
+        with self._lock:
+            if chat_id in self._overrides:
+                return self.assign_missing_ids(self.deserialize_schedules(self._overrides[chat_id]))
+            return self._decode_chat(chat_id)
+
+    def load_schedules(self) -> Dict[str, List[Schedule]]:
+        """모든 채팅방 디코딩 (JSON 내보내기·이전용)"""
+        with self._lock:
+            schedules = {chat_id: self.load_chat(chat_id) for chat_id in self._chat_ids()}
+        return {chat_id: chat_schedules for chat_id, chat_schedules in schedules.items() if chat_schedules}
+
+    def query_upcoming(self, after: datetime) -> Optional[List[Tuple[str, Schedule]]]:
+        """고정 길이 레코드의 시작 시각만 훑어서 이후 일정과 반복 일정만 디코딩"""
+        after_ts = after.timestamp()
+        upcoming = []
+        with self._lock:
+            for chat_id, (first, count) in self._directory.items():
+                if chat_id in self._overrides:
+                    continue
+                for record in self._iter_records(first, count):
+                    if record[0] >= after_ts or record[4] != self.NO_STRING:
+                        upcoming.append((chat_id, self._record_to_schedule(record)))
+            for chat_id in self._overrides:
+                upcoming.extend(
+                    (chat_id, schedule) for schedule in self.load_chat(chat_id)
+                    if schedule.recurrence is not None or schedule.start_ts >= after_ts
+                )
+        return upcoming
+
+    def snapshot(self, schedules: Dict[str, List[Schedule]], changes: List[Dict[str, Any]]) -> Dict[str, List[Schedule]]:
+        """변경된 채팅방만 복사"""
+        return {chat_id: list(schedules.get(chat_id, [])) for chat_id in self._changed_chats(changes)}
+
+    def apply_changes(self, schedules: Dict[str, List[Schedule]], changes: List[Dict[str, Any]]) -> None:
+        """변경된 채팅방의 최신 상태를 저널에 추가 (임계치를 넘으면 새 스냅샷으로 압축)"""
+        records = [
+            {'chat_id': chat_id, 'schedules': [self.serialize_schedule(s) for s in schedules.get(chat_id, [])]}
+            for chat_id in self._changed_chats(changes)
+        ]
+        if not records:
+            return
+        with self._lock:
+            self._append_journal(records)
+            for record in records:
+                self._overrides[record['chat_id']] = record['schedules']
+            if self.journal_entries >= self.compact_threshold:
+                self.compact()
+
+    def save_schedules(self, schedules: Dict[str, List[Schedule]]) -> None:
+        """전달된 일정 전체로 새 스냅샷 작성 (저널은 비움)"""
+        with self._lock:
+            self._write_snapshot(
+                (chat_id, [self._schedule_to_row(s) for s in chat_schedules])
+                for chat_id, chat_schedules in schedules.items() if chat_schedules
+            )
+
+    def compact(self) -> None:
+        """기존 스냅샷과 저널을 합쳐 새 스냅샷 작성 (바뀌지 않은 채팅방은 Schedule을 만들지 않고 옮김)"""
+        with self._lock:
+            started = time.perf_counter()
+            self._write_snapshot(self._iter_compacted_rows())
+            logging.info(f"스냅샷 압축 완료 ({len(self._directory)}개 채팅방, "
+                         f"{(time.perf_counter() - started) * 1000:.0f}ms)")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._journal_file:
+                self._journal_file.close()
+                self._journal_file = None
+            self._close_snapshot()
+
+    # 스냅샷 쓰기
+
+    @staticmethod
+    def _changed_chats(changes: List[Dict[str, Any]]) -> List[str]:
+        chat_ids = {}
+        for change in changes:
+            if change.get('chat_id') is not None:
+                chat_ids[change['chat_id']] = None
+            chat_ids.update(dict.fromkeys(change.get('chat_ids', ())))
+        return list(chat_ids)
+
+    @staticmethod
+    def _schedule_to_row(schedule: Schedule) -> Row:
+        recurrence = json.dumps(schedule.recurrence.to_dict()) if schedule.recurrence else None
+        return (schedule.start_ts, schedule.end_ts, schedule.id, schedule.title, recurrence)
+
+    def _iter_compacted_rows(self) -> Iterator[Tuple[str, List[Row]]]:
+        for chat_id in self._chat_ids():
+            if chat_id in self._overrides:
+                rows = [self._schedule_to_row(s) for s in self.load_chat(chat_id)]
+            else:
+                rows = [
+                    (start_ts, None if end_ts == self.NO_END else end_ts, schedule_id,
+                     self._read_string(title_index), self._read_string(recurrence_index))
+                    for start_ts, end_ts, schedule_id, title_index, recurrence_index
+                    in self._iter_records(*self._directory[chat_id])
+                ]
+            if rows:
+                yield chat_id, rows
+
+    def _write_snapshot(self, chats: Iterable[Tuple[str, List[Row]]]) -> None:
+        """임시 파일에 기록 후 rename하고 새 파일을 다시 mmap으로 엶"""
+        started = time.perf_counter()
+        strings: Dict[str, int] = {}  # 같은 문자열(반복되는 제목 등)은 한 번만 저장
+
+        def intern(value: Optional[str]) -> int:
+            if value is None:
+                return self.NO_STRING
+            index = strings.get(value)
+            if index is None:
+                index = strings[value] = len(strings)
+            return index
+
+        directory = bytearray()
+        records = bytearray()
+        record_count = 0
+        for chat_id, rows in chats:
+            rows.sort(key=lambda row: (row[0], row[2]))
+            directory += self.DIRECTORY_ENTRY.pack(intern(chat_id), record_count, len(rows))
+            for start_ts, end_ts, schedule_id, title, recurrence in rows:
+                records += self.RECORD.pack(start_ts, self.NO_END if end_ts is None else end_ts,
+                                            schedule_id, intern(title), intern(recurrence))
+            record_count += len(rows)
+
+        encoded = [value.encode('utf-8') for value in strings]
+        offsets = [0]
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+
+        directory_offset = self.HEADER.size
+        records_offset = directory_offset + len(directory)
+        strings_offset = records_offset + len(records)
+        header = self.HEADER.pack(self.MAGIC, len(directory) // self.DIRECTORY_ENTRY.size, record_count,
+                                  len(encoded), directory_offset, records_offset, strings_offset)
+
+        tmp_path = f"{self.file_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(directory)
+            f.write(records)
+            f.write(struct.pack(f'<{len(offsets)}Q', *offsets))
+            for data in encoded:
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        self._record_write('binary_snapshot', size, started)
+        self._close_snapshot()
+        os.replace(tmp_path, self.file_path)
+        self._open_snapshot()
+
+        # 스냅샷에 모두 반영되었으므로 저널을 비움
+        if self._journal_file:
+            self._journal_file.close()
+            self._journal_file = None
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._overrides = {}
+        self.journal_entries = 0
+
+    # 저널
+
+    def _load_journal(self) -> None:
+        """저널의 채팅방별 최신 상태만 기억해 둠 (디코딩은 채팅방을 처음 불러올 때)"""
+        if not os.path.exists(self.journal_path):
+            return
+        valid_length = 0
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # 기록 도중 중단된 마지막 레코드
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                self._overrides[record['chat_id']] = record['schedules']
+                self.journal_entries += 1
+                valid_length += len(line)
+
+        # 깨진 꼬리 레코드를 잘라내어 이후 추가 기록이 이어지도록 함
+        if valid_length != os.path.getsize(self.journal_path):
+            logging.warning(f"저널 끝의 불완전한 레코드를 제거합니다: {self.journal_path}")
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(valid_length)
+
+    def _append_journal(self, records: List[Dict[str, Any]]) -> None:
+        """저널 파일 끝에 채팅방별 상태를 1줄씩 추가 (fsync는 한 번만)"""
+        if self._journal_file is None:
+            self._journal_file = open(self.journal_path, 'ab')
+        started = time.perf_counter()
+        data = ''.join(
+            json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n' for record in records
+        ).encode('utf-8')
+        self._journal_file.write(data)
+        self._journal_file.flush()
+        if Config.JOURNAL_FSYNC:
+            os.fsync(self._journal_file.fileno())
+        self.journal_entries += len(records)
+        self._record_write('journal', len(data), started)
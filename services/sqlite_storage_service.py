@@ -0,0 +1,215 @@
+# services/sqlite_storage_service.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Collection, Dict, List, Optional, Tuple
+from models.recurrence import Recurrence
+from models.schedule import Schedule
+from services.base_storage_service import BaseStorageService
+
+class SQLiteStorageService(BaseStorageService):
+    """일정 1건을 1행으로 저장하는 SQLite 저장소"""
+
+    lazy_load = True
+
+    def __init__(self, db_path: str = "data/schedules.db"):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        # 백그라운드 저장 스레드와 연결을 공유하므로 잠금으로 직렬화
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.ensure_schema()
+
+    def ensure_schema(self) -> None:
+        """테이블과 인덱스가 없으면 생성"""
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS schedules ("
+                " id INTEGER PRIMARY KEY,"
+                " chat_id TEXT NOT NULL,"
+                " title TEXT NOT NULL,"
+                " start_ts INTEGER NOT NULL,"
+                " end_ts INTEGER,"
+                " schedule_id INTEGER,"
+                " recurrence TEXT)"
+            )
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(schedules)")]
+            if 'schedule_id' not in columns:
+                # 번호 컬럼이 없던 DB는 채팅방별 등록 순서대로 번호 부여
+                self.conn.execute("ALTER TABLE schedules ADD COLUMN schedule_id INTEGER")
+                next_ids: Dict[str, int] = {}
+                rows = self.conn.execute("SELECT id, chat_id FROM schedules ORDER BY chat_id, id").fetchall()
+                for row_id, chat_id in rows:
+                    next_ids[chat_id] = next_ids.get(chat_id, 0) + 1
+                    self.conn.execute("UPDATE schedules SET schedule_id = ? WHERE id = ?", (next_ids[chat_id], row_id))
+            if 'recurrence' not in columns:
+                # 반복 규칙 (JSON, 단일 일정은 NULL)
+                self.conn.execute("ALTER TABLE schedules ADD COLUMN recurrence TEXT")
+            self.conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_schedules_chat_schedule ON schedules (chat_id, schedule_id)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_schedules_chat_start ON schedules (chat_id, start_ts)"
+            )
+            # 전체 채팅방 대상 만료 정리용 (종료 시각, 없으면 시작 시각)
+            self.conn.execute("DROP INDEX IF EXISTS idx_schedules_start")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_schedules_expire ON schedules (COALESCE(end_ts, start_ts))"
+            )
+
+    def to_timestamp(self, dt: Optional[datetime]) -> Optional[int]:
+        """datetime을 epoch 초로 변환"""
+        return int(dt.timestamp()) if dt else None
+
+    def row_to_schedule(self, row: tuple) -> Schedule:
+        """(title, start_ts, end_ts, schedule_id, recurrence) 행을 Schedule 객체로 변환"""
+        title, start_ts, end_ts, schedule_id, recurrence = row
+        return Schedule.from_epoch(
+            title, start_ts, end_ts, schedule_id,
+            Recurrence.from_dict(json.loads(recurrence)) if recurrence else None
+        )
+
+    @staticmethod
+    def recurrence_to_column(schedule: Schedule) -> Optional[str]:
+        return json.dumps(schedule.recurrence.to_dict()) if schedule.recurrence else None
+
+    def schedule_to_row(self, chat_id: str, schedule: Schedule) -> tuple:
+        return (chat_id, schedule.title, schedule.start_ts, schedule.end_ts, schedule.id,
+                self.recurrence_to_column(schedule))
+
+    def load_schedules(self) -> Dict[str, List[Schedule]]:
+        """저장된 모든 일정 불러오기"""
+        schedules: Dict[str, List[Schedule]] = {}
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT chat_id, title, start_ts, end_ts, schedule_id, recurrence FROM schedules ORDER BY chat_id, id"
+            ).fetchall()
+        for chat_id, *row in rows:
+            schedules.setdefault(chat_id, []).append(self.row_to_schedule(row))
+        return schedules
+
+    def load_chat(self, chat_id: str) -> List[Schedule]:
+        """특정 채팅방의 일정 불러오기 (등록 순서)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT title, start_ts, end_ts, schedule_id, recurrence FROM schedules WHERE chat_id = ? ORDER BY id",
+                (chat_id,)
+            ).fetchall()
+        return [self.row_to_schedule(row) for row in rows]
+
+    def query_range(self, chat_id: str, start: datetime, end: datetime) -> Optional[List[Schedule]]:
+        """(chat_id, start_ts) 인덱스를 사용한 기간 조회 (기간 전에 시작한 반복 일정도 함께 반환)"""
+        end_ts = self.to_timestamp(end)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT title, start_ts, end_ts, schedule_id, recurrence FROM schedules"
+                " WHERE chat_id = ? AND (start_ts BETWEEN ? AND ?"
+                " OR (recurrence IS NOT NULL AND start_ts <= ?)) ORDER BY start_ts",
+                (chat_id, self.to_timestamp(start), end_ts, end_ts)
+            ).fetchall()
+        return [self.row_to_schedule(row) for row in rows]
+
+    def query_upcoming(self, after: datetime) -> Optional[List[Tuple[str, Schedule]]]:
+        """기준 시각 이후에 시작하는 전체 채팅방의 일정 (반복 일정은 모두)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT chat_id, title, start_ts, end_ts, schedule_id, recurrence FROM schedules"
+                " WHERE start_ts >= ? OR recurrence IS NOT NULL",
+                (self.to_timestamp(after),)
+            ).fetchall()
+        return [(chat_id, self.row_to_schedule(row)) for chat_id, *row in rows]
+
+    def _set_skip_chats(self, skip_chats: Collection[str]) -> str:
+        """제외할 채팅방을 임시 테이블에 넣고 WHERE 절에 덧붙일 조건 반환 (잠금을 잡은 채로 호출)"""
+        if not skip_chats:
+            return ""
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS skip_chats (chat_id TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM skip_chats")
+        self.conn.executemany("INSERT OR IGNORE INTO skip_chats VALUES (?)", ((chat_id,) for chat_id in skip_chats))
+        return " AND chat_id NOT IN (SELECT chat_id FROM skip_chats)"
+
+    def query_before(self, before: datetime, skip_chats: Collection[str] = ()) -> Optional[List[Tuple[str, Schedule]]]:
+        """기준 시각 이전에 끝난 단일 일정 (delete_before와 같은 조건)"""
+        with self._lock, self.conn:
+            rows = self.conn.execute(
+                "SELECT chat_id, title, start_ts, end_ts, schedule_id, recurrence FROM schedules"
+                " WHERE COALESCE(end_ts, start_ts) < ? AND recurrence IS NULL" + self._set_skip_chats(skip_chats),
+                (self.to_timestamp(before),)
+            ).fetchall()
+        return [(chat_id, self.row_to_schedule(row)) for chat_id, *row in rows]
+
+    def delete_before(self, before: datetime, skip_chats: Collection[str] = ()) -> Optional[int]:
+        """기준 시각 이전에 끝난 단일 일정 삭제 (반복 일정과 skip_chats의 채팅방은 메모리의 만료 힙이 처리)"""
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM schedules WHERE COALESCE(end_ts, start_ts) < ? AND recurrence IS NULL"
+                + self._set_skip_chats(skip_chats),
+                (self.to_timestamp(before),)
+            )
+        return cursor.rowcount
+
+    def save_schedules(self, schedules: Dict[str, List[Schedule]]) -> None:
+        """전달된 채팅방들의 일정을 한 트랜잭션으로 교체 저장"""
+        with self._lock, self.conn:
+            self.conn.executemany("DELETE FROM schedules WHERE chat_id = ?", ((chat_id,) for chat_id in schedules))
+            self.conn.executemany(
+                "INSERT INTO schedules (chat_id, title, start_ts, end_ts, schedule_id, recurrence)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (self.schedule_to_row(chat_id, s) for chat_id, chat_schedules in schedules.items()
+                 for s in chat_schedules)
+            )
+
+    def apply_changes(self, schedules: Dict[str, List[Schedule]], changes: List[Dict[str, Any]]) -> None:
+        """변경을 한 트랜잭션에서 해당 행에만 반영"""
+        started = time.perf_counter()
+        with self._lock, self.conn:
+            for change in changes:
+                self._apply_row_change(change)
+        self._record_write('sqlite', None, started)  # 기록 바이트는 SQLite 내부에서 결정됨
+
+    def snapshot(self, schedules: Dict[str, List[Schedule]], changes: List[Dict[str, Any]]) -> Dict[str, List[Schedule]]:
+        """행 단위로 반영하므로 상태 사본이 필요 없음"""
+        return {}
+
+    def _apply_row_change(self, change: Dict[str, Any]) -> None:
+        """변경 1건을 해당 행에만 반영"""
+        op = change['op']
+        chat_id = change.get('chat_id')
+        if op == 'add':
+            self.conn.execute(
+                "INSERT INTO schedules (chat_id, title, start_ts, end_ts, schedule_id, recurrence)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                self.schedule_to_row(chat_id, change['schedule'])
+            )
+        elif op == 'delete':
+            self.conn.execute(
+                "DELETE FROM schedules WHERE chat_id = ? AND schedule_id = ?", (chat_id, change['schedule_id'])
+            )
+        elif op == 'edit':
+            schedule = change['schedule']
+            self.conn.execute(
+                "UPDATE schedules SET title = ?, start_ts = ?, end_ts = ?, recurrence = ?"
+                " WHERE chat_id = ? AND schedule_id = ?",
+                (schedule.title, schedule.start_ts, schedule.end_ts, self.recurrence_to_column(schedule),
+                 chat_id, change['schedule_id'])
+            )
+        elif op == 'clear':
+            self.conn.execute("DELETE FROM schedules WHERE chat_id = ?", (chat_id,))
+        elif op == 'expire':
+            self.conn.executemany(
+                "DELETE FROM schedules WHERE chat_id = ? AND schedule_id = ?",
+                ((chat_id, schedule_id) for schedule_id in change['schedule_ids'])
+            )
+        else:
+            raise ValueError(f"알 수 없는 변경 유형입니다: {op}")
+
+    def close(self) -> None:
+        """DB 연결 닫기"""
+        with self._lock:
+            self.conn.close()
+
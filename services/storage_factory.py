@@ -0,0 +1,39 @@
+# services/storage_factory.py
+from typing import Optional
+from config import Config
+from services.base_storage_service import BaseStorageService
+
+def create_storage_service(backend: Optional[str] = None, path: Optional[str] = None,
+                           write_behind: bool = False) -> BaseStorageService:
+    """설정된 종류의 저장소 생성 (write_behind이면 백그라운드 저장 래퍼 적용)"""
+    storage = _create_backend(backend or Config.STORAGE_BACKEND, path)
+    if write_behind:
+        from services.write_behind_storage_service import WriteBehindStorageService
+        return WriteBehindStorageService(storage)
+    return storage
+
+def default_storage_path(backend: str) -> str:
+    """저장소 종류별 설정된 경로"""
+    paths = {
+        'json': Config.JSON_STORAGE_PATH,
+        'sqlite': Config.SQLITE_STORAGE_PATH,
+        'sharded': Config.SHARD_STORAGE_DIR,
+        'snapshot': Config.SNAPSHOT_STORAGE_PATH,
+    }
+    if backend not in paths:
+        raise ValueError(f"지원하지 않는 저장소 종류입니다: {backend}")
+    return paths[backend]
+
+def _create_backend(backend: str, path: Optional[str]) -> BaseStorageService:
+    path = path or default_storage_path(backend)
+    if backend == 'json':
+        from services.storage_service import StorageService
+        return StorageService(path)
+    if backend == 'sqlite':
+        from services.sqlite_storage_service import SQLiteStorageService
+        return SQLiteStorageService(path)
+    if backend == 'sharded':
+        from services.sharded_storage_service import ShardedStorageService
+        return ShardedStorageService(path)
+    from services.snapshot_storage_service import SnapshotStorageService
+    return SnapshotStorageService(path)
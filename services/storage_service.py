@@ -1,73 +1,197 @@
 # services/storage_service.py
+import glob
 import json
+import logging
 import os
-from datetime import datetime
-from typing import Dict, List
+import time
+from typing import Any, Dict, List, Optional
 from models.schedule import Schedule
 from config import Config
+from services.base_storage_service import BaseStorageService
 
-class StorageService:
-    def __init__(self, file_path: str = "data/schedules.json"):
+class StorageService(BaseStorageService):
+    def __init__(self, file_path: str = "data/schedules.json", journal: Optional[bool] = None,
+                 compact_threshold: Optional[int] = None):
         # data 디렉토리에 저장하도록 경로 수정
         self.file_path = file_path
+        # 저널 모드: 변경 1건당 레코드 1줄을 추가하고, 임계치를 넘으면 스냅샷으로 압축
+        self.journal = Config.STORAGE_JOURNAL if journal is None else journal
+        self.compact_threshold = compact_threshold or Config.JOURNAL_COMPACT_THRESHOLD
+        self.journal_dir = os.path.join(os.path.dirname(self.file_path), 'journal')
+        self.generation = 0
+        self.journal_entries = 0
+        self._journal_file = None
         self.ensure_storage_file()
 
     def ensure_storage_file(self) -> None:
         """스토리지 파일과 디렉토리가 없으면 생성"""
         # 디렉토리 생성
         os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        
+
+        if self.journal:
+            os.makedirs(self.journal_dir, exist_ok=True)
+            return
+
         # 파일이 없으면 생성
         if not os.path.exists(self.file_path):
             self.save_schedules({})
 
-    def datetime_to_str(self, dt: datetime) -> str:
-        """datetime 객체를 문자열로 변환"""
-        return dt.isoformat() if dt else None
-
-    def str_to_datetime(self, dt_str: str) -> datetime:
-        """문자열을 datetime 객체로 변환"""
-        return datetime.fromisoformat(dt_str) if dt_str else None
-
-    def serialize_schedule(self, schedule: Schedule) -> Dict:
-        """Schedule 객체를 JSON 직렬화 가능한 형태로 변환"""
-        return {
-            'title': schedule.title,
-            'datetime': self.datetime_to_str(schedule.datetime),
-            'end_time': self.datetime_to_str(schedule.end_time)
-        }
-
-    def deserialize_schedule(self, data: Dict) -> Schedule:
-        """JSON 데이터를 Schedule 객체로 변환"""
-        return Schedule(
-            title=data['title'],
-            datetime=self.str_to_datetime(data['datetime']),
-            end_time=self.str_to_datetime(data['end_time'])
-        )
-
     def load_schedules(self) -> Dict[str, List[Schedule]]:
         """저장된 모든 일정 불러오기"""
-        try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return {
-                    chat_id: [self.deserialize_schedule(s) for s in schedules]
-                    for chat_id, schedules in data.items()
-                }
-        except FileNotFoundError:
-            return {}
-        except json.JSONDecodeError:
-            print(f"Warning: {self.file_path} is corrupted. Creating new file.")
-            return {}
+        if self.journal:
+            return self._load_journaled()
+        return self._read_snapshot(self.file_path)
 
     def save_schedules(self, schedules: Dict[str, List[Schedule]]) -> None:
         """모든 일정 저장"""
+        if self.journal:
+            self.compact(schedules)
+            return
+
         # 디렉토리가 존재하는지 다시 한번 확인
         os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        
+
+        data = {
+            chat_id: [self.serialize_schedule(s) for s in chat_schedules]
+            for chat_id, chat_schedules in schedules.items()
+        }
+        self._atomic_write_json(self.file_path, data, indent=2)
+
+    def apply_changes(self, schedules: Dict[str, List[Schedule]], changes: List[Dict[str, Any]]) -> None:
+        """변경 반영 (저널 모드면 레코드 추가, 아니면 전체 저장)"""
+        if not self.journal:
+            self.save_schedules(schedules)
+            return
+
+        self._append_journal([self._encode_change(change) for change in changes])
+        if self.journal_entries >= self.compact_threshold:
+            self.compact(schedules)
+
+    def snapshot(self, schedules: Dict[str, List[Schedule]], changes: List[Dict[str, Any]]) -> Dict[str, List[Schedule]]:
+        """백그라운드 저장에 넘길 상태 사본"""
+        if self.journal and self.journal_entries + len(changes) < self.compact_threshold:
+            return {}  # 저널 레코드만 추가하므로 전체 상태가 필요 없음
+        return super().snapshot(schedules, changes)
+
+    def compact(self, schedules: Dict[str, List[Schedule]]) -> None:
+        """저널을 새 스냅샷으로 합치고 다음 세대 저널 시작"""
+        next_generation = self.generation + 1
         data = {
             chat_id: [self.serialize_schedule(s) for s in chat_schedules]
             for chat_id, chat_schedules in schedules.items()
         }
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
\ No newline at end of file
+        # 스냅샷이 rename으로 완성된 시점부터 새 세대가 유효해짐
+        self._atomic_write_json(self._snapshot_path(next_generation), data)
+
+        if self._journal_file:
+            self._journal_file.close()
+            self._journal_file = None
+        previous_generation = self.generation
+        self.generation = next_generation
+        self.journal_entries = 0
+
+        for path in (self._snapshot_path(previous_generation), self._journal_path(previous_generation)):
+            if os.path.exists(path):
+                os.remove(path)
+        logging.info(f"저널 압축 완료 (세대 {self.generation})")
+
+    def close(self) -> None:
+        """열려 있는 저널 파일 닫기"""
+        if self._journal_file:
+            self._journal_file.close()
+            self._journal_file = None
+
+    def _snapshot_path(self, generation: int) -> str:
+        return os.path.join(self.journal_dir, f"snapshot-{generation:08d}.json")
+
+    def _journal_path(self, generation: int) -> str:
+        return os.path.join(self.journal_dir, f"journal-{generation:08d}.jsonl")
+
+    def _latest_generation(self) -> int:
+        """완성된 스냅샷 중 가장 최신 세대 번호"""
+        generations = [
+            int(os.path.basename(path)[len('snapshot-'):-len('.json')])
+            for path in glob.glob(os.path.join(self.journal_dir, 'snapshot-*.json'))
+        ]
+        return max(generations, default=0)
+
+    def _load_journaled(self) -> Dict[str, List[Schedule]]:
+        """최신 스냅샷 위에 저널을 재생하여 복원"""
+        self.generation = self._latest_generation()
+        if self.generation:
+            schedules = self._read_snapshot(self._snapshot_path(self.generation))
+        else:
+            # 저널 모드 최초 실행 시 기존 JSON 파일을 기준 스냅샷으로 사용
+            schedules = self._read_snapshot(self.file_path)
+
+        self.journal_entries = 0
+        journal_path = self._journal_path(self.generation)
+        if not os.path.exists(journal_path):
+            return schedules
+
+        valid_length = 0
+        with open(journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # 기록 도중 중단된 마지막 레코드
+                try:
+                    change = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                self._replay_change(schedules, change)
+                self.journal_entries += 1
+                valid_length += len(line)
+        # 재생 중에는 추가마다 채팅방 전체를 훑지 않도록 ID가 없는 일정은 마지막에 한 번만 채움
+        for chat_schedules in schedules.values():
+            self.assign_missing_ids(chat_schedules)
+
+        # 깨진 꼬리 레코드를 잘라내어 이후 추가 기록이 이어지도록 함
+        if valid_length != os.path.getsize(journal_path):
+            logging.warning(f"저널 끝의 불완전한 레코드를 제거합니다: {journal_path}")
+            with open(journal_path, 'r+b') as f:
+                f.truncate(valid_length)
+        return schedules
+
+    def _encode_change(self, change: Dict[str, Any]) -> Dict[str, Any]:
+        """변경 내용을 저널 레코드로 변환"""
+        record = dict(change)
+        if 'schedule' in record:
+            record['schedule'] = self.serialize_schedule(record['schedule'])
+        return record
+
+    def _replay_change(self, schedules: Dict[str, List[Schedule]], change: Dict[str, Any]) -> None:
+        """저널 레코드 1건을 메모리 상태에 적용"""
+        op = change['op']
+        chat_id = change.get('chat_id')
+        if op == 'add':
+            schedules.setdefault(chat_id, []).append(self.deserialize_schedule(change['schedule']))
+        elif op == 'delete':
+            schedules[chat_id] = [s for s in schedules[chat_id] if s.id != change['schedule_id']]
+        elif op == 'edit':
+            new_schedule = self.deserialize_schedule(change['schedule'])
+            schedules[chat_id] = [
+                new_schedule if s.id == change['schedule_id'] else s for s in schedules[chat_id]
+            ]
+        elif op == 'clear':
+            schedules[chat_id] = []
+        elif op == 'expire':
+            expired_ids = set(change['schedule_ids'])
+            schedules[chat_id] = [s for s in schedules[chat_id] if s.id not in expired_ids]
+        else:
+            logging.warning(f"알 수 없는 저널 레코드: {op}")
+
+    def _append_journal(self, records: List[Dict[str, Any]]) -> None:
+        """저널 파일 끝에 레코드를 1줄씩 추가 (fsync는 한 번만)"""
+        started = time.perf_counter()
+        if self._journal_file is None:
+            os.makedirs(self.journal_dir, exist_ok=True)
+            self._journal_file = open(self._journal_path(self.generation), 'ab')
+        data = ''.join(
+            json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n' for record in records
+        ).encode('utf-8')
+        self._journal_file.write(data)
+        self._journal_file.flush()
+        if Config.JOURNAL_FSYNC:
+            os.fsync(self._journal_file.fileno())
+        self.journal_entries += len(records)
+        self._record_write('journal', len(data), started)
@@ -0,0 +1,77 @@
+# services/title_index.py
+from typing import Dict, Iterable, List, Set, Tuple
+
+class TitleIndex:
+    """일정 제목의 글자 n-gram 역색인 (띄어쓰기 없는 한글도 부분 문자열로 찾음)
+
+    제목을 소문자로 바꾸고 공백을 뺀 뒤 1글자·2글자 조각별로 일정 번호를 모아 둔다.
+    검색어의 2글자 조각 목록 중 가장 짧은 것부터 교집합을 구하고, 조각이 이어지지 않은
+    오탐만 원문 비교로 걸러내므로 조회 비용은 채팅방 전체 일정 수가 아닌 후보 수에 비례한다.
+    """
+
+    def __init__(self, items: Iterable[Tuple[int, str]] = ()):
+        self._postings: Dict[str, Set[int]] = {}
+        self._titles: Dict[int, str] = {}  # 일정 번호별 정규화한 제목
+        for item_id, title in items:
+            self.add(item_id, title)
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return ''.join(text.lower().split())
+
+    @staticmethod
+    def _grams(text: str) -> Set[str]:
+        grams = set(text)
+        grams.update(text[i:i + 2] for i in range(len(text) - 1))
+        return grams
+
+    def add(self, item_id: int, title: str) -> None:
+        normalized = self.normalize(title)
+        self._titles[item_id] = normalized
+        postings = self._postings
+        for gram in self._grams(normalized):
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = {item_id}
+            else:
+                ids.add(item_id)
+
+    def remove(self, item_id: int) -> None:
+        normalized = self._titles.pop(item_id, None)
+        if normalized is None:
+            return
+        postings = self._postings
+        for gram in self._grams(normalized):
+            ids = postings[gram]
+            ids.discard(item_id)
+            if not ids:
+                del postings[gram]
+
+    def search(self, query: str) -> List[int]:
+        """제목에 검색어가 들어 있는 일정 번호 (공백·대소문자 무시, 순서 없음)"""
+        normalized = self.normalize(query)
+        if not normalized:
+            return []
+        if len(normalized) == 1:
+            return list(self._postings.get(normalized, ()))
+
+        grams = {normalized[i:i + 2] for i in range(len(normalized) - 1)}
+        postings = []
+        for gram in grams:
+            ids = self._postings.get(gram)
+            if not ids:
+                return []
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                return []
+        if len(normalized) == 2:
+            return list(candidates)  # 검색어가 2글자 조각 하나뿐이면 원문 비교 불필요
+        titles = self._titles
+        return [item_id for item_id in candidates if normalized in titles[item_id]]
@@ -0,0 +1,79 @@
+# services/update_processor.py
+import logging
+from collections import deque
+from typing import Any, Awaitable, Deque, Dict, Optional
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+from services.metrics_service import metrics
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """채팅방이 다른 업데이트는 동시에, 같은 채팅방의 업데이트는 받은 순서대로 하나씩 처리
+
+    채팅방에 처리 중인 업데이트가 있으면 뒤에 온 업데이트는 그 채팅방 대기열에 넣고 바로 반환한다.
+    처리 중인 작업이 대기열을 이어서 비우므로 한 채팅방이 동시 처리 슬롯을 하나만 차지한다.
+    ScheduleService의 변경은 이벤트 루프 안의 동기 호출이라 서로 끼어들 수 없고,
+    await를 사이에 둔 같은 채팅방의 명령(파일 받은 뒤 추가 등)은 이 순서 보장으로 겹치지 않는다.
+    """
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max_concurrent_updates)
+        self.queues: Dict[int, Deque[Awaitable[Any]]] = {}
+
+        self.processed_count = 0
+        self.queued_count = 0
+        self.max_chat_backlog = 0
+
+        metrics.register_collector('update_backlog', 'gauge', "같은 채팅방의 앞선 처리를 기다리는 업데이트 수",
+                                   lambda: sum(len(queue) for queue in self.queues.values()))
+
+    @staticmethod
+    def _chat_id(update: object) -> Optional[int]:
+        if isinstance(update, Update) and update.effective_chat is not None:
+            return update.effective_chat.id
+        return None
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        chat_id = self._chat_id(update)
+        if chat_id is None:
+            await self._process(coroutine)
+            return
+
+        queue = self.queues.get(chat_id)
+        if queue is not None:
+            queue.append(coroutine)
+            self.queued_count += 1
+            self.max_chat_backlog = max(self.max_chat_backlog, len(queue))
+            return
+
+        queue = self.queues[chat_id] = deque()
+        try:
+            await self._process(coroutine)
+            while queue:
+                await self._process(queue.popleft())
+        finally:
+            del self.queues[chat_id]
+            # 취소로 빠져나온 경우 남은 업데이트를 닫아 경고 없이 정리
+            for pending in queue:
+                pending.close()
+
+    async def _process(self, coroutine: Awaitable[Any]) -> None:
+        try:
+            await coroutine
+        except Exception as e:
+            # 앞선 업데이트의 오류 때문에 같은 채팅방의 뒤 업데이트가 버려지지 않도록 함
+            logging.error(f"업데이트 처리 중 오류 발생: {e}")
+        self.processed_count += 1
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'processed_count': self.processed_count,
+            'queued_count': self.queued_count,
+            'max_chat_backlog': self.max_chat_backlog,
+            'backlog': sum(len(queue) for queue in self.queues.values()),
+        }
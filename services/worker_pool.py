@@ -0,0 +1,274 @@
+# services/worker_pool.py
+import asyncio
+import itertools
+import json
+import logging
+import multiprocessing
+import pickle
+import socket
+from functools import partial
+from typing import Any, Dict, List, Optional, Set, Tuple
+from telegram import Bot, Update
+from telegram.error import NetworkError, TelegramError
+from telegram.ext import Application, ContextTypes
+from telegram.request import BaseRequest, RequestData
+from config import Config
+from services.outbound_dispatcher import OutboundDispatcher
+from services.partition_service import PartitionService
+
+class WorkerChannel:
+    """프로세스 사이 메시지 통로 (4바이트 길이 + pickle, 같은 봇의 프로세스끼리만 사용)"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, sock: socket.socket) -> 'WorkerChannel':
+        return cls(*await asyncio.open_connection(sock=sock))
+
+    def send(self, message: Tuple) -> None:
+        data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+        self.writer.write(len(data).to_bytes(4, 'big') + data)
+
+    async def drain(self) -> None:
+        await self.writer.drain()
+
+    async def recv(self) -> Optional[Tuple]:
+        """다음 메시지 (상대가 연결을 닫았으면 None)"""
+        try:
+            header = await self.reader.readexactly(4)
+            return pickle.loads(await self.reader.readexactly(int.from_bytes(header, 'big')))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class RelayedRequestData:
+    """작업 프로세스에서 넘어온 요청 본문 (HTTPXRequest가 읽는 속성만 가짐)"""
+
+    def __init__(self, json_parameters: Dict[str, str], multipart_data: Optional[Dict[str, Any]]):
+        self.json_parameters = json_parameters
+        self.multipart_data = multipart_data
+        self.contains_files = bool(multipart_data)
+
+
+class RelayRequest(BaseRequest):
+    """작업 프로세스의 Bot API 요청을 앞단 프로세스로 넘기고 응답을 기다리는 요청 객체"""
+
+    def __init__(self, channel: WorkerChannel):
+        self.channel = channel
+        self.pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return None
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_request(self, url: str, method: str, request_data: Optional[RequestData] = None,
+                         read_timeout=BaseRequest.DEFAULT_NONE, write_timeout=BaseRequest.DEFAULT_NONE,
+                         connect_timeout=BaseRequest.DEFAULT_NONE,
+                         pool_timeout=BaseRequest.DEFAULT_NONE) -> Tuple[int, bytes]:
+        request_id = next(self._ids)
+        future = self.pending[request_id] = asyncio.get_running_loop().create_future()
+        self.channel.send((
+            'request', request_id, url, method,
+            request_data.json_parameters if request_data else None,
+            request_data.multipart_data if request_data and request_data.contains_files else None,
+        ))
+        return await future
+
+    def resolve(self, request_id: int, ok: bool, value: Any) -> None:
+        """앞단의 응답 반영 (실패면 앞단에서 난 예외를 그대로 전달)"""
+        future = self.pending.pop(request_id, None)
+        if future is None or future.done():
+            return
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+    def fail_all(self, error: Exception) -> None:
+        for request_id in list(self.pending):
+            self.resolve(request_id, False, error)
+
+
+class WorkerPool:
+    """앞단 프로세스: 업데이트를 chat_id 해시로 작업 프로세스에 보내고, 작업 프로세스들의 API 요청은
+    앞단의 발송 계층 하나로 모아 보냄 (전체 속도 제한이 프로세스 수와 관계없이 지켜짐)
+
+    같은 채팅방의 업데이트는 항상 같은 작업 프로세스로 받은 순서대로 가고,
+    작업 프로세스와 앞단의 발송 계층이 모두 채팅방별 순서를 지키므로 답장 순서도 유지된다.
+    """
+
+    def __init__(self, count: int, outbound_dispatcher: OutboundDispatcher):
+        self.count = count
+        self.outbound_dispatcher = outbound_dispatcher
+        self.processes: List[multiprocessing.Process] = []
+        self.channels: List[WorkerChannel] = []
+        self._readers: List[asyncio.Task] = []
+        self._relays: Set[asyncio.Task] = set()
+        self.bot: Optional[Bot] = None
+
+        self.routed_counts = [0] * count
+        self.relayed_count = 0
+
+    async def start(self, bot: Bot) -> None:
+        """작업 프로세스 시작 (파티션 재분배는 시작 전에 끝나 있어야 함)"""
+        self.bot = bot
+        context = multiprocessing.get_context('spawn')
+        for index in range(self.count):
+            front, back = socket.socketpair()
+            process = context.Process(target=run_worker, args=(index, self.count, back),
+                                      name=f"schedule-worker-{index}", daemon=True)
+            process.start()
+            back.close()
+            channel = await WorkerChannel.open(front)
+            self.processes.append(process)
+            self.channels.append(channel)
+            self._readers.append(asyncio.create_task(self._serve(index, channel)))
+        logging.info(f"작업 프로세스 {self.count}개 시작")
+
+    async def route(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """업데이트를 채팅방이 속한 작업 프로세스로 전달"""
+        chat = update.effective_chat
+        index = PartitionService.partition_of(chat.id, self.count) if chat else 0
+        self.routed_counts[index] += 1
+        channel = self.channels[index]
+        channel.send(('update', update.to_dict()))
+        await channel.drain()  # 작업 프로세스가 밀리면 업데이트 수신도 늦춤
+
+    async def _serve(self, index: int, channel: WorkerChannel) -> None:
+        while (message := await channel.recv()) is not None:
+            if message[0] == 'request':
+                task = asyncio.create_task(self._relay(channel, *message[1:]))
+                self._relays.add(task)
+                task.add_done_callback(self._relays.discard)
+        if self.processes[index].exitcode not in (None, 0):
+            logging.error(f"작업 프로세스 {index}가 비정상 종료되었습니다 (코드 {self.processes[index].exitcode})")
+
+    async def _relay(self, channel: WorkerChannel, request_id: int, url: str, method: str,
+                     json_parameters: Optional[Dict[str, str]], multipart_data: Optional[Dict[str, Any]]) -> None:
+        """작업 프로세스의 요청을 대신 보내고 결과를 돌려줌 (채팅방 대상 호출은 발송 계층을 거침)"""
+        request = self.bot.request
+        try:
+            if method == 'GET':
+                payload = await request.retrieve(url)
+            else:
+                data = RelayedRequestData(json_parameters or {}, multipart_data)
+                call = partial(request.post, url, data)
+                chat_id = data.json_parameters.get('chat_id')
+                if chat_id is not None:
+                    result = await self.outbound_dispatcher.submit(chat_id, call, name=url.rsplit('/', 1)[-1])
+                else:
+                    result = await call()
+                payload = json.dumps({'ok': True, 'result': result}).encode('utf-8')
+            response = ('response', request_id, True, (200, payload))
+        except TelegramError as e:
+            response = ('response', request_id, False, e)
+        except Exception as e:
+            response = ('response', request_id, False, NetworkError(f"앞단 발송 실패: {e}"))
+        self.relayed_count += 1
+        channel.send(response)
+
+    async def stop(self) -> None:
+        """작업 프로세스에 종료를 알리고, 남은 발송을 대신 보내며 종료될 때까지 대기"""
+        for channel in self.channels:
+            channel.send(('stop',))
+        await asyncio.gather(*self._readers)
+        if self._relays:
+            await asyncio.gather(*self._relays)
+        loop = asyncio.get_running_loop()
+        for process in self.processes:
+            await loop.run_in_executor(None, process.join, 30)
+        for channel in self.channels:
+            await channel.close()
+        logging.info(f"작업 프로세스 종료 (채팅방별 전달 {self.routed_counts}, 대신 보낸 요청 {self.relayed_count}건)")
+
+
+def run_worker(index: int, count: int, sock: socket.socket) -> None:
+    """작업 프로세스 진입점: 자기 파티션의 일정만 메모리와 저장소에 두고 명령어를 처리"""
+    logging.basicConfig(
+        format=f'%(asctime)s - worker-{index} - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO,
+        force=True  # spawn으로 다시 읽힌 main 모듈의 설정 대신 작업 프로세스 번호를 붙인 형식 사용
+    )
+    asyncio.run(_run_worker(index, count, sock))
+
+async def _run_worker(index: int, count: int, sock: socket.socket) -> None:
+    from handlers.command_handlers import CommandHandlers, register_handlers
+    from services.message_service import MessageService
+    from services.metrics_service import MetricsServer, metrics
+    from services.pinned_digest_service import PinnedDigestService
+    from services.schedule_service import ScheduleService
+    from services.storage_factory import create_storage_service
+    from services.update_processor import ChatOrderedUpdateProcessor
+
+    storage_path = PartitionService(count).use_partition(index)
+    channel = await WorkerChannel.open(sock)
+    relay = RelayRequest(channel)
+    stopping = asyncio.Event()
+
+    storage_service = create_storage_service(path=storage_path, write_behind=Config.WRITE_BEHIND)
+    schedule_service = ScheduleService(storage_service)
+    # 속도 제한과 재시도는 앞단의 발송 계층이 맡고, 여기서는 채팅방별 순서와 병합만 유지
+    outbound_dispatcher = OutboundDispatcher(global_rate=1e9, chat_rate=1e9, chat_burst=1e9, max_retries=0)
+    command_handlers = CommandHandlers(schedule_service, MessageService(), PinnedDigestService(), outbound_dispatcher)
+    application = (
+        Application.builder()
+        .token(Config.TELEGRAM_BOT_TOKEN)
+        .base_url(Config.TELEGRAM_BASE_URL)
+        .request(relay)
+        .get_updates_request(relay)
+        .updater(None)
+        .concurrent_updates(ChatOrderedUpdateProcessor(Config.CONCURRENT_UPDATES))
+        .build()
+    )
+    register_handlers(application, command_handlers)
+    metrics_server = MetricsServer(metrics, Config.METRICS_HOST, Config.METRICS_PORT + 1 + index) \
+        if Config.METRICS_PORT else None
+
+    async def receive():
+        # 종료 중에도 남은 발송의 응답을 받아야 하므로 연결이 닫힐 때까지 계속 읽음
+        while (message := await channel.recv()) is not None:
+            if message[0] == 'update':
+                application.update_queue.put_nowait(Update.de_json(message[1], application.bot))
+            elif message[0] == 'response':
+                relay.resolve(*message[1:])
+            elif message[0] == 'stop':
+                stopping.set()
+        relay.fail_all(NetworkError("앞단 프로세스와의 연결이 끊어졌습니다."))
+        stopping.set()
+
+    receiver = asyncio.create_task(receive())
+    async with application:
+        await storage_service.start()
+        if metrics_server:
+            await metrics_server.start()
+        await application.start()
+        await schedule_service.reminder_service.start(
+            partial(command_handlers.send_reminder, application.bot),
+            schedule_service.get_schedule
+        )
+        await stopping.wait()
+
+        await schedule_service.reminder_service.stop()
+        await application.stop()
+        await outbound_dispatcher.stop()
+        await storage_service.stop()
+        if metrics_server:
+            await metrics_server.stop()
+    await channel.close()
+    receiver.cancel()
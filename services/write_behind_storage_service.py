@@ -0,0 +1,191 @@
+# services/write_behind_storage_service.py
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Collection, Dict, List, Optional, Set, Tuple
+from models.schedule import Schedule
+from config import Config
+from services.base_storage_service import BaseStorageService
+from services.metrics_service import metrics
+
+class WriteBehindStorageService(BaseStorageService):
+    """변경을 모아 두었다가 이벤트 루프 밖(스레드)에서 한 번에 저장하는 저장소 래퍼"""
+
+    def __init__(self, storage: BaseStorageService, interval: Optional[float] = None,
+                 max_pending: Optional[int] = None):
+        self.storage = storage
+        self.interval = Config.WRITE_BEHIND_INTERVAL if interval is None else interval
+        self.max_pending = max_pending or Config.WRITE_BEHIND_MAX_PENDING
+        self.pending: List[Dict[str, Any]] = []
+        self.after_save: List[Callable[[], None]] = []  # 대기 중인 변경이 저장된 뒤 실행할 작업
+        self.schedules: Dict[str, List[Schedule]] = {}
+        self._dirty_event: Optional[asyncio.Event] = None
+        self._full_event: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # 튜닝용 지표
+        self.flush_count = 0
+        self.flushed_changes = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+
+    @property
+    def lazy_load(self) -> bool:
+        return self.storage.lazy_load
+
+    def load_schedules(self) -> Dict[str, List[Schedule]]:
+        return self.storage.load_schedules()
+
+    def load_chat(self, chat_id: str) -> List[Schedule]:
+        return self.storage.load_chat(chat_id)
+
+    def query_range(self, chat_id: str, start: datetime, end: datetime) -> Optional[List[Schedule]]:
+        return self.storage.query_range(chat_id, start, end)
+
+    def delete_before(self, before: datetime, skip_chats: Collection[str] = ()) -> Optional[int]:
+        return self.storage.delete_before(before, skip_chats)
+
+    def query_before(self, before: datetime, skip_chats: Collection[str] = ()) -> Optional[List[Tuple[str, Schedule]]]:
+        return self.storage.query_before(before, skip_chats)
+
+    def query_upcoming(self, after: datetime) -> Optional[List[Tuple[str, Schedule]]]:
+        return self.storage.query_upcoming(after)
+
+    def pending_chats(self) -> Set[str]:
+        return {change['chat_id'] for change in self.pending if 'chat_id' in change} | self.storage.pending_chats()
+
+    def save_schedules(self, schedules: Dict[str, List[Schedule]]) -> None:
+        """전체 저장은 대기 중인 변경을 버리고 즉시 수행"""
+        self.pending.clear()
+        self.storage.save_schedules(schedules)
+        callbacks, self.after_save = self.after_save, []
+        for callback in callbacks:
+            super().run_after_save(callback)
+
+    def run_after_save(self, callback: Callable[[], None]) -> None:
+        """대기 중인 변경이 저장된 뒤 스레드 풀에서 callback 실행 (저장에 실패하면 다시 시도한 저장 뒤에)"""
+        if not self.pending:
+            super().run_after_save(callback)
+            return
+        self.after_save.append(callback)
+
+    def apply_changes(self, schedules: Dict[str, List[Schedule]], changes: List[Dict[str, Any]]) -> None:
+        """변경을 대기열에 넣고 백그라운드 저장을 예약"""
+        self.schedules = schedules
+        self.pending.extend(changes)
+        if self._dirty_event is None:
+            return  # 루프 시작 전 변경은 start() 이후 첫 저장에 포함됨
+        self._dirty_event.set()
+        if len(self.pending) >= self.max_pending:
+            self._full_event.set()
+
+    async def start(self) -> None:
+        """백그라운드 저장 태스크 시작"""
+        self._dirty_event = asyncio.Event()
+        self._full_event = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        if self.pending:
+            self._dirty_event.set()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """백그라운드 태스크가 진행 중인 저장을 마치고 끝나길 기다린 뒤 남은 변경을 마지막으로 저장"""
+        if self._task:
+            # 취소하면 스레드에서 저장 중인 변경과 after_save 작업을 잃고 저장이 겹칠 수 있으므로 스스로 끝나게 함
+            self._stopping = True
+            self._dirty_event.set()
+            self._full_event.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        logging.info(f"백그라운드 저장 통계: {self.stats()}")
+        self.storage.close()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            await self._dirty_event.wait()
+            # 디바운스 간격 동안 변경을 모으되, 대기열이 가득 차면 바로 저장
+            try:
+                await asyncio.wait_for(self._full_event.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping:
+                return  # 남은 변경은 stop()이 저장
+            try:
+                await self.flush()
+            except Exception as e:
+                logging.error(f"백그라운드 저장 실패: {e}")
+
+    async def flush(self) -> None:
+        """대기 중인 변경을 스레드 풀에서 한 번에 저장"""
+        if self._flush_lock is None:
+            self.flush_sync()
+            return
+
+        async with self._flush_lock:
+            if not self.pending:
+                return
+            changes, self.pending = self.pending, []
+            callbacks, self.after_save = self.after_save, []
+            self._dirty_event.clear()
+            self._full_event.clear()
+            # 상태 사본은 루프 안에서 떠서 스레드가 변경 중인 목록을 읽지 않도록 함
+            snapshot = self.storage.snapshot(self.schedules, changes)
+
+            started = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self.storage.apply_changes, snapshot, changes)
+            except Exception:
+                # 실패한 변경은 다음 저장 때 다시 시도
+                self.pending[:0] = changes
+                self.after_save[:0] = callbacks
+                self._dirty_event.set()
+                raise
+            self._record_flush(len(changes), time.perf_counter() - started)
+            if callbacks:
+                await loop.run_in_executor(None, self._run_callbacks, callbacks)
+
+    def flush_sync(self) -> None:
+        """이벤트 루프 없이 대기 중인 변경 저장"""
+        if not self.pending:
+            return
+        changes, self.pending = self.pending, []
+        callbacks, self.after_save = self.after_save, []
+        started = time.perf_counter()
+        self.storage.apply_changes(self.schedules, changes)
+        self._record_flush(len(changes), time.perf_counter() - started)
+        self._run_callbacks(callbacks)
+
+    def _run_callbacks(self, callbacks: List[Callable[[], None]]) -> None:
+        for callback in callbacks:
+            self._run_callback(callback)
+
+    def close(self) -> None:
+        self.flush_sync()
+        self.storage.close()
+
+    def _record_flush(self, change_count: int, elapsed: float) -> None:
+        metrics.observe('storage_flush_duration_seconds', elapsed)
+        self.flush_count += 1
+        self.flushed_changes += change_count
+        self.last_flush_seconds = elapsed
+        self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+        self.total_flush_seconds += elapsed
+        logging.debug(f"일정 {change_count}건 저장 ({elapsed * 1000:.1f}ms)")
+
+    def stats(self) -> Dict[str, float]:
+        """저장 지연 시간과 병합 비율 (변경 수 / 저장 횟수)"""
+        return {
+            'flush_count': self.flush_count,
+            'flushed_changes': self.flushed_changes,
+            'pending_changes': len(self.pending),
+            'coalescing_ratio': self.flushed_changes / self.flush_count if self.flush_count else 0.0,
+            'last_flush_ms': self.last_flush_seconds * 1000,
+            'avg_flush_ms': self.total_flush_seconds / self.flush_count * 1000 if self.flush_count else 0.0,
+            'max_flush_ms': self.max_flush_seconds * 1000,
+        }
@@ -0,0 +1,74 @@
+# tests/test_ical_service.py
+from datetime import date, datetime
+from config import Config
+from models.recurrence import Recurrence
+from models.schedule import Schedule
+from services.ical_service import ICalService
+
+TZ = Config.TIMEZONE
+
+def _event(*lines):
+    return ['BEGIN:VCALENDAR', 'BEGIN:VEVENT', *lines, 'END:VEVENT', 'END:VCALENDAR']
+
+def test_parses_timezones_all_day_and_folded_summary():
+    service = ICalService()
+    lines = [
+        'BEGIN:VCALENDAR\r\n',
+        'BEGIN:VEVENT\r\n', 'DTSTART:20260302T000000Z\r\n', 'DTEND:20260302T010000Z\r\n',
+        'SUMMARY:주간\\, 회의\r\n', ' 준비\r\n', 'END:VEVENT\r\n',
+        'BEGIN:VEVENT\r\n', 'DTSTART;TZID=America/New_York:20260302T090000\r\n',
+        'SUMMARY:뉴욕\r\n', 'END:VEVENT\r\n',
+        'BEGIN:VEVENT\r\n', 'DTSTART;VALUE=DATE:20260303\r\n', 'DTEND;VALUE=DATE:20260304\r\n',
+        'END:VEVENT\r\n',
+        'END:VCALENDAR\r\n',
+    ]
+    first, second, third = service.iter_events(lines)
+    assert first.title == '주간, 회의준비'
+    assert first.datetime == TZ.localize(datetime(2026, 3, 2, 9))
+    assert first.end_time == TZ.localize(datetime(2026, 3, 2, 10))
+    assert second.datetime == TZ.localize(datetime(2026, 3, 2, 23))
+    assert (third.title, third.datetime, third.end_time) == ('(제목 없음)', TZ.localize(datetime(2026, 3, 3)), None)
+    assert service.skipped_count == 0
+
+def test_parses_rrule_with_exdates():
+    service = ICalService()
+    [schedule] = service.iter_events(_event(
+        'DTSTART:20260302T000000Z',
+        'RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;COUNT=6',
+        'EXDATE:20260304T000000Z,20260316T000000Z',
+        'SUMMARY:격주 회의',
+    ))
+    recurrence = schedule.recurrence
+    assert (recurrence.freq, recurrence.interval, recurrence.weekdays, recurrence.count) == ('weekly', 2, [0, 2], 6)
+    assert recurrence.exceptions == [date(2026, 3, 4), date(2026, 3, 16)]
+
+def test_invalid_events_are_skipped_and_counted():
+    service = ICalService()
+    lines = (
+        _event('DTSTART:20260302T000000Z', 'RRULE:FREQ=DAILY;INTERVAL=0', 'SUMMARY:간격 0')
+        + _event('DTSTART:20260302T000000Z', 'RRULE:FREQ=DAILY;COUNT=0', 'SUMMARY:횟수 0')
+        + _event('DTSTART:20260302T000000Z', 'RRULE:FREQ=YEARLY', 'SUMMARY:매년')
+        + _event('DTSTART:20260302T000000Z', 'RRULE:FREQ=MONTHLY;BYMONTHDAY=1', 'SUMMARY:규칙')
+        + _event('SUMMARY:시작 없음')
+        + _event('DTSTART:20260302T000000Z', 'SUMMARY:정상')
+    )
+    assert [s.title for s in service.iter_events(lines)] == ['정상']
+    assert service.skipped_count == 5
+
+def test_export_then_import_round_trip():
+    service = ICalService()
+    start = TZ.localize(datetime(2026, 3, 2, 9, 30))
+    schedules = [
+        Schedule('회의; 준비, 자료\n확인', start, TZ.localize(datetime(2026, 3, 2, 11)), id=1),
+        Schedule('긴 제목 ' * 20, start, id=2, recurrence=Recurrence(
+            'weekly', interval=2, weekdays=[0, 4], until=date(2026, 6, 30), exceptions=[date(2026, 3, 16)])),
+        Schedule('월간', start, id=3, recurrence=Recurrence('monthly', count=12)),
+    ]
+    document = ''.join(service.iter_export('1', schedules))
+    assert all(len(line.encode('utf-8')) <= ICalService.FOLD_OCTETS for line in document.split('\r\n'))
+
+    imported = list(service.iter_events(document.splitlines(keepends=True)))
+    assert [(s.title, s.start_ts, s.end_ts) for s in imported] == [(s.title, s.start_ts, s.end_ts) for s in schedules]
+    assert [s.recurrence and s.recurrence.to_dict() for s in imported] == [
+        s.recurrence and s.recurrence.to_dict() for s in schedules]
+    assert service.skipped_count == 0
@@ -0,0 +1,46 @@
+# tests/test_interval_tree.py
+import random
+from services.interval_tree import IntervalTree
+
+def _brute_force(items, start, end):
+    return sorted(item for item in items if item[0] < end and start < item[2])
+
+def test_overlapping_matches_brute_force():
+    rng = random.Random(7)
+    items = []
+    for item_id in range(500):
+        start = rng.randint(0, 10000)
+        items.append((start, item_id, start + rng.choice([0, 1, 30, 600, 5000])))
+    items.sort()
+    tree = IntervalTree(items)
+    assert len(tree) == len(items)
+    for _ in range(300):
+        start = rng.randint(-100, 10100)
+        end = start + rng.randint(1, 800)
+        assert sorted(tree.overlapping(start, end)) == _brute_force(items, start, end)
+
+def test_half_open_bounds():
+    tree = IntervalTree([(10, 1, 20)])
+    assert tree.overlapping(20, 30) == []
+    assert tree.overlapping(0, 10) == []
+    assert tree.overlapping(19, 21) == [(10, 1, 20)]
+
+def test_insert_and_remove_keep_results_consistent():
+    rng = random.Random(11)
+    items = set()
+    tree = IntervalTree([])
+    for item_id in range(400):
+        start = rng.randint(0, 5000)
+        item = (start, item_id, start + rng.randint(1, 300))
+        tree.insert(*item)
+        items.add(item)
+        if items and rng.random() < 0.3:
+            victim = rng.choice(sorted(items))
+            assert tree.remove(victim[0], victim[1])
+            items.discard(victim)
+    assert not tree.remove(-1, -1)
+    assert len(tree) == len(items)
+    for _ in range(200):
+        start = rng.randint(0, 5000)
+        end = start + rng.randint(1, 500)
+        assert sorted(tree.overlapping(start, end)) == _brute_force(items, start, end)
@@ -0,0 +1,148 @@
+# tests/test_outbound_dispatcher.py
+import asyncio
+import pytest
+from telegram.error import BadRequest, RetryAfter, TimedOut
+from services.outbound_dispatcher import OutboundDispatcher
+
+class FakeClock:
+    """sleep하면 그만큼 시각이 흐르는 가짜 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+def _dispatcher(clock, **kwargs):
+    options = dict(global_rate=1000, chat_rate=1000, chat_burst=1000, coalesce_window=0.01, max_retries=2)
+    options.update(kwargs)
+    return OutboundDispatcher(clock=clock, sleep=clock.sleep, **options)
+
+def test_retry_after_blocks_sending_and_retries():
+    clock = FakeClock()
+
+    async def scenario():
+        dispatcher = _dispatcher(clock)
+        calls = []
+
+        async def send():
+            calls.append(clock())
+            if len(calls) == 1:
+                raise RetryAfter(5)
+            return 'ok'
+
+        assert await dispatcher.submit('1', send) == 'ok'
+        return dispatcher, calls
+
+    dispatcher, calls = asyncio.run(scenario())
+    assert dispatcher.blocked_until == 5.0
+    assert calls[1] >= 5.0
+    assert (dispatcher.retry_count, dispatcher.sent_count, dispatcher.dropped_count) == (1, 1, 0)
+
+def test_network_errors_give_up_after_max_retries():
+    clock = FakeClock()
+
+    async def scenario():
+        dispatcher = _dispatcher(clock, max_retries=2)
+        attempts = []
+
+        async def send():
+            attempts.append(clock())
+            raise TimedOut()
+
+        with pytest.raises(TimedOut):
+            await dispatcher.submit('1', send)
+        return dispatcher, attempts
+
+    dispatcher, attempts = asyncio.run(scenario())
+    assert len(attempts) == 3
+    assert clock.slept[:3] == [1, 2, 4]  # 지수 백오프
+    assert dispatcher.dropped_count == 1
+
+def test_bad_request_is_not_retried():
+    clock = FakeClock()
+
+    async def scenario():
+        dispatcher = _dispatcher(clock)
+        attempts = []
+
+        async def send():
+            attempts.append(1)
+            raise BadRequest('Message is not modified')
+
+        with pytest.raises(BadRequest):
+            await dispatcher.submit('1', send)
+        return dispatcher, attempts
+
+    dispatcher, attempts = asyncio.run(scenario())
+    assert len(attempts) == 1
+    assert (dispatcher.retry_count, dispatcher.dropped_count) == (0, 1)
+
+def test_coalesced_jobs_run_only_the_last_call():
+    clock = FakeClock()
+
+    async def scenario():
+        dispatcher = _dispatcher(clock)
+        sent = []
+
+        def edit(text):
+            async def call():
+                sent.append(text)
+                return text
+            return call
+
+        futures = [dispatcher.submit('1', edit(f'page{i}'), coalesce_key='list') for i in range(5)]
+        other = dispatcher.submit('2', edit('other'), coalesce_key='list')
+        results = await asyncio.gather(*futures, other)
+        await dispatcher.stop()
+        return dispatcher, sent, results
+
+    dispatcher, sent, results = asyncio.run(scenario())
+    assert sorted(sent) == ['other', 'page4']
+    assert results == ['page4'] * 5 + ['other']
+    assert dispatcher.merged_count == 4
+    assert dispatcher.queue_depth() == 0
+
+def test_jobs_for_one_chat_run_in_order():
+    clock = FakeClock()
+
+    async def scenario():
+        dispatcher = _dispatcher(clock, chat_rate=1, chat_burst=1)
+        order = []
+
+        def job(i):
+            async def call():
+                order.append(i)
+            return call
+
+        await asyncio.gather(*(dispatcher.submit('1', job(i)) for i in range(5)))
+        return order
+
+    assert asyncio.run(scenario()) == [0, 1, 2, 3, 4]
+    assert clock.now >= 4  # 채팅방 속도 제한 (초당 1건)
+
+def test_idle_chat_buckets_are_pruned():
+    clock = FakeClock()
+
+    async def scenario():
+        dispatcher = _dispatcher(clock, global_rate=10 ** 6, chat_rate=1, chat_burst=1)
+        dispatcher._bucket_sweep_at = 8
+
+        async def send():
+            return None
+
+        for chat in range(8):
+            await dispatcher.submit(str(chat), send)
+        clock.now += 10  # 버킷이 다시 가득 참
+        await dispatcher.submit('new', send)
+        return dispatcher
+
+    dispatcher = asyncio.run(scenario())
+    assert list(dispatcher.chat_buckets) == ['new']
+    assert dispatcher.stats()['chat_buckets'] == 1
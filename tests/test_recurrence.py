@@ -0,0 +1,123 @@
+# tests/test_recurrence.py
+import random
+import time
+from datetime import date, datetime, timedelta
+import pytest
+from config import Config
+from models.recurrence import LAST_DATE, Recurrence
+from services.date_service import DateService
+
+TZ = Config.TIMEZONE
+
+def _brute_force(recurrence, first, limit=3000):
+    """후보 날짜를 처음부터 하나씩 세어 만든 회차 목록 (비교 기준)"""
+    starts = []
+    emitted = 0
+    exceptions = set(recurrence.exceptions)
+    for day in recurrence._iter_dates(first.date(), 0):
+        if recurrence.until and day > recurrence.until:
+            break
+        if recurrence.count is not None and emitted >= recurrence.count:
+            break
+        emitted += 1
+        if day in exceptions:
+            continue
+        starts.append(TZ.localize(datetime.combine(day, first.time().replace(tzinfo=None))))
+        if len(starts) >= limit:
+            break
+    return starts
+
+def _random_case(rng):
+    freq = rng.choice(Recurrence.FREQUENCIES)
+    first = TZ.localize(datetime(rng.randint(1999, 2030), rng.randint(1, 12), 1, 9, 30))
+    try:
+        first = first.replace(day=rng.choice([1, 15, 28, 29, 30, 31]))
+    except ValueError:
+        pass
+    weekdays = rng.sample(range(7), rng.randint(0, 3)) if freq == 'weekly' else []
+    count = rng.choice([None, 1, 2, 5, 17, 40])
+    until = None
+    if count is None or rng.random() < 0.5:
+        until = first.date() + timedelta(days=rng.randint(-5, 1500))
+    recurrence = Recurrence(freq, rng.randint(1, 13), weekdays, until, count, [])
+    starts = _brute_force(recurrence, first)
+    if starts and rng.random() < 0.5:
+        recurrence.exceptions = rng.sample([s.date() for s in starts], min(len(starts), rng.randint(1, 3)))
+    return recurrence, first
+
+def test_monthly_skips_months_without_the_day():
+    first = TZ.localize(datetime(2026, 1, 31, 9))
+    starts = list(Recurrence('monthly', count=3).iter_starts(first))
+    # 날짜가 없는 달은 회차로 세지 않음
+    assert [s.date() for s in starts] == [date(2026, 1, 31), date(2026, 3, 31), date(2026, 5, 31)]
+
+def test_weekly_weekdays_and_exceptions():
+    first = TZ.localize(datetime(2026, 3, 4, 18))  # 수요일
+    recurrence = Recurrence('weekly', interval=2, weekdays=[0, 2, 4], count=5, exceptions=[date(2026, 3, 6)])
+    starts = [s.date() for s in recurrence.iter_starts(first)]
+    # 제외한 날짜도 횟수에 포함
+    assert starts == [date(2026, 3, 4), date(2026, 3, 16), date(2026, 3, 18), date(2026, 3, 20)]
+    assert recurrence.last_start(first).date() == date(2026, 3, 20)
+
+def test_last_start_and_window_match_brute_force():
+    rng = random.Random(1)
+    for _ in range(1500):
+        recurrence, first = _random_case(rng)
+        starts = _brute_force(recurrence, first)
+        assert recurrence.last_start(first) == (starts[-1] if starts else None), (recurrence, first)
+
+        window_start = first + timedelta(days=rng.randint(-10, 900))
+        window_end = window_start + timedelta(days=rng.randint(0, 120))
+        expected = [s for s in starts if window_start <= s <= window_end]
+        assert list(recurrence.iter_between(first, window_start, window_end)) == expected, (recurrence, first)
+
+def test_last_start_is_none_when_every_occurrence_is_excluded():
+    first = TZ.localize(datetime(2026, 3, 2, 9))
+    recurrence = Recurrence('daily', count=2, exceptions=[date(2026, 3, 2), date(2026, 3, 3)])
+    assert recurrence.last_start(first) is None
+    assert Recurrence('daily').last_start(first) is None
+
+@pytest.mark.parametrize('kwargs', [
+    {'interval': 0}, {'interval': -1}, {'count': 0}, {'count': -3}, {'interval': True},
+])
+def test_invalid_interval_or_count_is_rejected(kwargs):
+    with pytest.raises(ValueError):
+        Recurrence('daily', **kwargs)
+
+@pytest.mark.parametrize('recurrence', [
+    Recurrence('daily', count=10 ** 9),
+    Recurrence('daily', until=date(9999, 12, 31)),
+    Recurrence('weekly', weekdays=[0, 6], until=date(9999, 12, 31)),
+    Recurrence('weekly', count=10 ** 9),
+    Recurrence('monthly', until=date(9999, 12, 31)),
+    Recurrence('monthly', interval=7, count=10 ** 6),
+])
+def test_huge_count_or_until_is_computed_without_iterating(recurrence):
+    first = TZ.localize(datetime(2026, 1, 31, 9))
+    started = time.perf_counter()
+    last = recurrence.last_start(first)
+    assert time.perf_counter() - started < 0.5
+    assert last is not None and last.date() <= LAST_DATE
+
+def test_window_near_the_last_supported_date():
+    first = TZ.localize(datetime(2026, 1, 31, 9))
+    recurrence = Recurrence('daily', until=date(9999, 12, 31))
+    window = list(recurrence.iter_between(first, TZ.localize(datetime(9999, 12, 29)),
+                                          TZ.localize(datetime(9999, 12, 30, 12))))
+    assert [s.date() for s in window] == [date(9999, 12, 29), date(9999, 12, 30)]
+    assert list(Recurrence('monthly')._iter_dates(date(9990, 1, 31), 0))[-1] == date(9999, 12, 31)
+
+@pytest.mark.parametrize('args', [
+    ['매일', 'every=0'],
+    ['매일', 'count=0'],
+    ['매일', f'count={Config.RECURRENCE_MAX_COUNT + 1}'],
+    ['매일', f'until={datetime.now(TZ).year + Config.RECURRENCE_MAX_YEARS + 1}-01-01'],
+])
+def test_date_service_rejects_out_of_range_options(args):
+    with pytest.raises(ValueError):
+        DateService.parse_recurrence(args)
+
+def test_date_service_parses_options():
+    recurrence, rest = DateService.parse_recurrence(['매주:월,수', 'every=2', 'count=10', '회의'])
+    assert (recurrence.freq, recurrence.interval, recurrence.weekdays, recurrence.count) == ('weekly', 2, [0, 2], 10)
+    assert rest == ['회의']
@@ -0,0 +1,111 @@
+# tests/test_storage_journal.py
+import os
+from datetime import datetime, timedelta
+from config import Config
+from models.schedule import Schedule
+from services.storage_service import StorageService
+
+BASE = Config.TIMEZONE.localize(datetime(2026, 3, 2, 9))
+
+def _add(storage, schedules, chat_id, schedule):
+    schedules.setdefault(chat_id, []).append(schedule)
+    storage.apply_changes(schedules, [{'op': 'add', 'chat_id': chat_id, 'schedule': schedule}])
+
+def _summary(schedules):
+    return {chat_id: [(s.id, s.title, s.start_ts) for s in chat_schedules]
+            for chat_id, chat_schedules in schedules.items()}
+
+def test_replay_applies_every_operation(tmp_path):
+    path = str(tmp_path / 'schedules.json')
+    storage = StorageService(path, journal=True, compact_threshold=1000)
+    schedules = {}
+    for i in range(5):
+        _add(storage, schedules, '1', Schedule(f'일정{i}', BASE + timedelta(hours=i), id=i + 1))
+    _add(storage, schedules, '2', Schedule('다른 방', BASE, id=1))
+
+    schedules['1'] = [s for s in schedules['1'] if s.id != 2]
+    storage.apply_changes(schedules, [{'op': 'delete', 'chat_id': '1', 'schedule_id': 2}])
+    edited = Schedule('수정됨', BASE + timedelta(days=1), id=3)
+    schedules['1'] = [edited if s.id == 3 else s for s in schedules['1']]
+    storage.apply_changes(schedules, [{'op': 'edit', 'chat_id': '1', 'schedule_id': 3, 'schedule': edited}])
+    schedules['1'] = [s for s in schedules['1'] if s.id not in (4, 5)]
+    storage.apply_changes(schedules, [{'op': 'expire', 'chat_id': '1', 'schedule_ids': [4, 5]}])
+    schedules['2'] = []
+    storage.apply_changes(schedules, [{'op': 'clear', 'chat_id': '2'}])
+    storage.close()
+
+    reloaded = StorageService(path, journal=True, compact_threshold=1000)
+    assert _summary(reloaded.load_schedules()) == _summary(schedules)
+    assert reloaded.journal_entries == 10
+    reloaded.close()
+
+def test_truncated_tail_is_dropped_and_journal_continues(tmp_path):
+    path = str(tmp_path / 'schedules.json')
+    storage = StorageService(path, journal=True, compact_threshold=1000)
+    schedules = {}
+    for i in range(3):
+        _add(storage, schedules, '1', Schedule(f'일정{i}', BASE + timedelta(hours=i), id=i + 1))
+    storage.close()
+
+    # 기록 도중 죽은 것처럼 마지막 레코드를 반쯤만 남김
+    journal_path = storage._journal_path(storage.generation)
+    with open(journal_path, 'ab') as f:
+        f.write('{"op":"add","chat_id":"1","schedule":{"title":"잘'.encode('utf-8'))
+
+    recovered = StorageService(path, journal=True, compact_threshold=1000)
+    loaded = recovered.load_schedules()
+    assert _summary(loaded) == _summary(schedules)
+    with open(journal_path, 'rb') as f:
+        assert f.read().endswith(b'\n')
+
+    # 잘라낸 뒤 추가한 레코드가 다음 재생에 이어서 읽혀야 함
+    _add(recovered, loaded, '1', Schedule('복구 후', BASE + timedelta(days=2), id=4))
+    recovered.close()
+    again = StorageService(path, journal=True, compact_threshold=1000)
+    assert _summary(again.load_schedules()) == _summary(loaded)
+    again.close()
+
+def test_replay_assigns_missing_ids_after_all_records(tmp_path):
+    path = str(tmp_path / 'schedules.json')
+    storage = StorageService(path, journal=True, compact_threshold=1000)
+    schedules = {}
+    _add(storage, schedules, '1', Schedule('번호 없음', BASE))
+    _add(storage, schedules, '1', Schedule('번호 있음', BASE, id=7))
+    storage.close()
+
+    loaded = StorageService(path, journal=True, compact_threshold=1000).load_schedules()
+    assert [(s.title, s.id) for s in loaded['1']] == [('번호 없음', 8), ('번호 있음', 7)]
+
+def test_compaction_writes_snapshot_and_starts_new_generation(tmp_path):
+    path = str(tmp_path / 'schedules.json')
+    storage = StorageService(path, journal=True, compact_threshold=4)
+    schedules = {}
+    for i in range(6):
+        _add(storage, schedules, '1', Schedule(f'일정{i}', BASE + timedelta(hours=i), id=i + 1))
+    assert storage.generation == 1
+    assert storage.journal_entries == 2
+    assert not os.path.exists(storage._journal_path(0))
+    assert os.path.exists(storage._snapshot_path(1))
+    storage.close()
+
+    reloaded = StorageService(path, journal=True, compact_threshold=4)
+    assert _summary(reloaded.load_schedules()) == _summary(schedules)
+    assert reloaded.generation == 1
+    reloaded.close()
+
+def test_unfinished_compaction_falls_back_to_previous_generation(tmp_path):
+    path = str(tmp_path / 'schedules.json')
+    storage = StorageService(path, journal=True, compact_threshold=1000)
+    schedules = {}
+    for i in range(3):
+        _add(storage, schedules, '1', Schedule(f'일정{i}', BASE + timedelta(hours=i), id=i + 1))
+    storage.close()
+
+    # rename 전에 죽은 압축은 임시 파일만 남기므로 이전 세대 저널로 복원되어야 함
+    with open(os.path.join(storage.journal_dir, 'snapshot-00000001.json.tmp'), 'w') as f:
+        f.write('{"1": [')
+
+    reloaded = StorageService(path, journal=True, compact_threshold=1000)
+    assert _summary(reloaded.load_schedules()) == _summary(schedules)
+    assert reloaded.generation == 0
+    reloaded.close()
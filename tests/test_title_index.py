@@ -0,0 +1,42 @@
+# tests/test_title_index.py
+import random
+from services.title_index import TitleIndex
+
+TITLES = ['주간 회의', '팀회의 준비', '점심 약속', 'Weekly Sync', '회식', '의사 예약', '회의록 정리', '운동']
+
+def _brute_force(titles, query):
+    normalized = TitleIndex.normalize(query)
+    if not normalized:
+        return []
+    return sorted(item_id for item_id, title in titles.items() if normalized in TitleIndex.normalize(title))
+
+def test_search_ignores_spaces_and_case():
+    index = TitleIndex(enumerate(TITLES))
+    assert sorted(index.search('회의')) == [0, 1, 6]
+    assert sorted(index.search('주 간회 의')) == [0]
+    assert index.search('weekly sync') == [3]
+    assert index.search('   ') == []
+
+def test_non_adjacent_grams_are_filtered_out():
+    index = TitleIndex([(1, '회의실 의사'), (2, '회의사')])
+    # '회의'와 '의사'가 모두 있어도 이어지지 않은 제목은 제외
+    assert index.search('회의사') == [2]
+
+def test_search_matches_substring_after_add_and_remove():
+    rng = random.Random(3)
+    alphabet = '가나다라회의 ab'
+    titles = {}
+    index = TitleIndex()
+    for item_id in range(300):
+        title = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 8)))
+        titles[item_id] = title
+        index.add(item_id, title)
+        if rng.random() < 0.2:
+            victim = rng.choice(list(titles))
+            del titles[victim]
+            index.remove(victim)
+    index.remove(-1)  # 없는 번호는 무시
+    assert len(index) == len(titles)
+    for _ in range(200):
+        query = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+        assert sorted(index.search(query)) == _brute_force(titles, query)